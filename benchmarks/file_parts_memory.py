@@ -0,0 +1,141 @@
+"""Memory benchmark for large file parts through the agent executors.
+
+Sends multi-megabyte PDF and PNG payloads (as A2A `FileWithBytes` parts)
+through each executor's `execute()` with a stub runner that echoes the files
+back as the final response, then checks the returned bytes round-trip exactly
+and reports the peak traced memory relative to the payload size.
+
+Each agent runs in its own interpreter because the agents are separate
+projects with same-named top-level modules.
+
+Usage:
+    python benchmarks/file_parts_memory.py [--sizes-mb 2 8 16]
+"""
+
+import argparse
+import asyncio
+import base64
+import importlib
+import os
+import subprocess
+import sys
+import tracemalloc
+import uuid
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+AGENTS = {
+    "search": ("search_agent", "agent_executor", "SearchAgentExecutor"),
+    "planning": ("travel_planning_agent", "agent_executor", "TravelPlanningAgentExecutor"),
+    "host": ("host_agent", "host.host_agent_executor", "HostAgentExecutor"),
+}
+
+PAYLOADS = {
+    "application/pdf": b"%PDF-1.7\n",
+    "image/png": b"\x89PNG\r\n\x1a\n",
+}
+
+
+class EchoRunner:
+    """Stands in for the ADK runner and echoes the user's parts back."""
+
+    app_name = "benchmark"
+
+    def __init__(self):
+        from google.adk.sessions import InMemorySessionService
+
+        self.session_service = InMemorySessionService()
+
+    async def run_async(self, *, session_id, user_id, new_message, **kwargs):
+        from google.adk.events import Event
+        from google.genai import types
+
+        yield Event(
+            invocation_id=str(uuid.uuid4()),
+            author="benchmark_agent",
+            content=types.Content(role="model", parts=new_message.parts),
+        )
+
+
+async def run_once(executor, mime_type: str, payload: bytes) -> tuple[int, bool]:
+    from a2a.server.agent_execution.context import RequestContext
+    from a2a.server.events.event_queue import EventQueue
+    from a2a.types import (
+        FilePart,
+        FileWithBytes,
+        Message,
+        MessageSendParams,
+        Part,
+        Role,
+        TaskArtifactUpdateEvent,
+    )
+
+    task_id, context_id = str(uuid.uuid4()), str(uuid.uuid4())
+    encoded = base64.b64encode(payload).decode("ascii")
+    message = Message(
+        role=Role.user,
+        messageId=str(uuid.uuid4()),
+        taskId=task_id,
+        contextId=context_id,
+        parts=[Part(root=FilePart(file=FileWithBytes(bytes=encoded, mimeType=mime_type)))],
+    )
+    context = RequestContext(
+        request=MessageSendParams(message=message), task_id=task_id, context_id=context_id
+    )
+    event_queue = EventQueue()
+    del encoded
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    await executor.execute(context, event_queue)
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+
+    round_trip = False
+    while not event_queue.queue.empty():
+        event = event_queue.queue.get_nowait()
+        if isinstance(event, TaskArtifactUpdateEvent):
+            for part in event.artifact.parts:
+                if isinstance(part.root, FilePart):
+                    round_trip = base64.b64decode(part.root.file.bytes) == payload
+    return peak, round_trip
+
+
+def run_agent(agent: str, sizes_mb: list[int]) -> int:
+    directory, module_name, class_name = AGENTS[agent]
+    sys.path.insert(0, os.path.join(ROOT, directory))
+    executor_class = getattr(importlib.import_module(module_name), class_name)
+    executor = executor_class(EchoRunner())
+
+    failed = False
+    for size_mb in sizes_mb:
+        for mime_type, header in PAYLOADS.items():
+            payload = header + os.urandom(size_mb * 1024 * 1024 - len(header))
+            peak, ok = asyncio.run(run_once(executor, mime_type, payload))
+            failed |= not ok
+            print(
+                f"{agent:<9} {mime_type:<16} {size_mb:>4} MB  "
+                f"peak {peak / 2**20:8.1f} MB  ({peak / len(payload):4.2f}x payload)  "
+                f"{'round-trip ok' if ok else 'ROUND-TRIP MISMATCH'}"
+            )
+    return 1 if failed else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--agent", choices=sorted(AGENTS))
+    parser.add_argument("--sizes-mb", type=int, nargs="+", default=[2, 8, 16])
+    args = parser.parse_args()
+
+    if args.agent:
+        return run_agent(args.agent, args.sizes_mb)
+
+    status = 0
+    for agent in AGENTS:
+        command = [sys.executable, __file__, "--agent", agent, "--sizes-mb"]
+        status |= subprocess.run(command + [str(size) for size in args.sizes_mb]).returncode
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+"""Import-time benchmark for the host agent package.
+
+Importing `host` and `host.agent` must stay side-effect free: no network
+discovery and none of the heavy SDKs (ADK, A2A, Vertex AI) loaded until the
+agent is actually used. Each import runs in a fresh interpreter; the best of
+several runs is compared against a regression budget.
+
+Usage:
+    python benchmarks/host_import_time.py [--runs 5] [--budget-ms 50]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+HOST_AGENT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "host_agent")
+
+MODULES = ["host", "host.agent", "host.tools"]
+
+# Modules that must not be imported as a side effect of importing the package.
+HEAVY_MODULES = ["google.adk", "a2a", "vertexai", "httpx", "nest_asyncio"]
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import {module}
+elapsed_ms = (time.perf_counter() - started) * 1000
+heavy = [name for name in {heavy!r} if name in sys.modules]
+print(json.dumps({{"elapsed_ms": elapsed_ms, "heavy": heavy}}))
+"""
+
+
+def measure(module: str) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(module=module, heavy=HEAVY_MODULES)],
+        cwd=HOST_AGENT_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=float(os.getenv("HOST_IMPORT_BUDGET_MS", "50")),
+    )
+    args = parser.parse_args()
+
+    failed = False
+    for module in MODULES:
+        samples = [measure(module) for _ in range(args.runs)]
+        best = min(sample["elapsed_ms"] for sample in samples)
+        heavy = sorted({name for sample in samples for name in sample["heavy"]})
+        status = "ok"
+        if best > args.budget_ms:
+            status = f"over budget ({args.budget_ms:.0f} ms)"
+            failed = True
+        if heavy:
+            status = f"imports {', '.join(heavy)}"
+            failed = True
+        print(f"import {module:<12} best {best:7.2f} ms  {status}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+"""Benchmark for the host's pipelined search-to-plan delegation.
+
+Simulates a Search Agent that streams its findings section by section and a
+Travel Planning Agent whose first plan takes longer than a revision of a plan
+it already built in the same context. It then reports the end-to-end latency of
+sequential delegation (the full search, then one planning call) and of
+`SearchPlanPipeline`, along with the planning calls each one made. Runs
+entirely offline. Delays are given in simulated seconds and slept scaled by
+`--time-scale`.
+
+Usage:
+    python benchmarks/pipelined_planning.py [--sections 4] [--section-seconds 2]
+        [--plan-seconds 6] [--revision-seconds 3] [--max-revisions 0 1 2]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+from types import SimpleNamespace
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+from a2a.types import (  # noqa: E402
+    Artifact,
+    Part,
+    SendMessageResponse,
+    SendMessageSuccessResponse,
+    SendStreamingMessageResponse,
+    SendStreamingMessageSuccessResponse,
+    Task,
+    TaskArtifactUpdateEvent,
+    TaskState,
+    TaskStatus,
+    TaskStatusUpdateEvent,
+    TextPart,
+)
+
+from host_agent.host.pipeline import SearchPlanPipeline  # noqa: E402
+
+CATEGORIES = ["Flights", "Accommodation", "Weather", "Visa", "Transportation", "Activities"]
+CHUNKS_PER_SECTION = 8
+
+
+def section_text(index: int) -> str:
+    category = CATEGORIES[index % len(CATEGORIES)]
+    body = " ".join(f"Finding {n} about {category.lower()} with prices and sources." for n in range(12))
+    return f"## {category}\n{body}\n\n"
+
+
+class FakeSearchAgent:
+    """Streams one artifact, a section at a time, in small chunks."""
+
+    card = SimpleNamespace(name="Search Agent")
+
+    def __init__(self, sections: int, section_seconds: float, scale: float):
+        self.sections = sections
+        self.chunk_delay = section_seconds / CHUNKS_PER_SECTION * scale
+
+    async def send_message_streaming(self, request):
+        task_id, context_id, artifact_id = str(uuid.uuid4()), str(uuid.uuid4()), str(uuid.uuid4())
+        text = ""
+        for index in range(self.sections):
+            section = section_text(index)
+            size = -(-len(section) // CHUNKS_PER_SECTION)
+            for start in range(0, len(section), size):
+                await asyncio.sleep(self.chunk_delay)
+                chunk = section[start : start + size]
+                text += chunk
+                yield self._event(task_id, context_id, artifact_id, chunk, append=bool(start or index))
+        yield self._event(task_id, context_id, artifact_id, text, append=False, last_chunk=True)
+        yield SendStreamingMessageResponse(
+            root=SendStreamingMessageSuccessResponse(
+                id=request.id,
+                result=TaskStatusUpdateEvent(
+                    taskId=task_id,
+                    contextId=context_id,
+                    status=TaskStatus(state=TaskState.completed),
+                    final=True,
+                ),
+            )
+        )
+
+    @staticmethod
+    def _event(task_id, context_id, artifact_id, text, append, last_chunk=False):
+        return SendStreamingMessageResponse(
+            root=SendStreamingMessageSuccessResponse(
+                id=str(uuid.uuid4()),
+                result=TaskArtifactUpdateEvent(
+                    taskId=task_id,
+                    contextId=context_id,
+                    artifact=Artifact(artifactId=artifact_id, parts=[Part(root=TextPart(text=text))]),
+                    append=append,
+                    lastChunk=last_chunk,
+                ),
+            )
+        )
+
+
+class FakePlanningAgent:
+    """Answers the first message of a context slower than the revisions that follow it."""
+
+    card = SimpleNamespace(name="Travel Planning Agent")
+
+    def __init__(self, plan_seconds: float, revision_seconds: float, scale: float):
+        self.plan_delay = plan_seconds * scale
+        self.revision_delay = revision_seconds * scale
+        self.contexts: set = set()
+        self.calls = 0
+
+    async def send_message(self, request):
+        self.calls += 1
+        context_id = request.params.message.contextId or str(uuid.uuid4())
+        revision = context_id in self.contexts
+        self.contexts.add(context_id)
+        await asyncio.sleep(self.revision_delay if revision else self.plan_delay)
+        return SendMessageResponse(
+            root=SendMessageSuccessResponse(
+                id=request.id,
+                result=Task(
+                    id=str(uuid.uuid4()),
+                    contextId=context_id,
+                    status=TaskStatus(state=TaskState.completed),
+                    artifacts=[
+                        Artifact(
+                            artifactId=str(uuid.uuid4()),
+                            parts=[Part(root=TextPart(text="Day 1: ..."))],
+                        )
+                    ],
+                ),
+            )
+        )
+
+
+async def sequential(search: FakeSearchAgent, planning: FakePlanningAgent) -> None:
+    request = SimpleNamespace(id="search", params=None)
+    async for _ in search.send_message_streaming(request):
+        pass
+    await planning.send_message(
+        SimpleNamespace(id="plan", params=SimpleNamespace(message=SimpleNamespace(contextId=None)))
+    )
+
+
+async def run(args: argparse.Namespace) -> None:
+    def agents():
+        return (
+            FakeSearchAgent(args.sections, args.section_seconds, args.time_scale),
+            FakePlanningAgent(args.plan_seconds, args.revision_seconds, args.time_scale),
+        )
+
+    search, planning = agents()
+    started_at = time.perf_counter()
+    await sequential(search, planning)
+    elapsed = (time.perf_counter() - started_at) / args.time_scale
+    print(f"{'sequential':<24} end-to-end {elapsed:6.2f} s  planning calls {planning.calls}")
+
+    for max_revisions in args.max_revisions:
+        search, planning = agents()
+        pipeline = SearchPlanPipeline(search, planning, max_revisions=max_revisions)
+        started_at = time.perf_counter()
+        await pipeline.run("Search for a trip to Lisbon", "Plan a 5-day trip to Lisbon")
+        elapsed = (time.perf_counter() - started_at) / args.time_scale
+        print(
+            f"{f'pipelined, {max_revisions} revisions':<24} end-to-end {elapsed:6.2f} s  "
+            f"planning calls {planning.calls}"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sections", type=int, default=4)
+    parser.add_argument("--section-seconds", type=float, default=2.0)
+    parser.add_argument("--plan-seconds", type=float, default=6.0)
+    parser.add_argument("--revision-seconds", type=float, default=3.0)
+    parser.add_argument("--max-revisions", type=int, nargs="+", default=[0, 1, 2])
+    parser.add_argument("--time-scale", type=float, default=0.1)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
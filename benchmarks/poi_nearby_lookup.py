@@ -0,0 +1,89 @@
+"""Benchmark for the Travel Planning Agent's nearby-POI index.
+
+Writes a synthetic POI file clustered around a few cities, loads it the way
+the agent does at startup and reports the load time and the latency of
+radius and k-nearest queries, checking the results against brute force.
+
+Usage:
+    python benchmarks/poi_nearby_lookup.py [--pois 200000] [--queries 1000]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "travel_planning_agent"))
+
+from tools.poi_index import POIIndex, save_pois  # noqa: E402
+
+CITIES = [(35.68, 139.76), (48.86, 2.35), (40.71, -74.0), (-33.87, 151.21), (41.9, 12.5)]
+CATEGORIES = ["museum", "restaurant", "park", "landmark", "shopping", "nightlife"]
+
+
+def synthetic_pois(count: int, rng: np.random.Generator) -> list[dict]:
+    centers = np.array(CITIES)[rng.integers(len(CITIES), size=count)]
+    coordinates = centers + rng.normal(scale=0.08, size=(count, 2))
+    categories = rng.integers(len(CATEGORIES), size=count)
+    return [
+        {"name": f"POI {i}", "lat": lat, "lon": lon, "category": CATEGORIES[category]}
+        for i, ((lat, lon), category) in enumerate(zip(coordinates, categories))
+    ]
+
+
+def report(label: str, latencies: list[float]) -> None:
+    latencies.sort()
+    print(
+        f"{label:<22} p50 {statistics.median(latencies):7.3f} ms  "
+        f"p95 {latencies[int(len(latencies) * 0.95)]:7.3f} ms"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pois", type=int, default=200_000)
+    parser.add_argument("--queries", type=int, default=1000)
+    args = parser.parse_args()
+    rng = np.random.default_rng(5)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "pois.npz")
+        save_pois(path, synthetic_pois(args.pois, rng))
+        started_at = time.perf_counter()
+        index = POIIndex.load(path)
+        print(f"loaded {len(index)} POIs in {(time.perf_counter() - started_at) * 1000:.1f} ms")
+
+    all_positions = np.arange(len(index))
+    radius_latencies, nearest_latencies, mismatches = [], [], 0
+    for query in range(args.queries):
+        lat, lon = np.array(CITIES[query % len(CITIES)]) + rng.normal(scale=0.05, size=2)
+        categories = [CATEGORIES[query % len(CATEGORIES)]] if query % 2 else None
+
+        started_at = time.perf_counter()
+        positions, _ = index.within(lat, lon, 1.0, categories)
+        radius_latencies.append((time.perf_counter() - started_at) * 1000)
+
+        started_at = time.perf_counter()
+        nearest, _ = index.nearest(lat, lon, 10, categories)
+        nearest_latencies.append((time.perf_counter() - started_at) * 1000)
+
+        if query % 50 == 0:
+            mask = index._category_mask(all_positions, categories)
+            distances = index._distances(lat, lon, all_positions[mask])
+            expected = all_positions[mask][np.argsort(distances, kind="stable")[:10]]
+            mismatches += set(expected) != set(nearest)
+            mismatches += set(all_positions[mask][distances <= 1.0]) != set(positions)
+
+    report("radius 1 km", radius_latencies)
+    report("10 nearest", nearest_latencies)
+    print("results match brute force" if not mismatches else f"{mismatches} MISMATCHES")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""Benchmark for the host's local RAG vector store at up to a million chunks.
+
+Fills a store with synthetic clustered unit vectors (chunk embeddings are
+generated directly, so the numbers measure the store rather than an
+embedding model), builds the IVF index, then reports the exact and the
+approximate query latency and the recall@k of the approximate search against
+the exact one. Runs entirely offline; a 1M x 256 store needs about 1 GB of
+disk.
+
+Usage:
+    python benchmarks/rag_local_vector_store.py [--chunks 100000 1000000] [--dim 256] [--queries 50] [--noise 0.04]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+from host_agent.host.tools.local_vector_store import VectorStore, normalize_rows  # noqa: E402
+
+APPEND_BATCH = 100_000
+TOPICS = 2_000
+
+
+def synthetic_vectors(
+    rng: np.random.Generator, centers: np.ndarray, count: int, noise: float
+) -> np.ndarray:
+    """Points scattered around random topic centers, like chunks of related documents."""
+    topics = rng.integers(0, len(centers), count)
+    return centers[topics] + noise * rng.standard_normal((count, centers.shape[1]), dtype=np.float32)
+
+
+def percentiles(latencies: list[float]) -> str:
+    latencies = sorted(latencies)
+    return (
+        f"p50 {statistics.median(latencies):8.2f} ms  "
+        f"p95 {latencies[int(len(latencies) * 0.95)]:8.2f} ms"
+    )
+
+
+def run(chunks: int, dim: int, queries: int, k: int, nprobe: int, noise: float) -> None:
+    rng = np.random.default_rng(7)
+    # Unit-norm topic centers; `noise` is the per-dimension spread around them.
+    centers = normalize_rows(rng.standard_normal((TOPICS, dim), dtype=np.float32))
+    with tempfile.TemporaryDirectory() as directory:
+        store = VectorStore(directory, dim)
+        started_at = time.perf_counter()
+        for start in range(0, chunks, APPEND_BATCH):
+            count = min(APPEND_BATCH, chunks - start)
+            store.append(
+                synthetic_vectors(rng, centers, count, noise),
+                [f"chunk {start + row}" for row in range(count)],
+                owner=start // APPEND_BATCH + 1,
+            )
+        append_seconds = time.perf_counter() - started_at
+
+        started_at = time.perf_counter()
+        nlist = store.build_ivf()
+        build_seconds = time.perf_counter() - started_at
+
+        query_vectors = synthetic_vectors(rng, centers, queries, noise)
+        exact_latencies, ivf_latencies, recalls = [], [], []
+        for query in query_vectors:
+            started_at = time.perf_counter()
+            exact_rows, _ = store.search(query, k, exact=True)
+            exact_latencies.append((time.perf_counter() - started_at) * 1000)
+            started_at = time.perf_counter()
+            ivf_rows, _ = store.search(query, k, nprobe=nprobe)
+            ivf_latencies.append((time.perf_counter() - started_at) * 1000)
+            recalls.append(len(set(exact_rows.tolist()) & set(ivf_rows.tolist())) / k)
+
+        size_mb = os.path.getsize(os.path.join(directory, "vectors.f32")) / 2**20
+        print(
+            f"{chunks:>9} chunks  {size_mb:7.0f} MB  append {append_seconds:6.1f}s  "
+            f"IVF build {build_seconds:6.1f}s ({nlist} lists, nprobe {nprobe})"
+        )
+        print(f"{'':>9}  exact  {percentiles(exact_latencies)}")
+        print(
+            f"{'':>9}  IVF    {percentiles(ivf_latencies)}  "
+            f"recall@{k} {statistics.mean(recalls):.3f}"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chunks", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--top-k", type=int, default=8)
+    parser.add_argument("--nprobe", type=int, default=16)
+    parser.add_argument("--noise", type=float, default=0.04)
+    args = parser.parse_args()
+    for chunks in args.chunks:
+        run(chunks, args.dim, args.queries, args.top_k, args.nprobe, args.noise)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""Benchmark for the Search Agent's memory-mapped BM25 knowledge index.
+
+Builds an index over a synthetic corpus of travel passages, then reports the
+time to open it (which should stay flat as the corpus grows, since nothing
+is read eagerly) and the query latency. Runs entirely offline.
+
+Usage:
+    python benchmarks/search_local_index.py [--docs 10000 50000] [--queries 500]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "search_agent"))
+
+from bm25_index import BM25Index, build_index  # noqa: E402
+
+CITIES = [
+    "tokyo", "kyoto", "paris", "lisbon", "rome", "barcelona", "istanbul", "cairo",
+    "bangkok", "hanoi", "lima", "cusco", "mexico", "oaxaca", "sydney", "auckland",
+    "reykjavik", "oslo", "prague", "vienna", "marrakech", "nairobi", "seoul", "bali",
+]
+TOPICS = {
+    "visa": "visa entry requirements passport validity arrival tourist stay days embassy",
+    "culture": "etiquette tipping greetings dress code language phrases currency customs",
+    "transportation": "metro subway bus rail pass airport transfer taxi ride tickets",
+    "activities": "museums temples markets old town walking tours viewpoints day trips",
+}
+FILLER = (
+    "travelers often note that planning ahead helps because local rules and schedules "
+    "vary by season and neighborhood with plenty of options for every budget"
+).split()
+
+
+def synthetic_documents(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    for doc_id in range(count):
+        city = rng.choice(CITIES)
+        category, keywords = rng.choice(list(TOPICS.items()))
+        words = keywords.split() * 3 + rng.sample(FILLER, 12) + [city] * 4
+        rng.shuffle(words)
+        yield {
+            "title": f"{city.title()} {category} guide {doc_id}",
+            "text": " ".join(words),
+            "category": category,
+        }
+
+
+def run(docs: int, queries: int) -> None:
+    rng = random.Random(11)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "knowledge.idx")
+        started_at = time.perf_counter()
+        build_index(synthetic_documents(docs), path)
+        build_seconds = time.perf_counter() - started_at
+
+        started_at = time.perf_counter()
+        index = BM25Index(path)
+        open_ms = (time.perf_counter() - started_at) * 1000
+
+        latencies = []
+        for _ in range(queries):
+            city = rng.choice(CITIES)
+            query = f"{rng.choice(list(TOPICS))} requirements for {city} {rng.choice(FILLER)}"
+            started_at = time.perf_counter()
+            index.search(query, top_k=3)
+            latencies.append((time.perf_counter() - started_at) * 1000)
+        index.close()
+
+        latencies.sort()
+        print(
+            f"{docs:>8} docs  {os.path.getsize(path) / 2**20:7.1f} MB  "
+            f"build {build_seconds:6.1f}s  open {open_ms:6.2f} ms  "
+            f"query p50 {statistics.median(latencies):7.2f} ms  "
+            f"p95 {latencies[int(len(latencies) * 0.95)]:7.2f} ms"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, nargs="+", default=[10_000, 50_000])
+    parser.add_argument("--queries", type=int, default=500)
+    args = parser.parse_args()
+    for docs in args.docs:
+        run(docs, args.queries)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1 +1,11 @@
-from .agent import root_agent
\ No newline at end of file
+def __getattr__(name: str):
+    # Resolved lazily so importing the package does not build the agent.
+    if name == "agent":
+        from . import agent
+
+        return agent
+    if name == "root_agent":
+        from .agent import root_agent
+
+        return root_agent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,191 @@
+"""Production A2A server entry point for the host agent.
+
+Run from the `host_agent` directory with `python -m host`. The server wraps
+`HostAgentExecutor` in an `A2AStarletteApplication`; an ASGI lifespan owns the
+shared HTTP connection pool, remote agent discovery and the in-memory stores.
+Remote agents can be changed at runtime through `REMOTE_AGENTS_FILE` or the
+`/admin/agents` endpoints.
+"""
+
+import asyncio
+import hmac
+import logging
+import os
+from contextlib import asynccontextmanager
+
+import httpx
+import uvicorn
+from a2a.server.apps import A2AStarletteApplication
+from a2a.server.request_handlers import DefaultRequestHandler
+from a2a.server.tasks import InMemoryTaskStore
+from a2a.types import (
+    AgentCapabilities,
+    AgentCard,
+    AgentSkill,
+)
+from starlette.middleware import Middleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from .config import (
+    HOST_ADMIN_TOKEN,
+    HOST_AGENT_HOST,
+    HOST_AGENT_PORT,
+    INTENT_ROUTER_ENABLED,
+    REMOTE_AGENT_MAX_CONNECTIONS,
+    REMOTE_AGENT_TIMEOUT,
+    REMOTE_AGENT_URLS,
+    REMOTE_AGENTS_FILE,
+    REMOTE_AGENTS_FILE_POLL_INTERVAL,
+)
+from .host_agent import HostAgent
+from .host_agent_executor import HostAgentExecutor
+from .intent_router import IntentRouter
+from .metrics import SESSIONS, RequestCounterMiddleware, count_sessions, metrics_endpoint
+from .remote_agent_registry import RemoteAgentRegistry, read_agent_urls
+from .structured_logging import configure_logging
+
+configure_logging()
+logger = logging.getLogger(__name__)
+
+
+class MissingAPIKeyError(Exception):
+    """Exception for missing API key."""
+
+
+def admin_routes(registry: RemoteAgentRegistry, token: str) -> list[Route]:
+    """Routes for inspecting and changing the remote agents at runtime."""
+
+    def authorized(request: Request) -> bool:
+        expected = f"Bearer {token}"
+        return hmac.compare_digest(request.headers.get("authorization", ""), expected)
+
+    async def list_agents(request: Request) -> JSONResponse:
+        if not authorized(request):
+            return JSONResponse({"error": "unauthorized"}, status_code=401)
+        return JSONResponse({"agents": registry.urls, "sources": registry.sources})
+
+    async def add_agent(request: Request) -> JSONResponse:
+        if not authorized(request):
+            return JSONResponse({"error": "unauthorized"}, status_code=401)
+        body = await request.json()
+        url = body.get("url") if isinstance(body, dict) else None
+        if not url:
+            return JSONResponse({"error": "missing 'url'"}, status_code=400)
+        card = await registry.add(url)
+        if card is None:
+            return JSONResponse({"error": f"could not resolve agent at {url}"}, status_code=502)
+        return JSONResponse({"name": card.name, "url": url}, status_code=201)
+
+    async def remove_agent(request: Request) -> JSONResponse:
+        if not authorized(request):
+            return JSONResponse({"error": "unauthorized"}, status_code=401)
+        name = request.path_params["name"]
+        if not await registry.remove(name):
+            return JSONResponse({"error": f"unknown agent {name}"}, status_code=404)
+        return JSONResponse({"removed": name})
+
+    return [
+        Route("/admin/agents", list_agents, methods=["GET"]),
+        Route("/admin/agents", add_agent, methods=["POST"]),
+        Route("/admin/agents/{name}", remove_agent, methods=["DELETE"]),
+    ]
+
+
+def build_app(host: str = HOST_AGENT_HOST, port: int = HOST_AGENT_PORT):
+    """Builds the Starlette app serving the host agent."""
+    http_client = httpx.AsyncClient(
+        timeout=REMOTE_AGENT_TIMEOUT,
+        limits=httpx.Limits(
+            max_connections=REMOTE_AGENT_MAX_CONNECTIONS,
+            max_keepalive_connections=REMOTE_AGENT_MAX_CONNECTIONS,
+        ),
+    )
+    remote_agent_urls = REMOTE_AGENT_URLS
+    if REMOTE_AGENTS_FILE and os.path.exists(REMOTE_AGENTS_FILE):
+        remote_agent_urls = read_agent_urls(REMOTE_AGENTS_FILE)
+    host_agent = HostAgent(remote_agent_addresses=remote_agent_urls, http_client=http_client)
+    task_store = InMemoryTaskStore()
+
+    @asynccontextmanager
+    async def lifespan(app):
+        logger.info("Discovering remote agents: %s", remote_agent_urls)
+        await host_agent.ensure_initialized()
+        watcher = None
+        if REMOTE_AGENTS_FILE:
+            watcher = asyncio.create_task(
+                host_agent.registry.watch_file(
+                    REMOTE_AGENTS_FILE, REMOTE_AGENTS_FILE_POLL_INTERVAL
+                )
+            )
+        try:
+            yield
+        finally:
+            logger.info("Shutting down host agent")
+            if watcher is not None:
+                watcher.cancel()
+            await host_agent.aclose()
+            await http_client.aclose()
+            task_store.tasks.clear()
+
+    agent_card = AgentCard(
+        name="Travel Host Agent",
+        description="Travel orchestrator that coordinates between the travel planning agent and the search agent to provide complete travel solutions",
+        url=f"http://{host}:{port}/",
+        version="1.0.0",
+        defaultInputModes=["text/plain"],
+        defaultOutputModes=["text/plain"],
+        capabilities=AgentCapabilities(streaming=True),
+        skills=[
+            AgentSkill(
+                id="travel_orchestration",
+                name="Travel Orchestration",
+                description="Analyzes travel requests and delegates searches and itinerary planning to specialized agents",
+                tags=["travel", "orchestration", "planning", "search"],
+                examples=[
+                    "Plan a 5-day romantic trip to Paris for $2500 in April",
+                    "Find the best family-friendly hotels in Tokyo with current pricing",
+                ],
+            )
+        ],
+    )
+    request_handler = DefaultRequestHandler(
+        agent_executor=HostAgentExecutor(
+            host_agent.runner,
+            IntentRouter(host_agent.registry) if INTENT_ROUTER_ENABLED else None,
+        ),
+        task_store=task_store,
+    )
+    server = A2AStarletteApplication(agent_card=agent_card, http_handler=request_handler)
+
+    SESSIONS.set_function(lambda: count_sessions(host_agent.session_service))
+    routes = [Route("/metrics", metrics_endpoint, methods=["GET"])]
+    if HOST_ADMIN_TOKEN:
+        routes.extend(admin_routes(host_agent.registry, HOST_ADMIN_TOKEN))
+    return server.build(
+        routes=routes,
+        middleware=[Middleware(RequestCounterMiddleware)],
+        lifespan=lifespan,
+    )
+
+
+def main():
+    """Starts the host agent server."""
+    try:
+        if not os.getenv("GOOGLE_GENAI_USE_VERTEXAI") == "TRUE":
+            if not os.getenv("GOOGLE_API_KEY"):
+                raise MissingAPIKeyError(
+                    "GOOGLE_API_KEY environment variable not set and GOOGLE_GENAI_USE_VERTEXAI is not TRUE."
+                )
+        uvicorn.run(build_app(), host=HOST_AGENT_HOST, port=HOST_AGENT_PORT)
+    except MissingAPIKeyError as e:
+        logger.error(f"Error: {e}")
+        exit(1)
+    except Exception as e:
+        logger.error(f"An error occurred during server startup: {e}")
+        exit(1)
+
+
+if __name__ == "__main__":
+    main()
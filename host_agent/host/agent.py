@@ -1,70 +1,39 @@
-# from .host_agent import HostAgent
-# import httpx
-# agents_addresses= ['http://localhost:10002', 'http://localhost:10003']
-# root_agent = HostAgent(agents_addresses,http_client=httpx.AsyncClient()).create_agent()
+"""Exposes the host `root_agent` and `runner` for the ADK dev tooling.
 
+Importing this module is side-effect free: the HostAgent is only built when
+`host_agent`, `runner` or `root_agent` is first accessed, and remote agent
+discovery runs on the first agent invocation, or eagerly from an async
+startup hook through `initialize_host_agent()`.
+"""
 
-import asyncio
-
-
-import nest_asyncio
-from google.adk.runners import Runner
-from a2a.types import (
-    AgentCard,
-    AgentCapabilities, AgentSkill,
-)
+import functools
 import logging
 
-from dotenv import load_dotenv
-
-from google.genai import types
-
-from .host_agent import HostAgent
-
-
-load_dotenv()
-nest_asyncio.apply()
-
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@functools.cache
+def get_host_agent():
+    """Builds the HostAgent without touching the network."""
+    from .config import REMOTE_AGENT_URLS
+    from .host_agent import HostAgent
 
+    logger.info("Initializing host agent")
+    return HostAgent(remote_agent_addresses=REMOTE_AGENT_URLS)
 
-def _get_initialized_host_agent_sync() -> HostAgent:
-    """Synchronously creates and initializes the HostAgent."""
-
-    async def _async_main():
-        # Hardcoded URLs for the friend agents
-        friend_agent_urls = [
-            "http://127.0.0.1:10002",  # Evaluation Agent
-            "http://127.0.0.1:10003",  # RFP Parser Agent
-            # "http://localhost:10004",  # Nate's Agent
-        ]
-
-        print("initializing host agent")
-        hosting_agent_instance = await HostAgent.create(
-            remote_agent_addresses=friend_agent_urls
-        )
-        print("HostAgent initialized")
-        return hosting_agent_instance
-
-    try:
-        return asyncio.run(_async_main())
-    except RuntimeError as e:
-        if "asyncio.run() cannot be called from a running event loop" in str(e):
-            print(
-                f"Warning: Could not initialize HostAgent with asyncio.run(): {e}. "
-                "This can happen if an event loop is already running (e.g., in Jupyter). "
-                "Consider initializing HostAgent within an async function in your application."
-            )
-        else:
-            raise
-
-host = "127.0.0.1"
-port = 9999
 
+async def initialize_host_agent():
+    """Builds the HostAgent and discovers the remote agents."""
+    host_agent = get_host_agent()
+    await host_agent.ensure_initialized()
+    logger.info("HostAgent initialized")
+    return host_agent
 
-host_agent = _get_initialized_host_agent_sync()
-runner: Runner = host_agent.runner
-root_agent = runner.agent
 
+def __getattr__(name: str):
+    if name == "host_agent":
+        return get_host_agent()
+    if name == "runner":
+        return get_host_agent().runner
+    if name == "root_agent":
+        return get_host_agent().agent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
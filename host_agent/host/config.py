@@ -17,13 +17,74 @@ load_dotenv()
 PROJECT_ID = os.environ.get("GOOGLE_CLOUD_PROJECT")
 LOCATION = os.environ.get("GOOGLE_CLOUD_LOCATION")
 
+# Host server settings
+HOST_AGENT_HOST = os.environ.get("HOST_AGENT_HOST", "127.0.0.1")
+HOST_AGENT_PORT = int(os.environ.get("HOST_AGENT_PORT", "10001"))
+# Comma-separated base URLs of the remote agents the host delegates to
+REMOTE_AGENT_URLS = [
+    url.strip()
+    for url in os.environ.get(
+        "REMOTE_AGENT_URLS", "http://127.0.0.1:10002,http://127.0.0.1:10003"
+    ).split(",")
+    if url.strip()
+]
+REMOTE_AGENT_TIMEOUT = float(os.environ.get("REMOTE_AGENT_TIMEOUT", "30"))
+REMOTE_AGENT_MAX_CONNECTIONS = int(os.environ.get("REMOTE_AGENT_MAX_CONNECTIONS", "100"))
+# Optional file listing remote agent URLs; watched and hot-reloaded when set
+REMOTE_AGENTS_FILE = os.environ.get("REMOTE_AGENTS_FILE")
+REMOTE_AGENTS_FILE_POLL_INTERVAL = float(os.environ.get("REMOTE_AGENTS_FILE_POLL_INTERVAL", "5"))
+# Bearer token enabling the /admin/agents endpoints (disabled when unset)
+HOST_ADMIN_TOKEN = os.environ.get("HOST_ADMIN_TOKEN")
+# Overlap planning with search through the plan_trip_pipelined tool
+HOST_PIPELINED_PLANNING = os.environ.get("HOST_PIPELINED_PLANNING", "true").lower() == "true"
+SEARCH_AGENT_NAME = os.environ.get("SEARCH_AGENT_NAME", "Search Agent")
+PLANNING_AGENT_NAME = os.environ.get("PLANNING_AGENT_NAME", "Travel Planning Agent")
+# Answer or delegate unambiguous first messages without the orchestrator model
+INTENT_ROUTER_ENABLED = os.environ.get("INTENT_ROUTER_ENABLED", "true").lower() == "true"
+# Card keywords a request must match before it is sent straight to an agent
+INTENT_ROUTER_MIN_SCORE = int(os.environ.get("INTENT_ROUTER_MIN_SCORE", "3"))
+
 # RAG settings
 DEFAULT_CHUNK_SIZE = 512
 DEFAULT_CHUNK_OVERLAP = 150  # Increased for better context capture
 DEFAULT_TOP_K = 8  # Increased to return more candidate matches
-DEFAULT_DISTANCE_THRESHOLD = 0.55  # Adjusted for better candidate matching
+DEFAULT_DISTANCE_THRESHOLD = float(
+    os.environ.get("RAG_DISTANCE_THRESHOLD", "0.55")
+)  # Adjusted for better candidate matching
 DEFAULT_EMBEDDING_MODEL = "publishers/google/models/text-embedding-005"
 DEFAULT_EMBEDDING_REQUESTS_PER_MIN = 1000
+# Seconds a cached listing of the corpora is used for name resolution
+CORPUS_CATALOG_TTL = float(os.environ.get("CORPUS_CATALOG_TTL", "300"))
+# Age after which a name missing from the cached listing triggers a refresh
+CORPUS_CATALOG_MISS_REFRESH = float(os.environ.get("CORPUS_CATALOG_MISS_REFRESH", "10"))
+# Threads and per-call timeout (seconds) of the async RAG tools
+RAG_TOOL_MAX_WORKERS = int(os.environ.get("RAG_TOOL_MAX_WORKERS", "8"))
+RAG_TOOL_TIMEOUT = float(os.environ.get("RAG_TOOL_TIMEOUT", "60"))
+# Concurrent retrievals and maximum unique queries of one rag_batch_query call
+RAG_BATCH_CONCURRENCY = int(os.environ.get("RAG_BATCH_CONCURRENCY", "4"))
+RAG_BATCH_MAX_QUERIES = int(os.environ.get("RAG_BATCH_MAX_QUERIES", "50"))
+# Rank offset of reciprocal rank fusion in rag_multi_query
+RRF_K = int(os.environ.get("RRF_K", "60"))
+# Retrieval results cached per corpus, query, top_k and threshold (0 disables the cache)
+RAG_CACHE_MAX_ENTRIES = int(os.environ.get("RAG_CACHE_MAX_ENTRIES", "1024"))
+RAG_CACHE_TTL = float(os.environ.get("RAG_CACHE_TTL", "300"))
+# Where the RAG tools store corpora: "vertex" (Vertex AI RAG) or "local" (on-disk vector store)
+RAG_BACKEND = os.environ.get("RAG_BACKEND", "vertex").lower()
+RAG_LOCAL_DIR = os.environ.get(
+    "RAG_LOCAL_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "rag_store")
+)
+# "hashing" or a "module:function" mapping a list of texts to an embedding matrix
+RAG_LOCAL_EMBEDDING = os.environ.get("RAG_LOCAL_EMBEDDING", "hashing")
+RAG_LOCAL_EMBEDDING_DIM = int(os.environ.get("RAG_LOCAL_EMBEDDING_DIM", "1024"))
+# Overrides the local embedding's own distance threshold (0.96 for "hashing")
+RAG_LOCAL_DISTANCE_THRESHOLD = (
+    float(os.environ["RAG_LOCAL_DISTANCE_THRESHOLD"]) if os.environ.get("RAG_LOCAL_DISTANCE_THRESHOLD") else None
+)
+# The only directory add_data may import local files from; unset disables local files
+RAG_LOCAL_IMPORT_DIR = os.environ.get("RAG_LOCAL_IMPORT_DIR") or None
+# Corpus size from which local searches use the approximate IVF index
+RAG_LOCAL_IVF_MIN_CHUNKS = int(os.environ.get("RAG_LOCAL_IVF_MIN_CHUNKS", "50000"))
+RAG_LOCAL_NPROBE = int(os.environ.get("RAG_LOCAL_NPROBE", "16"))
 
 # LLM settings for candidate scoring
 CANDIDATE_SCORING_MODEL = "gemini-2.5-flash-preview-05-20"  # Model used for candidate scoring
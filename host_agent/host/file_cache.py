@@ -0,0 +1,312 @@
+"""Content-addressed local cache for files referenced by URI.
+
+Files attached by URI (brochures, visa PDFs, ...) are downloaded once and
+stored on disk under the SHA-256 of their contents, so identical files
+attached under different URIs share one copy. Lookups are served from an
+in-memory index; entries older than `FILE_CACHE_REVALIDATE_AFTER` seconds are
+revalidated with a conditional request (ETag / Last-Modified) and the least
+recently used entries are evicted once the cache exceeds its size bound.
+Concurrent requests for the same URI share a single download.
+
+URIs come from clients, so fetching is opt-in (`FILE_FETCH_ENABLED`) and
+limited to the hosts in `FILE_FETCH_ALLOWED_HOSTS`. Every host name must
+resolve to public addresses only, and the connection is pinned to the checked
+address, so neither DNS rebinding nor a redirect can reach loopback, private,
+link-local (cloud metadata) or other internal addresses. Redirects are
+followed by hand and every hop is checked again. Downloads larger than
+`FILE_FETCH_MAX_BYTES` are aborted.
+"""
+
+import asyncio
+import hashlib
+import ipaddress
+import json
+import logging
+import os
+import socket
+import tempfile
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+FILE_CACHE_DIR = os.getenv(
+    "FILE_CACHE_DIR", os.path.join(tempfile.gettempdir(), "a2a_file_cache", "host_agent")
+)
+FILE_CACHE_MAX_BYTES = int(os.getenv("FILE_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+FILE_CACHE_REVALIDATE_AFTER = float(os.getenv("FILE_CACHE_REVALIDATE_AFTER", "300"))
+FILE_FETCH_ENABLED = os.getenv("FILE_FETCH_ENABLED", "false").lower() == "true"
+# Comma-separated hosts whose files may be fetched; "*.example.com" matches subdomains.
+FILE_FETCH_ALLOWED_HOSTS = tuple(
+    host.strip().lower() for host in os.getenv("FILE_FETCH_ALLOWED_HOSTS", "").split(",") if host.strip()
+)
+FILE_FETCH_MAX_BYTES = int(os.getenv("FILE_FETCH_MAX_BYTES", str(20 * 1024 * 1024)))
+FILE_FETCH_MAX_REDIRECTS = 5
+
+_INDEX_FILE = "index.json"
+
+
+class FetchNotAllowed(ValueError):
+    """The URI may not be fetched by the server."""
+
+
+def host_allowed(host: str, allowed_hosts: tuple[str, ...]) -> bool:
+    host = host.lower().rstrip(".")
+    for pattern in allowed_hosts:
+        if pattern.startswith("*."):
+            if host.endswith(pattern[1:]):
+                return True
+        elif host == pattern:
+            return True
+    return False
+
+
+def is_public_address(address: str) -> bool:
+    """Whether `address` is globally routable (not private, loopback, link-local, ...)."""
+    ip = ipaddress.ip_address(address)
+    if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped is not None:
+        ip = ip.ipv4_mapped
+    return ip.is_global and not ip.is_multicast
+
+
+@dataclass
+class CachedFile:
+    """A cached download and the validators needed to revalidate it."""
+
+    uri: str
+    digest: str
+    size: int
+    mime_type: Optional[str] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    validated_at: float = 0.0
+
+
+class FileUriCache:
+    """Size-bounded LRU cache of downloaded files, keyed by URI."""
+
+    def __init__(
+        self,
+        directory: str = FILE_CACHE_DIR,
+        max_bytes: int = FILE_CACHE_MAX_BYTES,
+        revalidate_after: float = FILE_CACHE_REVALIDATE_AFTER,
+        http_client: Optional[httpx.AsyncClient] = None,
+        fetch_enabled: bool = FILE_FETCH_ENABLED,
+        allowed_hosts: tuple[str, ...] = FILE_FETCH_ALLOWED_HOSTS,
+        max_download_bytes: int = FILE_FETCH_MAX_BYTES,
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.revalidate_after = revalidate_after
+        self.fetch_enabled = fetch_enabled
+        self.allowed_hosts = tuple(host.lower() for host in allowed_hosts)
+        self.max_download_bytes = max_download_bytes
+        self._http_client = http_client
+        self._entries: OrderedDict[str, CachedFile] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+
+    def path_for(self, entry: CachedFile) -> str:
+        return os.path.join(self.directory, entry.digest)
+
+    @property
+    def total_bytes(self) -> int:
+        # Identical content under several URIs is stored once.
+        return sum({entry.digest: entry.size for entry in self._entries.values()}.values())
+
+    def allows(self, uri: str) -> bool:
+        """Whether fetching is enabled and `uri` is an http(s) URI on an allowed host."""
+        try:
+            url = httpx.URL(uri)
+        except httpx.InvalidURL:
+            return False
+        return (
+            self.fetch_enabled
+            and url.scheme in ("http", "https")
+            and bool(url.host)
+            and host_allowed(url.host, self.allowed_hosts)
+        )
+
+    async def get(self, uri: str) -> CachedFile:
+        """Returns the cached file for `uri`, downloading or revalidating it if needed."""
+        if not self.allows(uri):
+            raise FetchNotAllowed(f"Fetching {uri} is not allowed")
+        entry = self._entries.get(uri)
+        if (
+            entry is not None
+            and time.time() - entry.validated_at < self.revalidate_after
+            and os.path.exists(self.path_for(entry))
+        ):
+            self._entries.move_to_end(uri)
+            return entry
+
+        pending = self._inflight.get(uri)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[uri] = future
+        try:
+            entry = await self._fetch(uri, entry)
+            future.set_result(entry)
+            return entry
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else is waiting.
+            future.exception()
+            raise
+        finally:
+            del self._inflight[uri]
+
+    async def read(self, entry: CachedFile) -> bytes:
+        """Reads the cached contents of `entry` off the event loop."""
+        return await asyncio.to_thread(_read_file, self.path_for(entry))
+
+    async def _fetch(self, uri: str, stale: Optional[CachedFile]) -> CachedFile:
+        headers = {}
+        if stale is not None and os.path.exists(self.path_for(stale)):
+            if stale.etag:
+                headers["If-None-Match"] = stale.etag
+            if stale.last_modified:
+                headers["If-Modified-Since"] = stale.last_modified
+
+        client = self._http_client or httpx.AsyncClient(timeout=60)
+        url = httpx.URL(uri)
+        try:
+            for _ in range(FILE_FETCH_MAX_REDIRECTS + 1):
+                async with await self._stream(client, url, headers) as response:
+                    if response.has_redirect_location:
+                        url = url.join(response.headers["location"])
+                        if not self.allows(str(url)):
+                            raise FetchNotAllowed(f"{uri} redirects to {url}, which is not allowed")
+                        continue
+                    if response.status_code == 304 and stale is not None:
+                        stale.validated_at = time.time()
+                        self._entries.move_to_end(uri)
+                        self._save_index()
+                        return stale
+                    response.raise_for_status()
+                    digest, size = await self._store(response)
+                    break
+            else:
+                raise FetchNotAllowed(f"{uri} redirected more than {FILE_FETCH_MAX_REDIRECTS} times")
+        finally:
+            if self._http_client is None:
+                await client.aclose()
+
+        entry = CachedFile(
+            uri=uri,
+            digest=digest,
+            size=size,
+            mime_type=response.headers.get("content-type", "").split(";")[0] or None,
+            etag=response.headers.get("etag"),
+            last_modified=response.headers.get("last-modified"),
+            validated_at=time.time(),
+        )
+        if stale is not None and stale.digest != digest:
+            self._entries.pop(uri, None)
+            self._remove_unreferenced(stale)
+        self._entries[uri] = entry
+        self._entries.move_to_end(uri)
+        self._evict()
+        self._save_index()
+        logger.info("Cached %s (%d bytes) as %s", uri, size, digest)
+        return entry
+
+    async def _resolve(self, host: str, port: int) -> str:
+        """A public address of `host`; refuses hosts with any non-public address."""
+        infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        addresses = [info[4][0] for info in infos]
+        if not addresses or not all(is_public_address(address) for address in addresses):
+            raise FetchNotAllowed(f"{host} does not resolve to public addresses only")
+        return addresses[0]
+
+    async def _stream(self, client: httpx.AsyncClient, url: httpx.URL, headers: dict):
+        """Opens a GET of `url` pinned to the address that was checked."""
+        address = await self._resolve(url.host, url.port or (443 if url.scheme == "https" else 80))
+        # TLS still verifies the certificate against the host name.
+        extensions = {"sni_hostname": url.host} if url.scheme == "https" else {}
+        return client.stream(
+            "GET",
+            url.copy_with(host=address),
+            headers={**headers, "Host": url.netloc.decode("ascii")},
+            extensions=extensions,
+        )
+
+    async def _store(self, response: httpx.Response) -> tuple[str, int]:
+        """Streams the response body to disk, hashing it on the way."""
+        limit = min(self.max_bytes, self.max_download_bytes)
+        if int(response.headers.get("content-length") or 0) > limit:
+            raise ValueError(f"File exceeds the download limit of {limit} bytes")
+        hasher = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                async for chunk in response.aiter_bytes():
+                    size += len(chunk)
+                    if size > limit:
+                        raise ValueError(f"File exceeds the download limit of {limit} bytes")
+                    hasher.update(chunk)
+                    f.write(chunk)
+            digest = hasher.hexdigest()
+            os.replace(tmp_path, os.path.join(self.directory, digest))
+            return digest, size
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _evict(self) -> None:
+        while self._entries and self.total_bytes > self.max_bytes:
+            _, entry = self._entries.popitem(last=False)
+            self._remove_unreferenced(entry)
+            logger.debug("Evicted %s from the file cache", entry.uri)
+
+    def _remove_unreferenced(self, entry: CachedFile) -> None:
+        if all(other.digest != entry.digest for other in self._entries.values()):
+            try:
+                os.remove(self.path_for(entry))
+            except FileNotFoundError:
+                pass
+
+    def _load_index(self) -> None:
+        try:
+            with open(os.path.join(self.directory, _INDEX_FILE), encoding="utf-8") as f:
+                records = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        for record in records:
+            entry = CachedFile(**record)
+            if os.path.exists(self.path_for(entry)):
+                self._entries[entry.uri] = entry
+
+    def _save_index(self) -> None:
+        path = os.path.join(self.directory, _INDEX_FILE)
+        with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+            json.dump([asdict(entry) for entry in self._entries.values()], f)
+        os.replace(f"{path}.tmp", path)
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+_default_cache: Optional[FileUriCache] = None
+
+
+def get_file_cache() -> FileUriCache:
+    """Returns the process-wide file cache."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = FileUriCache()
+    return _default_cache
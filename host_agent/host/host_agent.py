@@ -1,6 +1,8 @@
 import asyncio
 import base64
 import json
+import logging
+import time
 import uuid
 
 from typing import List, Optional
@@ -29,12 +31,22 @@ from google.adk.events import Event
 from google.adk.tools.tool_context import ToolContext
 from google.genai import types
 from google.adk.runners import Runner
+from .config import HOST_PIPELINED_PLANNING, PLANNING_AGENT_NAME, SEARCH_AGENT_NAME
+from .metrics import REMOTE_DELEGATION_LATENCY
+from .model_routing import ModelRouter
+from .pipeline import SearchPlanPipeline
 from .remote_agent_connection import RemoteAgentConnections, TaskCallbackArg, TaskUpdateCallback
+from .remote_agent_registry import RemoteAgentRegistry
+from .structured_logging import correlation_id, log_payload
+from .usage import add_delegated_usage
 from google.adk.artifacts import InMemoryArtifactService
 from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
 
+logger = logging.getLogger(__name__)
+
+
 class HostAgent:
     """The host agent.
 
@@ -42,11 +54,16 @@ class HostAgent:
     tasks to and coordinate their work.
     """
 
-    def __init__(self):
-        self.remote_agent_connections: dict[str, RemoteAgentConnections] = {}
-        self.cards: dict[str, AgentCard] = {}
-        # self.httpx_client = http_client
-        self.agents :str = ''
+    def __init__(
+        self,
+        remote_agent_addresses: Optional[List[str]] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+    ):
+        self.httpx_client = http_client
+        self.registry = RemoteAgentRegistry(http_client)
+        self._remote_agent_addresses = list(remote_agent_addresses or [])
+        self._discovered = False
+        self._discovery_lock = asyncio.Lock()
         self.agent = self.create_agent()
         self._user_id= "host_agent"
         self.session_service =InMemorySessionService()
@@ -65,45 +82,59 @@ class HostAgent:
         # loop.create_task(self.init_remote_agent_addresses(remote_agent_addresses))
     
     
+    @property
+    def remote_agent_connections(self) -> dict[str, RemoteAgentConnections]:
+        return self.registry.connections
+
+    @property
+    def cards(self) -> dict[str, AgentCard]:
+        return self.registry.cards
+
+    @property
+    def agents(self) -> str:
+        return self.registry.listing
+
     async def _async_init_components(self,remote_agent_addresses: List[str]):
-        async with httpx.AsyncClient(timeout=30) as client:
-            for address in remote_agent_addresses:
-                card_resolver = A2ACardResolver(client, address)
-                try: 
-                    card = await card_resolver.get_agent_card()
-                    remote_connection = RemoteAgentConnections(card, address)
-                    self.remote_agent_connections[card.name] = remote_connection
-                    self.cards[card.name] = card
-                except httpx.ConnectError as e:
-                    print(f"Error connecting to {address}: {e}")
-                    continue
-                except Exception as e:
-                    print(f"Error retrieving card for {address}: {e}")
-                    continue
-        agent_info = [
-            json.dumps({"name": card.name, "description": card.description})
-            for card in self.cards.values()
-        ]
-        print("================================================\n")
-        print(f"agent_info ==== {agent_info}")
-        self.agents = '\n'.join(agent_info) if agent_info else 'No remote agents found'
+        await self.registry.sync(remote_agent_addresses)
+        logger.info("Discovered remote agents: %s", list(self.cards))
 
+    async def ensure_initialized(self) -> None:
+        """Discovers the remote agents once; concurrent callers share the work."""
+        if self._discovered:
+            return
+        async with self._discovery_lock:
+            if self._discovered:
+                return
+            await self._async_init_components(self._remote_agent_addresses)
+            self._discovered = True
+
+    async def _discover_before_agent(self, callback_context: CallbackContext) -> None:
+        """Runs discovery lazily on the first agent invocation."""
+        await self.ensure_initialized()
+        return None
+
+    async def aclose(self) -> None:
+        """Closes the remote agent connections."""
+        await self.registry.aclose()
 
     @classmethod
     async def create(cls,remote_agent_addresses: List[str]):
-        instance = cls()
-        await instance._async_init_components(remote_agent_addresses)
+        instance = cls(remote_agent_addresses)
+        await instance.ensure_initialized()
         return instance
 
     def get_current_date_time(self, tool_context: ToolContext) -> str:
         """Returns the current date and time in ISO format."""
         return types.Timestamp.now().isoformat()
     def create_agent(self) -> Agent:
-
+        router = ModelRouter()
         return LlmAgent(
-            model='gemini-2.0-flash-001',
+            model=router.strong_model,
             name='Travel_Host_Agent',
             instruction=self.root_instruction,
+            before_agent_callback=self._discover_before_agent,
+            before_model_callback=router.before_model,
+            after_model_callback=router.after_model,
             description=(
                 'This agent orchestrates travel requests by coordinating between'
                 ' the travel planning agent and search agent to provide comprehensive'
@@ -113,9 +144,20 @@ class HostAgent:
             tools=[
                 self.send_message,
                 self.get_current_date_time,
+                *([self.plan_trip_pipelined] if HOST_PIPELINED_PLANNING else []),
             ],
         )
 
+    def pipelined_instruction(self) -> str:
+        if not HOST_PIPELINED_PLANNING:
+            return ""
+        return f"""
+### Pipelined Search and Planning
+- When a request needs both a search and a plan, call `plan_trip_pipelined(search_task, planning_task)` instead of two sequential `send_message` calls
+- It starts the {PLANNING_AGENT_NAME} as soon as the first {SEARCH_AGENT_NAME} findings arrive and feeds it the remaining findings, so both agents work at the same time
+- It returns the search findings and the final plan; use `send_message` for follow-up questions to a single agent
+"""
+
     def root_instruction(self, context: ReadonlyContext) -> str:
 
         # return f"""You are an expert delegator that can delegate the user request to the
@@ -170,7 +212,7 @@ You can use get_current_date_time to get the current date and time in ISO format
 - **ALWAYS Search First**: Begin by delegating to the Search Agent to gather current information about destinations, pricing, availability, and conditions
 - **Then Plan Based on Data**: Use search results to inform the Travel Planning Agent with real-time constraints and opportunities
 - **Two-Phase Approach**: Search → Plan → Synthesize for optimal travel recommendations
-
+{self.pipelined_instruction()}
 ## Travel Quality Assurance
 
 ### Travel Information Validation
@@ -237,6 +279,28 @@ Remember: Your effectiveness in travel orchestration is measured by how well you
 <Available Agents>
     {self.agents}
 </Available Agents>"""
+    async def plan_trip_pipelined(
+            self,
+            search_task: str,
+            planning_task: str,
+            tool_context: ToolContext,
+    ):
+        """Searches for travel information and plans the trip with overlapping execution.
+
+        Args:
+            search_task: The request for the Search Agent.
+            planning_task: The request for the Travel Planning Agent, without the search results.
+
+        Returns:
+            The search findings and the final travel plan.
+        """
+        search = self.registry.get(SEARCH_AGENT_NAME)
+        planning = self.registry.get(PLANNING_AGENT_NAME)
+        if not search or not planning:
+            logger.warning("Pipelined planning needs both %s and %s", SEARCH_AGENT_NAME, PLANNING_AGENT_NAME)
+            return {"error": f"{SEARCH_AGENT_NAME} and {PLANNING_AGENT_NAME} must both be available"}
+        return await SearchPlanPipeline(search, planning).run(search_task, planning_task)
+
     async def get_file_from_name(self, file_name: str,tool_context: ToolContext) -> Optional[str]:
         """
         Retrieve file bytes from the conversation history based on the file name.
@@ -305,11 +369,11 @@ Remember: Your effectiveness in travel orchestration is measured by how well you
         """Sends a task to a remote agent"""
 
         if agent_name not in self.remote_agent_connections:
-             print(f"Unknown agent: {agent_name}")
+             logger.warning(f"Unknown agent: {agent_name}")
              return
-        client = self.remote_agent_connections[agent_name]
+        client = self.registry.get(agent_name)
         if not client:
-            print(f"No connection to {agent_name}")
+            logger.warning(f"No connection to {agent_name}")
             return
         message_id = str(uuid.uuid4())
         # file_part : FilePart | None = None
@@ -364,6 +428,7 @@ Remember: Your effectiveness in travel orchestration is measured by how well you
                 role=Role.user,
                 messageId= message_id,
                 parts= parts,
+                metadata={"correlation_id": correlation_id.get()},
             )
         )
         message_request = SendMessageRequest(
@@ -371,11 +436,18 @@ Remember: Your effectiveness in travel orchestration is measured by how well you
             # params=MessageSendParams.model_validate(payload),
             params= message_send_params,
         )
-        send_response: SendMessageResponse = await client.send_message(message_request)
-        print(f"send_response ==== {send_response}")
+        started_at = time.perf_counter()
+        try:
+            send_response: SendMessageResponse = await client.send_message(message_request)
+        finally:
+            REMOTE_DELEGATION_LATENCY.observe(
+                time.perf_counter() - started_at, agent=agent_name
+            )
+        log_payload(logger, "Remote agent response", send_response, agent=agent_name)
         if not isinstance(send_response.root, SendMessageSuccessResponse) or not isinstance(send_response.root.result, Task):
-            print("Received a non-success or non-task response from the remote agent")
+            logger.warning("Received a non-success or non-task response from the remote agent")
             return 
+        add_delegated_usage(agent_name, send_response.root.result.metadata)
         response_content = send_response.root.model_dump_json(exclude_none=True)
         json_content = json.loads(response_content)
         resp = []
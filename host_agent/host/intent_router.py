@@ -0,0 +1,244 @@
+"""Local intent routing that bypasses the orchestrator model for obvious requests.
+
+Most first messages either ask for the current date or time, or are plainly
+meant for one remote agent ("Find hotel prices in Lisbon"). The orchestrator
+model spends a full call just to pick the agent for those. `IntentRouter`
+classifies the message locally instead: date/time questions are answered
+directly, and a request is sent straight to a remote agent when at least
+`INTENT_ROUTER_MIN_SCORE` words of only that agent's card (skill names, tags
+and descriptions, plus a few domain keywords) appear in it. Card examples are
+left out, since their place names say nothing about the route. Planning
+requests are never sent straight to the planner: they need the orchestrator's
+search-then-plan flow. Anything ambiguous returns None and goes to the
+orchestrator as before.
+"""
+
+import logging
+import re
+import time
+import uuid
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from a2a.types import (
+    AgentCard,
+    Message,
+    MessageSendParams,
+    Part,
+    Role,
+    SendStreamingMessageRequest,
+    SendStreamingMessageSuccessResponse,
+    Task,
+    TaskArtifactUpdateEvent,
+    TaskState,
+    TaskStatusUpdateEvent,
+    TextPart,
+)
+
+from .config import INTENT_ROUTER_MIN_SCORE, PLANNING_AGENT_NAME, SEARCH_AGENT_NAME
+from .metrics import REMOTE_DELEGATION_LATENCY
+from .remote_agent_connection import RemoteAgentConnections
+from .remote_agent_registry import RemoteAgentRegistry
+from .structured_logging import correlation_id
+from .usage import add_delegated_usage
+
+logger = logging.getLogger(__name__)
+
+DATE_TIME_QUESTION = re.compile(
+    r"^\s*(?:hi|hey|hello)?[,!\s]*(?:"
+    r"what(?:'s|\s+is)\s+(?:the\s+)?(?:current\s+)?(?:date|time|day)(?:\s+and\s+(?:date|time))?"
+    r"|what\s+(?:day|time|date)\s+is\s+it"
+    r"|what(?:'s|\s+is)\s+today(?:'s|\s+is)?\s*(?:date)?"
+    r"|(?:today'?s|current)\s+(?:date|time)"
+    r")(?:\s+(?:today|now|right\s+now))?\s*[?.!]*\s*$",
+    re.IGNORECASE,
+)
+# Domain words that point to one agent even when its card does not mention them.
+AGENT_KEYWORDS = {
+    SEARCH_AGENT_NAME: (
+        "search", "find", "price", "cost", "flight", "hotel", "weather", "forecast",
+        "visa", "availability", "available", "open", "cheap", "deal", "review", "current",
+        "latest", "advisory", "fare", "ticket",
+    ),
+    PLANNING_AGENT_NAME: (
+        "plan", "itinerary", "day-by-day", "schedule", "organize", "honeymoon", "getaway",
+    ),
+}
+_WORD = re.compile(r"[a-z][a-z'-]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from get in into is it of on or the to with what which "
+    "who how when where can could would should will i me my we our you your please some "
+    "any this that these those about including detailed information options".split()
+)
+
+
+def _stem(word: str) -> str:
+    """A crude stemmer; enough to match "searches", "searching" and "search"."""
+    word = word.strip("'-")
+    if word.endswith("ies") and len(word) > 4:
+        return word[:-3] + "y"
+    if word.endswith(("ches", "shes", "sses", "xes")):
+        return word[:-2]
+    if word.endswith("ing") and len(word) > 5:
+        word = word[:-3]
+        if len(word) > 2 and word[-1] == word[-2]:
+            word = word[:-1]
+        return word
+    if word.endswith("s") and not word.endswith("ss") and len(word) > 3:
+        return word[:-1]
+    return word
+
+
+def terms(text: str) -> set[str]:
+    return {_stem(word) for word in _WORD.findall(text.lower()) if word not in _STOPWORDS}
+
+
+@dataclass(frozen=True)
+class Route:
+    """Where a request is handled: "time" (answered locally) or "agent"."""
+
+    kind: str
+    agent_name: Optional[str] = None
+    score: int = 0
+
+
+class IntentRouter:
+    """Classifies first messages against the registered agents' cards."""
+
+    def __init__(self, registry: RemoteAgentRegistry, min_score: int = INTENT_ROUTER_MIN_SCORE):
+        self._registry = registry
+        self._min_score = min_score
+        # Vocabularies of the cards they were built from; cards are replaced, never mutated.
+        self._vocabularies: dict[str, tuple[AgentCard, set[str]]] = {}
+
+    def _vocabulary(self, name: str, card: AgentCard) -> set[str]:
+        cached = self._vocabularies.get(name)
+        if cached is not None and cached[0] is card:
+            return cached[1]
+        texts = [card.name, card.description or ""]
+        for skill in card.skills or []:
+            texts.extend([skill.name, skill.description or "", *(skill.tags or [])])
+        vocabulary = terms(" ".join(texts)) | {_stem(word) for word in AGENT_KEYWORDS.get(name, ())}
+        self._vocabularies[name] = (card, vocabulary)
+        return vocabulary
+
+    def connection(self, agent_name: str) -> Optional[RemoteAgentConnections]:
+        return self._registry.get(agent_name)
+
+    def classify(self, text: str) -> Optional[Route]:
+        """The route of an unambiguous request, or None to use the orchestrator."""
+        if DATE_TIME_QUESTION.match(text):
+            return Route("time")
+        vocabularies = {
+            name: self._vocabulary(name, card) for name, card in self._registry.cards.items()
+        }
+        if not vocabularies:
+            return None
+        # Words every agent knows ("travel", "trip") say nothing about the route.
+        shared = set.intersection(*vocabularies.values()) if len(vocabularies) > 1 else set()
+        request_terms = terms(text) - shared
+        scores = {
+            name: len(request_terms & vocabulary) for name, vocabulary in vocabularies.items()
+        }
+        matched = [name for name, score in scores.items() if score]
+        if len(matched) != 1 or scores[matched[0]] < self._min_score:
+            return None
+        # Plans are built from search findings, which only the orchestrator gathers.
+        if matched[0] == PLANNING_AGENT_NAME:
+            return None
+        return Route("agent", matched[0], scores[matched[0]])
+
+
+def _text_of(parts: list[Part]) -> str:
+    return "".join(part.root.text for part in parts if isinstance(part.root, TextPart))
+
+
+def answer_date_time() -> str:
+    now = datetime.now().astimezone()
+    return f"It is {now:%A, %B} {now.day}, {now:%Y}, {now:%H:%M} ({now.tzname()})."
+
+
+# States in which a delegated task ends without an answer to relay. The
+# orchestrator handles requests that need more input or authorization.
+UNSUCCESSFUL_STATES = frozenset(
+    {
+        TaskState.failed,
+        TaskState.rejected,
+        TaskState.canceled,
+        TaskState.input_required,
+        TaskState.auth_required,
+        TaskState.unknown,
+    }
+)
+
+
+class DirectDelegation:
+    """Streams one task to a remote agent and collects its response text."""
+
+    def __init__(self, connection: RemoteAgentConnections):
+        self._connection = connection
+        # Response text per artifact, in arrival order.
+        self._artifacts: dict[str, str] = {}
+
+    @property
+    def text(self) -> str:
+        return "\n\n".join(text for text in self._artifacts.values() if text)
+
+    async def stream(self, task: str) -> AsyncIterator[str]:
+        """Yields the response text as it arrives.
+
+        Raises if the remote task does not complete, in whatever event its
+        state arrives, or completes without any response text.
+        """
+        agent_name = self._connection.card.name
+        request = SendStreamingMessageRequest(
+            id=str(uuid.uuid4()),
+            params=MessageSendParams(
+                message=Message(
+                    role=Role.user,
+                    messageId=str(uuid.uuid4()),
+                    parts=[Part(root=TextPart(text=task))],
+                    metadata={"correlation_id": correlation_id.get()},
+                )
+            ),
+        )
+        started_at = time.perf_counter()
+        state = None
+        try:
+            async for response in self._connection.send_message_streaming(request):
+                if not isinstance(response.root, SendStreamingMessageSuccessResponse):
+                    raise RuntimeError(f"{agent_name} returned an error: {response.root}")
+                event = response.root.result
+                relayed = self.text
+                if isinstance(event, TaskArtifactUpdateEvent):
+                    artifact_id = event.artifact.artifactId
+                    text = _text_of(event.artifact.parts)
+                    if event.append:
+                        text = self._artifacts.get(artifact_id, "") + text
+                    self._artifacts[artifact_id] = text
+                elif isinstance(event, TaskStatusUpdateEvent):
+                    state = event.status.state
+                    if event.final:
+                        add_delegated_usage(agent_name, event.metadata)
+                elif isinstance(event, Task):
+                    state = event.status.state
+                    for artifact in event.artifacts or []:
+                        self._artifacts[artifact.artifactId] = _text_of(artifact.parts)
+                    add_delegated_usage(agent_name, event.metadata)
+                # A failure may arrive without `final`, and its text is not an answer.
+                if state in UNSUCCESSFUL_STATES:
+                    raise RuntimeError(f"{agent_name} task ended as {state.value}")
+                # A replacement normally repeats the streamed text; only new text is relayed.
+                current = self.text
+                if current.startswith(relayed) and len(current) > len(relayed):
+                    yield current[len(relayed):]
+            if state != TaskState.completed:
+                raise RuntimeError(f"{agent_name} stream ended before the task completed")
+            if not self.text.strip():
+                raise RuntimeError(f"{agent_name} completed without a response")
+        finally:
+            REMOTE_DELEGATION_LATENCY.observe(
+                time.perf_counter() - started_at, agent=agent_name
+            )
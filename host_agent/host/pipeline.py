@@ -0,0 +1,229 @@
+"""Pipelined search-to-plan delegation.
+
+Instead of waiting for the Search Agent to finish before contacting the
+Travel Planning Agent, the search task is streamed and the planning task is
+opened as soon as `PIPELINE_MIN_FINDINGS_CHARS` characters of complete
+findings have arrived. Findings count as complete once their artifact is
+finished or, while it is still streaming, up to the start of its latest
+section (a Markdown heading or a bold label on its own line), so the planner
+never sees a section cut off mid-sentence.
+
+Findings completed while the planner is working are collected and sent as
+one follow-up message in the same planning context when it replies. At most
+`PIPELINE_MAX_REVISIONS` such revisions are sent while the search is still
+running; everything found after that goes into a single final revision once
+the search has finished.
+"""
+
+import asyncio
+import logging
+import os
+import re
+import time
+import uuid
+
+from a2a.types import (
+    Message,
+    MessageSendParams,
+    Part,
+    Role,
+    SendMessageRequest,
+    SendMessageSuccessResponse,
+    SendStreamingMessageRequest,
+    SendStreamingMessageSuccessResponse,
+    Task,
+    TaskArtifactUpdateEvent,
+    TaskStatusUpdateEvent,
+    TextPart,
+)
+
+from .metrics import REMOTE_DELEGATION_LATENCY
+from .remote_agent_connection import RemoteAgentConnections
+from .structured_logging import correlation_id, log_payload
+from .usage import add_delegated_usage
+
+logger = logging.getLogger(__name__)
+
+# Complete findings needed before the planning task is opened.
+PIPELINE_MIN_FINDINGS_CHARS = int(os.getenv("PIPELINE_MIN_FINDINGS_CHARS", "400"))
+# Revisions sent while the search is still running.
+PIPELINE_MAX_REVISIONS = int(os.getenv("PIPELINE_MAX_REVISIONS", "1"))
+
+# A line that starts a new section of the findings.
+_SECTION_HEADING = re.compile(r"^(?:#{1,6}[ \t]|\*\*[^*\n]+\*\*:?[ \t]*$)", re.MULTILINE)
+
+
+def _text_of(parts: list[Part]) -> str:
+    return "".join(part.root.text for part in parts if isinstance(part.root, TextPart))
+
+
+def complete_sections(text: str) -> str:
+    """The part of a streaming text before its latest, possibly unfinished, section."""
+    starts = [match.start() for match in _SECTION_HEADING.finditer(text)]
+    return text[: starts[-1]].rstrip() if starts else ""
+
+
+def _message(text: str, context_id: str | None = None) -> MessageSendParams:
+    return MessageSendParams(
+        message=Message(
+            role=Role.user,
+            messageId=str(uuid.uuid4()),
+            contextId=context_id,
+            parts=[Part(root=TextPart(text=text))],
+            metadata={"correlation_id": correlation_id.get()},
+        )
+    )
+
+
+class SearchPlanPipeline:
+    """Runs one search task and the planning task that consumes its findings."""
+
+    def __init__(
+        self,
+        search: RemoteAgentConnections,
+        planning: RemoteAgentConnections,
+        min_findings_chars: int = PIPELINE_MIN_FINDINGS_CHARS,
+        max_revisions: int = PIPELINE_MAX_REVISIONS,
+    ):
+        self._search = search
+        self._planning = planning
+        self._min_findings_chars = min_findings_chars
+        self._max_revisions = max_revisions
+        self._planning_context_id = str(uuid.uuid4())
+        # Findings text per search artifact, in arrival order.
+        self._artifacts: dict[str, str] = {}
+        # Artifacts that will not change any more.
+        self._finished_artifacts: set[str] = set()
+        self._search_done = asyncio.Event()
+        self._ready = asyncio.Event()
+        self._updated = asyncio.Event()
+        self.planning_rounds = 0
+
+    @property
+    def findings(self) -> str:
+        return "\n\n".join(text for text in self._artifacts.values() if text)
+
+    @property
+    def complete_findings(self) -> str:
+        """The findings without any section that is still streaming."""
+        if self._search_done.is_set():
+            return self.findings
+        texts = (
+            text if artifact_id in self._finished_artifacts else complete_sections(text)
+            for artifact_id, text in self._artifacts.items()
+        )
+        return "\n\n".join(text for text in texts if text)
+
+    async def run(self, search_task: str, planning_task: str) -> dict:
+        """Returns the search findings and the plan built from them."""
+        planner = asyncio.create_task(self._plan(planning_task))
+        try:
+            await self._run_search(search_task)
+        except BaseException:
+            planner.cancel()
+            raise
+        return {"search_results": self.findings, "plan": await planner}
+
+    def _on_findings(self) -> None:
+        if len(self.complete_findings) >= self._min_findings_chars:
+            self._ready.set()
+        self._updated.set()
+
+    def _on_artifact(self, event: TaskArtifactUpdateEvent) -> None:
+        artifact_id = event.artifact.artifactId
+        text = _text_of(event.artifact.parts)
+        if event.append:
+            self._artifacts[artifact_id] = self._artifacts.get(artifact_id, "") + text
+        else:
+            self._artifacts[artifact_id] = text
+        if event.lastChunk:
+            self._finished_artifacts.add(artifact_id)
+        self._on_findings()
+
+    async def _run_search(self, search_task: str) -> None:
+        agent_name = self._search.card.name
+        request = SendStreamingMessageRequest(
+            id=str(uuid.uuid4()), params=_message(search_task)
+        )
+        started_at = time.perf_counter()
+        try:
+            async for response in self._search.send_message_streaming(request):
+                if not isinstance(response.root, SendStreamingMessageSuccessResponse):
+                    logger.warning("Search stream returned an error: %s", response.root)
+                    break
+                event = response.root.result
+                if isinstance(event, TaskArtifactUpdateEvent):
+                    self._on_artifact(event)
+                elif isinstance(event, TaskStatusUpdateEvent) and event.final:
+                    add_delegated_usage(agent_name, event.metadata)
+                elif isinstance(event, Task):
+                    for artifact in event.artifacts or []:
+                        self._artifacts[artifact.artifactId] = _text_of(artifact.parts)
+                        self._finished_artifacts.add(artifact.artifactId)
+                    self._on_findings()
+        finally:
+            REMOTE_DELEGATION_LATENCY.observe(
+                time.perf_counter() - started_at, agent=agent_name
+            )
+            self._search_done.set()
+            self._ready.set()
+            self._updated.set()
+        log_payload(logger, "Pipelined search findings", self.findings, agent=agent_name)
+
+    async def _plan(self, planning_task: str) -> str:
+        await self._ready.wait()
+        plan = ""
+        sent = None
+        revisions = 0
+        while True:
+            self._updated.clear()
+            findings = self.complete_findings
+            if sent is None:
+                text = planning_task
+                if findings:
+                    text += f"\n\nSearch findings so far:\n{findings}"
+            else:
+                # Sections are appended, so new findings normally extend what was sent.
+                new = findings[len(sent):] if findings.startswith(sent) else findings
+                if not new.strip():
+                    if self._search_done.is_set():
+                        return plan
+                    await self._updated.wait()
+                    continue
+                if revisions >= self._max_revisions and not self._search_done.is_set():
+                    # Send the rest in one final revision.
+                    await self._search_done.wait()
+                    continue
+                text = (
+                    "Additional search findings:\n"
+                    f"{new}\n\n"
+                    "Revise the travel plan to take them into account and return "
+                    "the complete revised plan."
+                )
+                if not self._search_done.is_set():
+                    revisions += 1
+            sent = findings
+            self.planning_rounds += 1
+            plan = await self._send_planning(text) or plan
+
+    async def _send_planning(self, text: str) -> str:
+        agent_name = self._planning.card.name
+        request = SendMessageRequest(
+            id=str(uuid.uuid4()), params=_message(text, self._planning_context_id)
+        )
+        started_at = time.perf_counter()
+        try:
+            response = await self._planning.send_message(request)
+        finally:
+            REMOTE_DELEGATION_LATENCY.observe(
+                time.perf_counter() - started_at, agent=agent_name
+            )
+        log_payload(logger, "Remote agent response", response, agent=agent_name)
+        if not isinstance(response.root, SendMessageSuccessResponse) or not isinstance(
+            response.root.result, Task
+        ):
+            logger.warning("Received a non-success or non-task response from the remote agent")
+            return ""
+        task = response.root.result
+        add_delegated_usage(agent_name, task.metadata)
+        return "\n".join(_text_of(artifact.parts) for artifact in task.artifacts or [])
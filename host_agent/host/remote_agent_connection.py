@@ -1,3 +1,6 @@
+import asyncio
+import logging
+from collections.abc import AsyncIterator
 from typing import Callable
 
 import httpx
@@ -6,6 +9,8 @@ from a2a.types import (
     AgentCard,
     SendMessageRequest,
     SendMessageResponse,
+    SendStreamingMessageRequest,
+    SendStreamingMessageResponse,
     Task,
     TaskArtifactUpdateEvent,
     TaskStatusUpdateEvent,
@@ -14,6 +19,8 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 TaskCallbackArg = Task | TaskStatusUpdateEvent | TaskArtifactUpdateEvent
 TaskUpdateCallback = Callable[[TaskCallbackArg, AgentCard], Task]
 
@@ -21,12 +28,22 @@ TaskUpdateCallback = Callable[[TaskCallbackArg, AgentCard], Task]
 class RemoteAgentConnections:
     """A class to hold the connections to the remote agents."""
 
-    def __init__(self, agent_card: AgentCard, agent_url: str):
-        print(f"agent_card: {agent_card}")
-        print(f"agent_url: {agent_url}")
-        self._httpx_client = httpx.AsyncClient(timeout=30)
+    def __init__(
+        self,
+        agent_card: AgentCard,
+        agent_url: str,
+        http_client: httpx.AsyncClient | None = None,
+    ):
+        logger.info("Connecting to remote agent %s at %s", agent_card.name, agent_url)
+        # Share the caller's connection pool when one is provided.
+        self._owns_client = http_client is None
+        self._httpx_client = http_client or httpx.AsyncClient(timeout=30)
         self.agent_client = A2AClient(self._httpx_client, agent_card, url=agent_url)
         self.card = agent_card
+        self.url = agent_url
+        self._in_flight = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
         self.conversation_name = None
         self.conversation = None
         self.pending_tasks = set()
@@ -34,7 +51,43 @@ class RemoteAgentConnections:
     def get_agent(self) -> AgentCard:
         return self.card
 
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def _begin_request(self) -> None:
+        self._in_flight += 1
+        self._idle.clear()
+
+    def _end_request(self) -> None:
+        self._in_flight -= 1
+        if self._in_flight == 0:
+            self._idle.set()
+
     async def send_message(
         self, message_request: SendMessageRequest
     ) -> SendMessageResponse:
-        return await self.agent_client.send_message(message_request)
\ No newline at end of file
+        self._begin_request()
+        try:
+            return await self.agent_client.send_message(message_request)
+        finally:
+            self._end_request()
+
+    async def send_message_streaming(
+        self, message_request: SendStreamingMessageRequest
+    ) -> AsyncIterator[SendStreamingMessageResponse]:
+        self._begin_request()
+        try:
+            async for response in self.agent_client.send_message_streaming(message_request):
+                yield response
+        finally:
+            self._end_request()
+
+    async def wait_idle(self) -> None:
+        """Waits until no request is in flight on this connection."""
+        await self._idle.wait()
+
+    async def close(self) -> None:
+        """Closes the HTTP client unless it is a shared pool owned by the caller."""
+        if self._owns_client:
+            await self._httpx_client.aclose()
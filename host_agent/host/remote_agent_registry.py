@@ -0,0 +1,224 @@
+"""Runtime-updatable registry of the remote agents the host delegates to.
+
+Readers (the `send_message` tool and the instruction provider) see immutable
+snapshots that are swapped atomically, so request handling never waits on an
+update. Removed or replaced connections are drained in the background: they
+are closed once their in-flight requests have finished.
+
+Every agent remembers where it came from: the configured URL list
+(`CONFIG_SOURCE`, synced from `REMOTE_AGENT_URLS` or `REMOTE_AGENTS_FILE`) or
+the admin API (`ADMIN_SOURCE`). A sync only removes agents of its own
+source, so reloading the file keeps the agents an administrator added.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from typing import Optional
+
+import httpx
+from a2a.client import A2ACardResolver
+from a2a.types import AgentCard
+
+from .remote_agent_connection import RemoteAgentConnections
+
+logger = logging.getLogger(__name__)
+
+NO_AGENTS_LISTING = "No remote agents found"
+CONFIG_SOURCE = "config"
+ADMIN_SOURCE = "admin"
+
+
+class RemoteAgentRegistry:
+    """Holds the remote agent connections, cards and the instruction listing."""
+
+    def __init__(
+        self,
+        http_client: Optional[httpx.AsyncClient] = None,
+        drain_timeout: float = 120.0,
+    ):
+        self._http_client = http_client
+        self._drain_timeout = drain_timeout
+        # Snapshots below are replaced, never mutated in place.
+        self._connections: dict[str, RemoteAgentConnections] = {}
+        self._sources: dict[str, str] = {}
+        self._listing_lines: dict[str, str] = {}
+        self._listing = NO_AGENTS_LISTING
+        # Serializes writers only; readers never take it.
+        self._update_lock = asyncio.Lock()
+        self._draining: set[asyncio.Task] = set()
+
+    @property
+    def connections(self) -> dict[str, RemoteAgentConnections]:
+        return self._connections
+
+    @property
+    def cards(self) -> dict[str, AgentCard]:
+        return {name: connection.card for name, connection in self._connections.items()}
+
+    @property
+    def urls(self) -> dict[str, str]:
+        return {name: connection.url for name, connection in self._connections.items()}
+
+    @property
+    def sources(self) -> dict[str, str]:
+        """Where each agent was added from, `CONFIG_SOURCE` or `ADMIN_SOURCE`."""
+        return self._sources
+
+    @property
+    def listing(self) -> str:
+        """The `Available Agents` listing used in the host instruction."""
+        return self._listing
+
+    def get(self, agent_name: str) -> Optional[RemoteAgentConnections]:
+        return self._connections.get(agent_name)
+
+    async def _resolve(self, client: httpx.AsyncClient, url: str) -> Optional[RemoteAgentConnections]:
+        try:
+            card = await A2ACardResolver(client, url).get_agent_card()
+        except httpx.ConnectError as e:
+            logger.warning(f"Error connecting to {url}: {e}")
+            return None
+        except Exception as e:
+            logger.warning(f"Error retrieving card for {url}: {e}")
+            return None
+        return RemoteAgentConnections(card, url, self._http_client)
+
+    def _publish(
+        self,
+        added: list[RemoteAgentConnections],
+        removed_names: list[str],
+        source: str = CONFIG_SOURCE,
+    ) -> None:
+        connections = dict(self._connections)
+        sources = dict(self._sources)
+        lines = dict(self._listing_lines)
+        for name in removed_names:
+            self._drain(connections.pop(name, None))
+            sources.pop(name, None)
+            lines.pop(name, None)
+        for connection in added:
+            name = connection.card.name
+            self._drain(connections.get(name))
+            connections[name] = connection
+            sources[name] = source
+            # Only the changed agent's entry is re-serialized.
+            lines[name] = json.dumps(
+                {"name": name, "description": connection.card.description}
+            )
+        self._connections = connections
+        self._sources = sources
+        self._listing_lines = lines
+        self._listing = "\n".join(lines.values()) if lines else NO_AGENTS_LISTING
+
+    def _drain(self, connection: Optional[RemoteAgentConnections]) -> None:
+        if connection is None:
+            return
+        task = asyncio.create_task(self._close_when_idle(connection))
+        self._draining.add(task)
+        task.add_done_callback(self._draining.discard)
+
+    async def _close_when_idle(self, connection: RemoteAgentConnections) -> None:
+        try:
+            await asyncio.wait_for(connection.wait_idle(), self._drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Closing %s with %d request(s) still in flight",
+                connection.card.name,
+                connection.in_flight,
+            )
+        await connection.close()
+        logger.info("Drained remote agent %s at %s", connection.card.name, connection.url)
+
+    async def _resolve_all(self, urls: list[str]) -> list[RemoteAgentConnections]:
+        async def resolve_with(client: httpx.AsyncClient):
+            results = await asyncio.gather(*(self._resolve(client, url) for url in urls))
+            return [connection for connection in results if connection is not None]
+
+        if self._http_client is not None:
+            return await resolve_with(self._http_client)
+        async with httpx.AsyncClient(timeout=30) as client:
+            return await resolve_with(client)
+
+    async def add(self, url: str, source: str = ADMIN_SOURCE) -> Optional[AgentCard]:
+        """Adds (or refreshes) the agent served at `url`."""
+        async with self._update_lock:
+            connections = await self._resolve_all([url])
+            if not connections:
+                return None
+            self._publish(connections, [], source)
+            return connections[0].card
+
+    async def remove(self, agent_name: str) -> bool:
+        """Removes an agent; its connection is closed once idle."""
+        async with self._update_lock:
+            if agent_name not in self._connections:
+                return False
+            self._publish([], [agent_name])
+            return True
+
+    async def sync(self, urls: list[str], source: str = CONFIG_SOURCE) -> None:
+        """Makes the agents from `source` exactly the agents at `urls`.
+
+        Agents from other sources are kept, and a URL that one of them
+        already serves is not added again.
+        """
+        async with self._update_lock:
+            wanted = {url.rstrip("/") for url in urls}
+            current = {name: url.rstrip("/") for name, url in self.urls.items()}
+            removed = [
+                name
+                for name, url in current.items()
+                if url not in wanted and self._sources.get(name) == source
+            ]
+            new_urls = [url for url in urls if url.rstrip("/") not in current.values()]
+            added = await self._resolve_all(new_urls) if new_urls else []
+            if added or removed:
+                self._publish(added, removed, source)
+                logger.info(
+                    "Remote agents updated: added %s, removed %s",
+                    [connection.card.name for connection in added],
+                    removed,
+                )
+
+    async def watch_file(self, path: str, interval: float = 5.0) -> None:
+        """Polls `path` and syncs the configured agents whenever it changes.
+
+        The file lists one agent URL per line (blank lines and `#` comments
+        are ignored) or holds a JSON list of URLs.
+        """
+        last_mtime = None
+        while True:
+            try:
+                mtime = os.stat(path).st_mtime
+                if mtime != last_mtime:
+                    last_mtime = mtime
+                    await self.sync(read_agent_urls(path))
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logger.error(f"Error reloading remote agents from {path}: {e}")
+            await asyncio.sleep(interval)
+
+    async def aclose(self) -> None:
+        """Closes every connection, including those still draining."""
+        for task in list(self._draining):
+            task.cancel()
+        for connection in self._connections.values():
+            await connection.close()
+        self._connections = {}
+        self._sources = {}
+
+
+def read_agent_urls(path: str) -> list[str]:
+    """Reads the agent URLs listed in a registry config file."""
+    with open(path, encoding="utf-8") as f:
+        content = f.read()
+    if content.lstrip().startswith("["):
+        return [str(url).strip() for url in json.loads(content) if str(url).strip()]
+    return [
+        line.strip()
+        for line in content.splitlines()
+        if line.strip() and not line.strip().startswith("#")
+    ]
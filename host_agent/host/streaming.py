@@ -0,0 +1,62 @@
+"""Token-level streaming of model output as incremental A2A artifacts.
+
+With `AGENT_STREAMING_MODE=sse` (the default) the runner streams partial
+model responses. Each text chunk is sent to the client as an artifact update
+that appends to the task's response artifact; once the final response
+arrives the artifact is replaced by the fully assembled parts and marked as
+the last chunk.
+"""
+
+import os
+import time
+import uuid
+
+from a2a.server.tasks import TaskUpdater
+from a2a.types import Artifact, Part, TaskArtifactUpdateEvent
+from google.adk.agents.run_config import RunConfig, StreamingMode
+
+from .metrics import TIME_TO_FIRST_CHUNK
+
+AGENT_STREAMING_MODE = os.getenv("AGENT_STREAMING_MODE", "sse").lower()
+
+
+def build_run_config() -> RunConfig:
+    """The run config used for every agent invocation."""
+    if AGENT_STREAMING_MODE == "sse":
+        return RunConfig(streaming_mode=StreamingMode.SSE)
+    return RunConfig(streaming_mode=StreamingMode.NONE)
+
+
+class ArtifactStreamer:
+    """Streams a task's response artifact chunk by chunk."""
+
+    def __init__(self, task_updater: TaskUpdater, name: str = "response"):
+        self._task_updater = task_updater
+        self._name = name
+        self.artifact_id = str(uuid.uuid4())
+        self.chunks = 0
+        self._started_at = time.perf_counter()
+
+    async def _enqueue(self, parts: list[Part], append: bool, last_chunk: bool) -> None:
+        await self._task_updater.event_queue.enqueue_event(
+            TaskArtifactUpdateEvent(
+                taskId=self._task_updater.task_id,
+                contextId=self._task_updater.context_id,
+                artifact=Artifact(artifactId=self.artifact_id, name=self._name, parts=parts),
+                append=append,
+                lastChunk=last_chunk,
+            )
+        )
+
+    async def append(self, parts: list[Part]) -> None:
+        """Appends a partial chunk to the response artifact."""
+        if not parts:
+            return
+        if self.chunks == 0:
+            TIME_TO_FIRST_CHUNK.observe(time.perf_counter() - self._started_at)
+        await self._enqueue(parts, append=self.chunks > 0, last_chunk=False)
+        self.chunks += 1
+
+    async def finish(self, parts: list[Part]) -> None:
+        """Replaces the streamed chunks with the assembled final parts."""
+        await self._enqueue(parts, append=False, last_chunk=True)
@@ -1,29 +1,67 @@
 """
 RAG Tools package for interacting with Vertex AI RAG corpora.
+
+Every tool has a non-blocking `*_async` variant for use inside the event loop.
+
+Tools are imported on first access so that importing the package does not
+pull in `vertexai` until a tool is actually used.
 """
 
-from .add_data import add_data
-from .create_corpus import create_corpus
-from .delete_corpus import delete_corpus
-from .delete_document import delete_document
-from .get_corpus_info import get_corpus_info
-from .list_corpora import list_corpora
-from .rag_query import rag_query
-from .utils import (
-    check_corpus_exists,
-    get_corpus_resource_name,
-    set_current_corpus,
-)
+import importlib
+
+_TOOL_MODULES = {
+    "add_data": ".add_data",
+    "create_corpus": ".create_corpus",
+    "delete_corpus": ".delete_corpus",
+    "delete_document": ".delete_document",
+    "get_corpus_info": ".get_corpus_info",
+    "list_corpora": ".list_corpora",
+    "rag_query": ".rag_query",
+    "rag_batch_query": ".rag_batch_query",
+    "rag_multi_query": ".rag_multi_query",
+    "add_data_async": ".async_tools",
+    "create_corpus_async": ".async_tools",
+    "delete_corpus_async": ".async_tools",
+    "delete_document_async": ".async_tools",
+    "get_corpus_info_async": ".async_tools",
+    "list_corpora_async": ".async_tools",
+    "rag_query_async": ".async_tools",
+    "check_corpus_exists": ".utils",
+    "get_corpus_resource_name": ".utils",
+    "set_current_corpus": ".utils",
+}
 
 __all__ = [
     "add_data",
     "create_corpus",
     "list_corpora",
     "rag_query",
+    "rag_batch_query",
+    "rag_multi_query",
     "get_corpus_info",
     "delete_corpus",
     "delete_document",
+    "add_data_async",
+    "create_corpus_async",
+    "list_corpora_async",
+    "rag_query_async",
+    "get_corpus_info_async",
+    "delete_corpus_async",
+    "delete_document_async",
     "check_corpus_exists",
     "get_corpus_resource_name",
     "set_current_corpus",
 ]
+
+
+def __getattr__(name: str):
+    module_name = _TOOL_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -6,13 +6,14 @@ import re
 from typing import List
 
 from google.adk.tools.tool_context import ToolContext
-from vertexai import rag
 
 from ..config import (
     DEFAULT_CHUNK_OVERLAP,
     DEFAULT_CHUNK_SIZE,
-    DEFAULT_EMBEDDING_REQUESTS_PER_MIN,
 )
+from .corpus_catalog import get_corpus_catalog
+from .rag_backend import get_rag_backend
+from .retrieval_cache import get_retrieval_cache
 from .utils import check_corpus_exists, get_corpus_resource_name
 
 
@@ -31,6 +32,7 @@ def add_data(
                           - Google Drive: "https://drive.google.com/file/d/{FILE_ID}/view"
                           - Google Docs/Sheets/Slides: "https://docs.google.com/{type}/d/{FILE_ID}/..."
                           - Google Cloud Storage: "gs://{BUCKET}/{PATH}"
+                          - Local files or directories (only with RAG_BACKEND=local)
                           Example: ["https://drive.google.com/file/d/123", "gs://my_bucket/resumes"]
         tool_context (ToolContext): The tool context
 
@@ -56,6 +58,7 @@ def add_data(
         }
 
     # Pre-process paths to validate and convert Google Docs URLs to Drive format if needed
+    backend = get_rag_backend()
     validated_paths = []
     invalid_paths = []
     conversions = []
@@ -96,6 +99,16 @@ def add_data(
             validated_paths.append(path)
             continue
 
+        # Local files and directories, when the backend can read them; only
+        # paths inside the backend's import directory are accepted
+        if backend.supports_local_paths:
+            local_path = backend.resolve_local_path(path)
+            if local_path:
+                validated_paths.append(local_path)
+            else:
+                invalid_paths.append(f"{path} (Not under the local import directory)")
+            continue
+
         # If we're here, the path wasn't in a recognized format
         invalid_paths.append(f"{path} (Invalid format)")
 
@@ -112,22 +125,20 @@ def add_data(
         # Get the corpus resource name
         corpus_resource_name = get_corpus_resource_name(corpus_name)
 
-        # Set up chunking configuration optimized for candidate profiles
-        # Using smaller chunks to better capture specific skills and experiences
-        transformation_config = rag.TransformationConfig(
-            chunking_config=rag.ChunkingConfig(
+        # Import candidate profiles to the corpus, using smaller chunks to
+        # better capture specific skills and experiences
+        try:
+            imported_count = backend.import_files(
+                corpus_resource_name,
+                validated_paths,
                 chunk_size=DEFAULT_CHUNK_SIZE,
                 chunk_overlap=DEFAULT_CHUNK_OVERLAP,
-            ),
-        )
-
-        # Import candidate profiles to the corpus
-        import_result = rag.import_files(
-            corpus_resource_name,
-            validated_paths,
-            transformation_config=transformation_config,
-            max_embedding_requests_per_min=DEFAULT_EMBEDDING_REQUESTS_PER_MIN,
-        )
+            )
+        finally:
+            # Even a failed import may have added some of the files
+            get_retrieval_cache().invalidate_corpus(corpus_resource_name)
+        # The corpus update time changed
+        get_corpus_catalog().invalidate()
 
         # Set this as the current corpus if not already set
         if not tool_context.state.get("current_corpus"):
@@ -140,9 +151,9 @@ def add_data(
 
         return {
             "status": "success",
-            "message": f"Successfully added {import_result.imported_rag_files_count} candidate profile(s) to corpus '{corpus_name}'{conversion_msg}",
+            "message": f"Successfully added {imported_count} candidate profile(s) to corpus '{corpus_name}'{conversion_msg}",
             "corpus_name": corpus_name,
-            "profiles_added": import_result.imported_rag_files_count,
+            "profiles_added": imported_count,
             "paths": validated_paths,
             "invalid_paths": invalid_paths,
             "conversions": conversions,
@@ -0,0 +1,129 @@
+"""
+Non-blocking variants of the RAG tools.
+
+The Vertex AI `rag.*` functions block, so calling the synchronous tools from
+the ADK event loop stalls every other session served by the process. The
+variants below run the same tool functions on a bounded thread pool
+(`RAG_TOOL_MAX_WORKERS` threads) and await them with a per-call timeout
+(`RAG_TOOL_TIMEOUT` seconds by default). They keep the tool names,
+signatures and return dictionaries, so they can replace the synchronous tools
+in an agent's tool list one for one.
+
+A timed-out call returns the tool's usual error dictionary. Cancelling the
+awaiting task propagates as usual; a call still waiting for a thread is
+dropped, while one already running finishes in the background and its result
+is discarded.
+"""
+
+import asyncio
+import functools
+import inspect
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from ..config import RAG_TOOL_MAX_WORKERS, RAG_TOOL_TIMEOUT
+from ..metrics import RAG_TOOL_LATENCY
+from .add_data import add_data
+from .create_corpus import create_corpus
+from .delete_corpus import delete_corpus
+from .delete_document import delete_document
+from .get_corpus_info import get_corpus_info
+from .list_corpora import list_corpora
+from .rag_query import rag_query
+from .utils import check_corpus_exists, get_corpus_resource_name
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_rag_executor() -> ThreadPoolExecutor:
+    """Returns the thread pool shared by the async RAG tools."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=RAG_TOOL_MAX_WORKERS, thread_name_prefix="rag-tool"
+        )
+    return _executor
+
+
+def _error_result(func: Callable, message: str, args: tuple, kwargs: dict) -> dict:
+    """The tool's error dictionary, echoing its identifying arguments."""
+    result = {"status": "error", "message": message}
+    try:
+        bound = inspect.signature(func).bind_partial(*args, **kwargs)
+    except TypeError:
+        return result
+    for name, value in bound.arguments.items():
+        if name != "tool_context" and isinstance(value, (str, list)):
+            result[name] = value
+    return result
+
+
+async def run_tool(
+    func: Callable[..., dict],
+    *args: Any,
+    timeout: Optional[float] = RAG_TOOL_TIMEOUT,
+    **kwargs: Any,
+) -> dict:
+    """Runs a synchronous RAG tool on the shared pool with a timeout."""
+    loop = asyncio.get_running_loop()
+    started_at = time.perf_counter()
+    outcome = "ok"
+    try:
+        return await asyncio.wait_for(
+            loop.run_in_executor(get_rag_executor(), functools.partial(func, *args, **kwargs)),
+            timeout,
+        )
+    except asyncio.TimeoutError:
+        outcome = "timeout"
+        error_msg = f"{func.__name__} timed out after {timeout:g} seconds"
+        logger.error(error_msg)
+        return _error_result(func, error_msg, args, kwargs)
+    except asyncio.CancelledError:
+        outcome = "cancelled"
+        raise
+    except Exception as e:
+        outcome = "error"
+        error_msg = f"Error running {func.__name__}: {str(e)}"
+        logger.error(error_msg)
+        return _error_result(func, error_msg, args, kwargs)
+    finally:
+        RAG_TOOL_LATENCY.observe(
+            time.perf_counter() - started_at, tool=func.__name__, outcome=outcome
+        )
+
+
+async def resolve_corpus(corpus_name: str, tool_context) -> str | dict:
+    """The resource name of an existing corpus, or the tool error dictionary."""
+    exists = await run_tool(check_corpus_exists, corpus_name, tool_context)
+    if isinstance(exists, dict):
+        # run_tool reports failures and timeouts as an error dictionary
+        return exists
+    if not exists:
+        return {
+            "status": "error",
+            "message": f"Corpus '{corpus_name}' does not exist. Please create it first using the create_corpus tool.",
+            "corpus_name": corpus_name,
+        }
+    return await run_tool(get_corpus_resource_name, corpus_name)
+
+
+def _async_tool(func: Callable[..., dict]) -> Callable[..., Any]:
+    # functools.wraps keeps the name, signature and docstring the model sees.
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs) -> dict:
+        return await run_tool(func, *args, **kwargs)
+
+    return wrapper
+
+
+add_data_async = _async_tool(add_data)
+create_corpus_async = _async_tool(create_corpus)
+delete_corpus_async = _async_tool(delete_corpus)
+delete_document_async = _async_tool(delete_document)
+get_corpus_info_async = _async_tool(get_corpus_info)
+list_corpora_async = _async_tool(list_corpora)
+rag_query_async = _async_tool(rag_query)
@@ -0,0 +1,116 @@
+"""
+Process-wide catalog of the Vertex AI RAG corpora.
+
+Resolving a corpus name used to list every corpus through the API, twice per
+tool call. The catalog keeps the last listing in memory, indexed by display
+name and by resource name, so name resolution is a dict lookup. Listings
+expire after `CORPUS_CATALOG_TTL` seconds and are dropped explicitly by the
+tools that create, delete or import into a corpus. Concurrent refreshes are
+coalesced: one caller lists the corpora while the others wait for its result.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+from ..config import CORPUS_CATALOG_MISS_REFRESH, CORPUS_CATALOG_TTL
+from ..metrics import CORPUS_CATALOG_REFRESHES
+from .rag_backend import get_rag_backend
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """One listing of the corpora; replaced, never mutated."""
+
+    corpora: tuple = ()
+    by_display_name: dict = field(default_factory=dict)
+    by_resource_name: dict = field(default_factory=dict)
+    loaded_at: float = 0.0
+
+    @classmethod
+    def from_corpora(cls, corpora) -> "CatalogSnapshot":
+        corpora = tuple(corpora)
+        return cls(
+            corpora=corpora,
+            by_display_name={
+                corpus.display_name: corpus
+                for corpus in corpora
+                if getattr(corpus, "display_name", None)
+            },
+            by_resource_name={corpus.name: corpus for corpus in corpora},
+            loaded_at=time.monotonic(),
+        )
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.loaded_at
+
+    def find(self, name: str):
+        return self.by_resource_name.get(name) or self.by_display_name.get(name)
+
+
+class CorpusCatalog:
+    """Cached, coalesced listing of the RAG corpora."""
+
+    def __init__(self, ttl: float = CORPUS_CATALOG_TTL, miss_refresh: float = CORPUS_CATALOG_MISS_REFRESH):
+        self.ttl = ttl
+        # A name missing from a listing older than this triggers one refresh.
+        self.miss_refresh = miss_refresh
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._generation = 0
+        self._refresh_lock = threading.Lock()
+
+    def _current(self, max_age: float) -> CatalogSnapshot:
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.age < max_age:
+            return snapshot
+        with self._refresh_lock:
+            # Another caller may have refreshed while this one waited.
+            snapshot = self._snapshot
+            if snapshot is not None and snapshot.age < max_age:
+                return snapshot
+            return self._load()
+
+    def _load(self) -> CatalogSnapshot:
+        generation = self._generation
+        snapshot = CatalogSnapshot.from_corpora(get_rag_backend().list_corpora())
+        CORPUS_CATALOG_REFRESHES.inc()
+        # A listing started before an invalidation may miss the change; it is
+        # returned to this caller but not kept.
+        if generation == self._generation:
+            self._snapshot = snapshot
+        logger.debug("Loaded %d corpora into the catalog", len(snapshot.corpora))
+        return snapshot
+
+    def refresh(self) -> tuple:
+        """Lists the corpora now and returns them."""
+        with self._refresh_lock:
+            return self._load().corpora
+
+    def get(self, name: str):
+        """The corpus with this display or resource name, or None."""
+        snapshot = self._current(self.ttl)
+        corpus = snapshot.find(name)
+        if corpus is None and snapshot.age >= self.miss_refresh:
+            corpus = self._current(self.miss_refresh).find(name)
+        return corpus
+
+    def invalidate(self) -> None:
+        """Drops the cached listing after a corpus was created, deleted or changed."""
+        self._generation += 1
+        self._snapshot = None
+
+
+_default_catalog: Optional[CorpusCatalog] = None
+
+
+def get_corpus_catalog() -> CorpusCatalog:
+    """Returns the process-wide corpus catalog."""
+    global _default_catalog
+    if _default_catalog is None:
+        _default_catalog = CorpusCatalog()
+    return _default_catalog
@@ -5,11 +5,9 @@ Tool for creating a new candidate corpus for resume/CV matching.
 import re
 
 from google.adk.tools.tool_context import ToolContext
-from vertexai import rag
 
-from ..config import (
-    DEFAULT_EMBEDDING_MODEL,
-)
+from .corpus_catalog import get_corpus_catalog
+from .rag_backend import get_rag_backend
 from .utils import check_corpus_exists
 
 
@@ -40,20 +38,10 @@ def create_corpus(
         # Clean corpus name for use as display name
         display_name = re.sub(r"[^a-zA-Z0-9_-]", "_", corpus_name)
 
-        # Configure embedding model optimized for candidate profile matching
-        embedding_model_config = rag.RagEmbeddingModelConfig(
-            vertex_prediction_endpoint=rag.VertexPredictionEndpoint(
-                publisher_model=DEFAULT_EMBEDDING_MODEL
-            )
-        )
-
         # Create the candidate corpus
-        rag_corpus = rag.create_corpus(
-            display_name=display_name,
-            backend_config=rag.RagVectorDbConfig(
-                rag_embedding_model_config=embedding_model_config
-            ),
-        )
+        rag_corpus = get_rag_backend().create_corpus(display_name)
+
+        get_corpus_catalog().invalidate()
 
         # Update state to track corpus existence
         tool_context.state[f"corpus_exists_{corpus_name}"] = True
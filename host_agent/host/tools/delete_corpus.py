@@ -1,10 +1,12 @@
 """
-Tool for deleting a Vertex AI RAG corpus when it's no longer needed.
+Tool for deleting a RAG corpus when it's no longer needed.
 """
 
 from google.adk.tools.tool_context import ToolContext
-from vertexai import rag
 
+from .corpus_catalog import get_corpus_catalog
+from .rag_backend import get_rag_backend
+from .retrieval_cache import get_retrieval_cache
 from .utils import check_corpus_exists, get_corpus_resource_name
 
 
@@ -47,7 +49,11 @@ def delete_corpus(
         corpus_resource_name = get_corpus_resource_name(corpus_name)
 
         # Delete the corpus
-        rag.delete_corpus(corpus_resource_name)
+        try:
+            get_rag_backend().delete_corpus(corpus_resource_name)
+        finally:
+            get_retrieval_cache().invalidate_corpus(corpus_resource_name)
+        get_corpus_catalog().invalidate()
 
         # Remove from state by setting to False
         state_key = f"corpus_exists_{corpus_name}"
@@ -3,8 +3,9 @@ Tool for deleting a specific document from a Vertex AI RAG corpus.
 """
 
 from google.adk.tools.tool_context import ToolContext
-from vertexai import rag
 
+from .rag_backend import get_rag_backend
+from .retrieval_cache import get_retrieval_cache
 from .utils import check_corpus_exists, get_corpus_resource_name
 
 
@@ -41,7 +42,10 @@ def delete_document(
 
         # Delete the document
         rag_file_path = f"{corpus_resource_name}/ragFiles/{document_id}"
-        rag.delete_file(rag_file_path)
+        try:
+            get_rag_backend().delete_file(rag_file_path)
+        finally:
+            get_retrieval_cache().invalidate_corpus(corpus_resource_name)
 
         return {
             "status": "success",
@@ -3,8 +3,8 @@ Tool for retrieving detailed information about a specific RAG corpus.
 """
 
 from google.adk.tools.tool_context import ToolContext
-from vertexai import rag
 
+from .rag_backend import get_rag_backend
 from .utils import check_corpus_exists, get_corpus_resource_name
 
 
@@ -42,7 +42,7 @@ def get_corpus_info(
         file_details = []
         try:
             # Get the list of files
-            files = rag.list_files(corpus_resource_name)
+            files = get_rag_backend().list_files(corpus_resource_name)
             for rag_file in files:
                 # Get document specific details
                 try:
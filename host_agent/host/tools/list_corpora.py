@@ -4,7 +4,7 @@ Tool for listing all available Vertex AI RAG corpora.
 
 from typing import Dict, List, Union
 
-from vertexai import rag
+from .corpus_catalog import get_corpus_catalog
 
 
 def list_corpora() -> dict:
@@ -19,8 +19,8 @@ def list_corpora() -> dict:
             - update_time: When the corpus was last updated
     """
     try:
-        # Get the list of corpora
-        corpora = rag.list_corpora()
+        # Get the list of corpora, refreshing the catalog on the way
+        corpora = get_corpus_catalog().refresh()
 
         # Process corpus information into a more usable format
         corpus_info: List[Dict[str, Union[str, int]]] = []
@@ -0,0 +1,581 @@
+"""
+Local vector store implementing the RAG backend (`RAG_BACKEND=local`).
+
+Every corpus is a directory under `RAG_LOCAL_DIR`. Documents are split into
+overlapping word windows of `DEFAULT_CHUNK_SIZE` words (overlapping by
+`DEFAULT_CHUNK_OVERLAP`), embedded with a pluggable embedding function and
+appended to a float32 matrix of unit vectors that is memory-mapped at query
+time, so opening a corpus reads nothing eagerly. Chunk texts live in one
+byte file addressed by an offsets array.
+
+Queries are scored by cosine similarity with vectorized NumPy matrix products,
+in blocks over the whole matrix (exact search) or, once a corpus holds
+`RAG_LOCAL_IVF_MIN_CHUNKS` chunks, over the `RAG_LOCAL_NPROBE` closest
+clusters of an inverted-file (IVF) index built with spherical k-means.
+Distances are reported as 1 - cosine similarity, like Vertex AI RAG's
+default cosine distance. Deleted documents are masked out, not compacted.
+"""
+
+import importlib
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+import uuid
+import zlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+import numpy as np
+
+from ..config import (
+    DEFAULT_CHUNK_OVERLAP,
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_DISTANCE_THRESHOLD,
+    DEFAULT_TOP_K,
+    RAG_LOCAL_DIR,
+    RAG_LOCAL_DISTANCE_THRESHOLD,
+    RAG_LOCAL_EMBEDDING,
+    RAG_LOCAL_EMBEDDING_DIM,
+    RAG_LOCAL_IMPORT_DIR,
+    RAG_LOCAL_IVF_MIN_CHUNKS,
+    RAG_LOCAL_NPROBE,
+)
+from .rag_backend import RagBackend
+
+logger = logging.getLogger(__name__)
+
+LOCAL_CORPORA_PREFIX = "projects/local/locations/local/ragCorpora"
+TEXT_SUFFIXES = (
+    ".txt", ".md", ".markdown", ".rst", ".csv", ".tsv", ".json", ".jsonl",
+    ".html", ".htm", ".xml", ".yaml", ".yml",
+)
+# Rows scored per matrix product in exact search (64 MB of float32 at 256 dims).
+SEARCH_BLOCK_ROWS = 65_536
+EMBEDDING_BATCH_SIZE = 256
+# Sample rows per cluster used to train the IVF centroids.
+IVF_TRAINING_ROWS_PER_LIST = 64
+HASHING_DISTANCE_THRESHOLD = 0.96
+_ID = re.compile(r"^[A-Za-z0-9_-]+$")
+_WORD = re.compile(r"\w+")
+_STOPWORDS = frozenset(
+    "a about after all also an and any are as at be been but by can could do does for from get "
+    "had has have how i if in into is it its me my no not of on or our so than that the their "
+    "them then there these they this those to up us was we were what when where which who why "
+    "will with would you your".split()
+)
+
+EmbeddingFunction = Callable[[list[str]], np.ndarray]
+
+
+def chunk_text(
+    text: str, chunk_size: int = DEFAULT_CHUNK_SIZE, chunk_overlap: int = DEFAULT_CHUNK_OVERLAP
+) -> list[str]:
+    """Splits text into windows of `chunk_size` words overlapping by `chunk_overlap` words.
+
+    Words stand in for the tokens Vertex AI RAG chunks by.
+    """
+    words = text.split()
+    step = max(chunk_size - chunk_overlap, 1)
+    chunks = []
+    for start in range(0, len(words), step):
+        chunks.append(" ".join(words[start : start + chunk_size]))
+        if start + chunk_size >= len(words):
+            break
+    return chunks
+
+
+def _stem(word: str) -> str:
+    """A crude stemmer; enough to match "trains" and "train" or "museums" and "museum"."""
+    if word.endswith("ies") and len(word) > 4:
+        return word[:-3] + "y"
+    if word.endswith("s") and not word.endswith(("ss", "us", "is")) and len(word) > 3:
+        return word[:-1]
+    return word
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+
+class HashingEmbedder:
+    """Feature-hashing embedding of content words and word bigrams.
+
+    Deterministic and fully offline, but purely lexical: stopwords are dropped,
+    words are crudely stemmed and term counts are log-scaled, so the cosine
+    similarity of a short query and a chunk reflects the content words they
+    share. Similarities are far lower than a semantic model's, which is why the
+    local backend uses `HASHING_DISTANCE_THRESHOLD` for it. Plug in a real
+    embedding model through `RAG_LOCAL_EMBEDDING` for semantic retrieval.
+    """
+
+    # Distance (1 - cosine) under which a chunk shares enough content words
+    # with the query to be relevant; calibrated on short queries against
+    # chunks of a few hundred words.
+    distance_threshold = HASHING_DISTANCE_THRESHOLD
+
+    def __init__(self, dim: int = RAG_LOCAL_EMBEDDING_DIM):
+        self.dim = dim
+
+    @staticmethod
+    def features(text: str) -> list[str]:
+        words = [_stem(word) for word in _WORD.findall(text.lower()) if word not in _STOPWORDS]
+        return words + [f"{first} {second}" for first, second in zip(words, words[1:])]
+
+    def __call__(self, texts: list[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            features, counts = np.unique(self.features(text), return_counts=True)
+            if not len(features):
+                continue
+            hashes = np.array([zlib.crc32(feature.encode("utf-8")) for feature in features], dtype=np.uint32)
+            # Signed hashing keeps collisions from adding up to a spurious similarity.
+            signs = np.where(hashes & 0x80000000, -1.0, 1.0)
+            weights = signs * (1.0 + np.log(counts))
+            matrix[row] = np.bincount(hashes % self.dim, weights=weights, minlength=self.dim)
+        return normalize_rows(matrix)
+
+
+def load_embedding_function(spec: str = RAG_LOCAL_EMBEDDING) -> EmbeddingFunction:
+    """"hashing" or a "module:attribute" path to a callable mapping texts to a matrix."""
+    if spec == "hashing":
+        return HashingEmbedder()
+    module_name, _, attribute = spec.partition(":")
+    if not attribute:
+        raise ValueError(f"RAG_LOCAL_EMBEDDING must be 'hashing' or 'module:function', got '{spec}'")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+class VectorStore:
+    """Append-only matrix of unit vectors with their chunk texts, stored in one directory."""
+
+    def __init__(self, directory: str, dim: int):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        meta = self._read_json("store.json") or {}
+        self.dim = int(meta.get("dim", dim))
+        self.count = int(meta.get("count", 0))
+        self.text_bytes = int(meta.get("text_bytes", 0))
+        self.ivf_trained_count = int(meta.get("ivf_trained_count", 0))
+        if not os.path.exists(self._path("text_offsets.i64")):
+            np.zeros(1, dtype=np.int64).tofile(self._path("text_offsets.i64"))
+        # Memory maps of the first `count` rows, reopened after appends.
+        self._views: Optional[dict] = None
+        self._ivf: Optional[dict] = None
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _read_json(self, name: str) -> Optional[dict]:
+        try:
+            with open(self._path(name), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _save_meta(self) -> None:
+        with open(self._path("store.json.tmp"), "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "dim": self.dim,
+                    "count": self.count,
+                    "text_bytes": self.text_bytes,
+                    "ivf_trained_count": self.ivf_trained_count,
+                },
+                f,
+            )
+        os.replace(self._path("store.json.tmp"), self._path("store.json"))
+
+    def _append_bytes(self, name: str, data: bytes) -> None:
+        with open(self._path(name), "ab") as f:
+            f.write(data)
+
+    def append(self, vectors: np.ndarray, texts: list[str], owner: int) -> tuple[int, int]:
+        """Appends chunks owned by document `owner`; returns their row range."""
+        vectors = normalize_rows(vectors)
+        if vectors.shape != (len(texts), self.dim):
+            raise ValueError(f"Expected {len(texts)} vectors of dimension {self.dim}, got {vectors.shape}")
+        encoded = [text.encode("utf-8") for text in texts]
+        offsets = self.text_bytes + np.cumsum([len(data) for data in encoded], dtype=np.int64)
+        # Data files are written before the metadata, so readers never see partial rows.
+        self._append_bytes("vectors.f32", vectors.tobytes())
+        self._append_bytes("owners.i32", np.full(len(texts), owner, dtype=np.int32).tobytes())
+        self._append_bytes("texts.bin", b"".join(encoded))
+        self._append_bytes("text_offsets.i64", offsets.tobytes())
+        if self.ivf_trained_count:
+            self._append_bytes("ivf_lists.i32", self._assign(vectors).tobytes())
+        start = self.count
+        self.count += len(texts)
+        self.text_bytes = int(offsets[-1]) if len(offsets) else self.text_bytes
+        self._save_meta()
+        self._views = None
+        self._ivf = None
+        return start, self.count
+
+    def delete(self, start: int, end: int) -> None:
+        """Masks out the rows in [start, end)."""
+        if end <= start:
+            return
+        owners = np.memmap(self._path("owners.i32"), dtype=np.int32, mode="r+", shape=(self.count,))
+        owners[start:end] = -1
+        owners.flush()
+        del owners
+        self._views = None
+
+    def _open(self) -> Optional[dict]:
+        if self._views is None and self.count:
+            self._views = {
+                "count": self.count,
+                "vectors": np.memmap(self._path("vectors.f32"), dtype=np.float32, mode="r", shape=(self.count, self.dim)),
+                "owners": np.memmap(self._path("owners.i32"), dtype=np.int32, mode="r", shape=(self.count,)),
+                "offsets": np.memmap(self._path("text_offsets.i64"), dtype=np.int64, mode="r", shape=(self.count + 1,)),
+                "texts": np.memmap(self._path("texts.bin"), dtype=np.uint8, mode="r", shape=(self.text_bytes,)),
+            }
+        return self._views
+
+    def owner(self, row: int) -> int:
+        return int(self._open()["owners"][row])
+
+    def text(self, row: int) -> str:
+        views = self._open()
+        start, end = views["offsets"][row], views["offsets"][row + 1]
+        return views["texts"][start:end].tobytes().decode("utf-8")
+
+    # IVF index
+
+    def _assign(self, vectors: np.ndarray) -> np.ndarray:
+        centroids = np.load(self._path("ivf_centroids.npy"))
+        lists = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), SEARCH_BLOCK_ROWS):
+            block = np.asarray(vectors[start : start + SEARCH_BLOCK_ROWS])
+            lists[start : start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+        return lists
+
+    def build_ivf(self, nlist: Optional[int] = None, iterations: int = 10, seed: int = 0) -> int:
+        """Trains the cluster centroids with spherical k-means and assigns every row."""
+        views = self._open()
+        if views is None:
+            return 0
+        vectors = views["vectors"]
+        nlist = max(min(nlist or int(np.sqrt(self.count)), self.count), 1)
+        rng = np.random.default_rng(seed)
+        sample_size = min(self.count, nlist * IVF_TRAINING_ROWS_PER_LIST)
+        sample = np.asarray(vectors[np.sort(rng.choice(self.count, sample_size, replace=False))])
+        centroids = sample[rng.choice(sample_size, nlist, replace=False)].copy()
+        for _ in range(iterations):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            order = np.argsort(assignment, kind="stable")
+            counts = np.bincount(assignment, minlength=nlist)
+            starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+            nonempty = counts > 0
+            sums = np.add.reduceat(sample[order], starts[nonempty], axis=0)
+            # Empty clusters keep their previous centroid.
+            centroids[nonempty] = normalize_rows(sums)
+        np.save(self._path("ivf_centroids.npy"), centroids)
+        self._assign(vectors).tofile(self._path("ivf_lists.i32"))
+        self.ivf_trained_count = self.count
+        self._save_meta()
+        self._ivf = None
+        logger.info("Built an IVF index with %d lists over %d chunks in %s", nlist, self.count, self.directory)
+        return nlist
+
+    def maybe_build_ivf(self, min_chunks: int = RAG_LOCAL_IVF_MIN_CHUNKS) -> None:
+        """(Re)builds the IVF index once the store has grown enough for it to pay off."""
+        if self.count >= min_chunks and self.count >= 2 * self.ivf_trained_count:
+            self.build_ivf()
+
+    def _open_ivf(self) -> Optional[dict]:
+        if self._ivf is None and self.ivf_trained_count:
+            centroids = np.load(self._path("ivf_centroids.npy"))
+            lists = np.fromfile(self._path("ivf_lists.i32"), dtype=np.int32, count=self.count)
+            order = np.argsort(lists, kind="stable")
+            bounds = np.searchsorted(lists[order], np.arange(len(centroids) + 1))
+            self._ivf = {"centroids": centroids, "order": order, "bounds": bounds}
+        return self._ivf
+
+    # Search
+
+    def search(
+        self, query: np.ndarray, k: int, nprobe: Optional[int] = RAG_LOCAL_NPROBE, exact: bool = False
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Rows and cosine distances of the `k` closest live chunks, closest first.
+
+        Uses the IVF index when it exists unless `exact` is set.
+        """
+        views = self._open()
+        if views is None or k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        query = normalize_rows(query.reshape(-1))
+        vectors, owners = views["vectors"], views["owners"]
+        ivf = None if exact else self._open_ivf()
+        if ivf is not None:
+            centroid_scores = ivf["centroids"] @ query
+            nprobe = min(nprobe or RAG_LOCAL_NPROBE, len(centroid_scores))
+            probed = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+            bounds, order = ivf["bounds"], ivf["order"]
+            rows = np.sort(np.concatenate([order[bounds[lst] : bounds[lst + 1]] for lst in probed]))
+            similarities = vectors[rows] @ query
+        else:
+            rows = np.arange(views["count"])
+            similarities = np.empty(views["count"], dtype=np.float32)
+            for start in range(0, views["count"], SEARCH_BLOCK_ROWS):
+                similarities[start : start + SEARCH_BLOCK_ROWS] = vectors[start : start + SEARCH_BLOCK_ROWS] @ query
+        similarities[owners[rows] < 0] = -np.inf
+        k = min(k, len(rows))
+        if k == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        best = np.argpartition(-similarities, k - 1)[:k]
+        best = best[np.argsort(-similarities[best], kind="stable")]
+        best = best[np.isfinite(similarities[best])]
+        return rows[best], 1.0 - similarities[best]
+
+
+@dataclass
+class LocalCorpus:
+    name: str
+    display_name: str
+    create_time: str
+    update_time: str
+
+
+@dataclass
+class LocalRagFile:
+    name: str
+    display_name: str
+    source_uri: str
+    create_time: str
+    update_time: str
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class LocalRagBackend(RagBackend):
+    """RAG backend storing each corpus as a memory-mapped vector store on disk."""
+
+    name = "local"
+    supports_local_paths = True
+
+    def __init__(
+        self,
+        root: str = RAG_LOCAL_DIR,
+        embed: Optional[EmbeddingFunction] = None,
+        import_root: Optional[str] = RAG_LOCAL_IMPORT_DIR,
+        distance_threshold: Optional[float] = RAG_LOCAL_DISTANCE_THRESHOLD,
+    ):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        # Documents are only imported from inside this directory.
+        self.import_root = os.path.realpath(import_root) if import_root else None
+        self._embed = embed or load_embedding_function()
+        self._dim: Optional[int] = getattr(self._embed, "dim", None)
+        # The threshold of the embedding function unless one is configured.
+        if distance_threshold is None:
+            distance_threshold = getattr(self._embed, "distance_threshold", DEFAULT_DISTANCE_THRESHOLD)
+        self.distance_threshold = distance_threshold
+        # Serializes writes; searches read immutable memory maps.
+        self._lock = threading.RLock()
+        self._stores: dict[str, VectorStore] = {}
+
+    # Corpora
+
+    def _corpus_id(self, corpus_resource_name: str) -> str:
+        corpus_id = corpus_resource_name.rstrip("/").split("/")[-1]
+        if not _ID.match(corpus_id) or not os.path.exists(self._meta_path(corpus_id)):
+            raise ValueError(f"Corpus '{corpus_resource_name}' not found")
+        return corpus_id
+
+    def _meta_path(self, corpus_id: str) -> str:
+        return os.path.join(self.root, corpus_id, "corpus.json")
+
+    def _read_meta(self, corpus_id: str) -> dict:
+        with open(self._meta_path(corpus_id), encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_meta(self, corpus_id: str, meta: dict) -> None:
+        path = self._meta_path(corpus_id)
+        with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(f"{path}.tmp", path)
+
+    def _corpus(self, corpus_id: str, meta: dict) -> LocalCorpus:
+        return LocalCorpus(
+            name=f"{LOCAL_CORPORA_PREFIX}/{corpus_id}",
+            display_name=meta["display_name"],
+            create_time=meta["create_time"],
+            update_time=meta["update_time"],
+        )
+
+    def _store(self, corpus_id: str) -> VectorStore:
+        store = self._stores.get(corpus_id)
+        if store is None:
+            if self._dim is None:
+                self._dim = int(np.asarray(self._embed(["dimension probe"])).shape[1])
+            store = VectorStore(os.path.join(self.root, corpus_id, "vectors"), self._dim)
+            self._stores[corpus_id] = store
+        return store
+
+    def list_corpora(self) -> list:
+        corpora = []
+        for corpus_id in sorted(os.listdir(self.root)):
+            if _ID.match(corpus_id) and os.path.exists(self._meta_path(corpus_id)):
+                corpora.append(self._corpus(corpus_id, self._read_meta(corpus_id)))
+        return corpora
+
+    def create_corpus(self, display_name: str):
+        with self._lock:
+            corpus_id = uuid.uuid4().hex[:16]
+            os.makedirs(os.path.join(self.root, corpus_id))
+            now = _now()
+            meta = {"display_name": display_name, "create_time": now, "update_time": now, "files": {}, "next_file_id": 1}
+            self._write_meta(corpus_id, meta)
+            return self._corpus(corpus_id, meta)
+
+    def delete_corpus(self, corpus_resource_name: str) -> None:
+        with self._lock:
+            corpus_id = self._corpus_id(corpus_resource_name)
+            self._stores.pop(corpus_id, None)
+            shutil.rmtree(os.path.join(self.root, corpus_id))
+
+    # Files
+
+    @property
+    def supports_local_paths(self) -> bool:
+        return self.import_root is not None
+
+    def _inside_import_root(self, path: str) -> bool:
+        return os.path.commonpath([path, self.import_root]) == self.import_root
+
+    def resolve_local_path(self, path: str) -> Optional[str]:
+        if self.import_root is None:
+            return None
+        path = path[len("file://") :] if path.startswith("file://") else path
+        # Relative paths are relative to the import directory; symlinks and
+        # ".." are resolved before the containment check.
+        resolved = os.path.realpath(os.path.join(self.import_root, path))
+        if not self._inside_import_root(resolved) or not os.path.exists(resolved):
+            return None
+        return resolved
+
+    def _expand_paths(self, paths: list[str]) -> list[str]:
+        files = []
+        for path in paths:
+            resolved = self.resolve_local_path(path)
+            if resolved is None:
+                logger.warning(f"Skipping '{path}': not a file or directory under the local import directory")
+            elif os.path.isdir(resolved):
+                for directory, _, names in sorted(os.walk(resolved)):
+                    for name in sorted(names):
+                        # A symlink inside the directory may point outside it.
+                        file_path = os.path.realpath(os.path.join(directory, name))
+                        if name.lower().endswith(TEXT_SUFFIXES) and self._inside_import_root(file_path):
+                            files.append(file_path)
+            else:
+                files.append(resolved)
+        return files
+
+    def import_files(
+        self,
+        corpus_resource_name: str,
+        paths: list[str],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        chunk_overlap: int = DEFAULT_CHUNK_OVERLAP,
+    ) -> int:
+        corpus_id = self._corpus_id(corpus_resource_name)
+        imported = 0
+        for path in self._expand_paths(paths):
+            with open(path, encoding="utf-8", errors="replace") as f:
+                chunks = chunk_text(f.read(), chunk_size, chunk_overlap)
+            if not chunks:
+                continue
+            # Embedding is the slow part and runs outside the write lock.
+            vectors = np.concatenate(
+                [
+                    np.asarray(self._embed(chunks[start : start + EMBEDDING_BATCH_SIZE]), dtype=np.float32)
+                    for start in range(0, len(chunks), EMBEDDING_BATCH_SIZE)
+                ]
+            )
+            with self._lock:
+                meta = self._read_meta(corpus_id)
+                file_id = meta["next_file_id"]
+                start, end = self._store(corpus_id).append(vectors, chunks, file_id)
+                now = _now()
+                meta["files"][str(file_id)] = {
+                    "display_name": os.path.basename(path),
+                    "source_uri": f"file://{os.path.abspath(path)}",
+                    "create_time": now,
+                    "update_time": now,
+                    "rows": [start, end],
+                }
+                meta["next_file_id"] = file_id + 1
+                meta["update_time"] = now
+                self._write_meta(corpus_id, meta)
+            imported += 1
+        if imported:
+            with self._lock:
+                self._store(corpus_id).maybe_build_ivf()
+        return imported
+
+    def list_files(self, corpus_resource_name: str) -> list:
+        corpus_id = self._corpus_id(corpus_resource_name)
+        corpus_name = f"{LOCAL_CORPORA_PREFIX}/{corpus_id}"
+        return [
+            LocalRagFile(
+                name=f"{corpus_name}/ragFiles/{file_id}",
+                display_name=info["display_name"],
+                source_uri=info["source_uri"],
+                create_time=info["create_time"],
+                update_time=info["update_time"],
+            )
+            for file_id, info in self._read_meta(corpus_id)["files"].items()
+        ]
+
+    def delete_file(self, file_resource_name: str) -> None:
+        corpus_name, _, file_id = file_resource_name.partition("/ragFiles/")
+        with self._lock:
+            corpus_id = self._corpus_id(corpus_name)
+            meta = self._read_meta(corpus_id)
+            info = meta["files"].pop(file_id, None)
+            if info is None:
+                raise ValueError(f"Document '{file_id}' not found in corpus '{corpus_name}'")
+            self._store(corpus_id).delete(*info["rows"])
+            meta["update_time"] = _now()
+            self._write_meta(corpus_id, meta)
+
+    # Retrieval
+
+    def retrieve(
+        self,
+        corpus_resource_name: str,
+        query: str,
+        top_k: int = DEFAULT_TOP_K,
+        distance_threshold: Optional[float] = None,
+    ) -> list[dict]:
+        if distance_threshold is None:
+            distance_threshold = self.distance_threshold
+        corpus_id = self._corpus_id(corpus_resource_name)
+        with self._lock:
+            store = self._store(corpus_id)
+            files = self._read_meta(corpus_id)["files"]
+        query_vector = np.asarray(self._embed([query]), dtype=np.float32)[0]
+        rows, distances = store.search(query_vector, top_k)
+        results = []
+        for row, distance in zip(rows, distances):
+            if distance > distance_threshold:
+                break
+            info = files.get(str(store.owner(int(row))), {})
+            results.append(
+                {
+                    "source_uri": info.get("source_uri", ""),
+                    "source_name": info.get("display_name", ""),
+                    "text": store.text(int(row)),
+                    "score": round(float(distance), 6),
+                }
+            )
+        return results
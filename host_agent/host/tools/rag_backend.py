@@ -0,0 +1,208 @@
+"""
+Storage backends behind the RAG tools.
+
+The tools talk to a `RagBackend` instead of calling `vertexai.rag` directly.
+`RAG_BACKEND=vertex` (the default) keeps using Vertex AI RAG; `RAG_BACKEND=local`
+uses the on-disk vector store in `local_vector_store.py`, which needs no
+network access or cloud project and is meant for offline use, tests and
+low-latency deployments.
+"""
+
+import logging
+from typing import Optional
+
+from ..config import (
+    DEFAULT_CHUNK_OVERLAP,
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_DISTANCE_THRESHOLD,
+    DEFAULT_EMBEDDING_MODEL,
+    DEFAULT_EMBEDDING_REQUESTS_PER_MIN,
+    DEFAULT_TOP_K,
+    RAG_BACKEND,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class RagBackend:
+    """Corpus, file and retrieval operations used by the RAG tools.
+
+    Corpus and file objects expose the attributes the tools read from their
+    Vertex AI counterparts: `name`, `display_name`, `create_time` and
+    `update_time`, plus `source_uri` for files.
+    """
+
+    name = "base"
+    # Whether add_data may import files from the local filesystem.
+    supports_local_paths = False
+
+    def list_corpora(self) -> list:
+        raise NotImplementedError
+
+    def create_corpus(self, display_name: str):
+        raise NotImplementedError
+
+    def delete_corpus(self, corpus_resource_name: str) -> None:
+        raise NotImplementedError
+
+    def import_files(
+        self,
+        corpus_resource_name: str,
+        paths: list[str],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        chunk_overlap: int = DEFAULT_CHUNK_OVERLAP,
+    ) -> int:
+        """Imports the documents at `paths` and returns the number of files imported."""
+        raise NotImplementedError
+
+    def resolve_local_path(self, path: str) -> Optional[str]:
+        """The absolute path of a local file or directory this backend may import, or None."""
+        return None
+
+    def list_files(self, corpus_resource_name: str) -> list:
+        raise NotImplementedError
+
+    def delete_file(self, file_resource_name: str) -> None:
+        raise NotImplementedError
+
+    def retrieve(
+        self,
+        corpus_resource_name: str,
+        query: str,
+        top_k: int = DEFAULT_TOP_K,
+        distance_threshold: Optional[float] = None,
+    ) -> list[dict]:
+        """The closest contexts with their source_uri, source_name, text and score (distance).
+
+        Without a `distance_threshold`, the backend's own default applies.
+        """
+        raise NotImplementedError
+
+
+class VertexRagBackend(RagBackend):
+    """Vertex AI RAG Engine."""
+
+    name = "vertex"
+
+    def __init__(self):
+        from vertexai import rag
+
+        self._rag = rag
+
+    def list_corpora(self) -> list:
+        return list(self._rag.list_corpora())
+
+    def create_corpus(self, display_name: str):
+        rag = self._rag
+        # Configure embedding model optimized for candidate profile matching
+        embedding_model_config = rag.RagEmbeddingModelConfig(
+            vertex_prediction_endpoint=rag.VertexPredictionEndpoint(
+                publisher_model=DEFAULT_EMBEDDING_MODEL
+            )
+        )
+        return rag.create_corpus(
+            display_name=display_name,
+            backend_config=rag.RagVectorDbConfig(
+                rag_embedding_model_config=embedding_model_config
+            ),
+        )
+
+    def delete_corpus(self, corpus_resource_name: str) -> None:
+        self._rag.delete_corpus(corpus_resource_name)
+
+    def import_files(
+        self,
+        corpus_resource_name: str,
+        paths: list[str],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        chunk_overlap: int = DEFAULT_CHUNK_OVERLAP,
+    ) -> int:
+        rag = self._rag
+        transformation_config = rag.TransformationConfig(
+            chunking_config=rag.ChunkingConfig(
+                chunk_size=chunk_size,
+                chunk_overlap=chunk_overlap,
+            ),
+        )
+        import_result = rag.import_files(
+            corpus_resource_name,
+            paths,
+            transformation_config=transformation_config,
+            max_embedding_requests_per_min=DEFAULT_EMBEDDING_REQUESTS_PER_MIN,
+        )
+        return import_result.imported_rag_files_count
+
+    def list_files(self, corpus_resource_name: str) -> list:
+        return list(self._rag.list_files(corpus_resource_name))
+
+    def delete_file(self, file_resource_name: str) -> None:
+        self._rag.delete_file(file_resource_name)
+
+    def retrieve(
+        self,
+        corpus_resource_name: str,
+        query: str,
+        top_k: int = DEFAULT_TOP_K,
+        distance_threshold: Optional[float] = None,
+    ) -> list[dict]:
+        rag = self._rag
+        if distance_threshold is None:
+            distance_threshold = DEFAULT_DISTANCE_THRESHOLD
+        # Configure retrieval parameters
+        rag_retrieval_config = rag.RagRetrievalConfig(
+            top_k=top_k,
+            filter=rag.Filter(vector_distance_threshold=distance_threshold),
+        )
+
+        # Perform the query
+        logger.debug("Performing retrieval query...")
+        response = rag.retrieval_query(
+            rag_resources=[
+                rag.RagResource(
+                    rag_corpus=corpus_resource_name,
+                )
+            ],
+            text=query,
+            rag_retrieval_config=rag_retrieval_config,
+        )
+
+        # Process the response into a more usable format
+        results = []
+        if hasattr(response, "contexts") and response.contexts:
+            for ctx_group in response.contexts.contexts:
+                result = {
+                    "source_uri": (
+                        ctx_group.source_uri if hasattr(ctx_group, "source_uri") else ""
+                    ),
+                    "source_name": (
+                        ctx_group.source_display_name
+                        if hasattr(ctx_group, "source_display_name")
+                        else ""
+                    ),
+                    "text": ctx_group.text if hasattr(ctx_group, "text") else "",
+                    "score": ctx_group.score if hasattr(ctx_group, "score") else 0.0,
+                }
+                results.append(result)
+        return results
+
+
+_default_backend: Optional[RagBackend] = None
+
+
+def create_rag_backend(name: str = RAG_BACKEND) -> RagBackend:
+    if name == "local":
+        from .local_vector_store import LocalRagBackend
+
+        return LocalRagBackend()
+    if name != "vertex":
+        raise ValueError(f"Unknown RAG backend '{name}'; use 'vertex' or 'local'")
+    return VertexRagBackend()
+
+
+def get_rag_backend() -> RagBackend:
+    """Returns the process-wide RAG backend selected by `RAG_BACKEND`."""
+    global _default_backend
+    if _default_backend is None:
+        _default_backend = create_rag_backend()
+        logger.info("Using the %s RAG backend", _default_backend.name)
+    return _default_backend
@@ -0,0 +1,124 @@
+"""
+Tool for querying a Vertex AI RAG corpus with many questions at once.
+"""
+
+import asyncio
+import logging
+from typing import List
+
+from google.adk.tools.tool_context import ToolContext
+
+from ..config import RAG_BATCH_CONCURRENCY, RAG_BATCH_MAX_QUERIES
+from .async_tools import resolve_corpus, run_tool
+from .rag_query import retrieve_contexts
+from .retrieval_cache import normalize_query
+
+logger = logging.getLogger(__name__)
+
+
+def merge_contexts(per_query: list[dict]) -> list[dict]:
+    """Merges the contexts of several queries, keeping each one once.
+
+    A context retrieved by several queries lists all of them and is ranked
+    before contexts that matched fewer queries.
+    """
+    merged: dict[tuple[str, str], dict] = {}
+    for entry in per_query:
+        for result in entry.get("results", []):
+            key = (result["source_uri"], result["text"])
+            context = merged.get(key)
+            if context is None:
+                merged[key] = context = {**result, "queries": []}
+            if entry["query"] not in context["queries"]:
+                context["queries"].append(entry["query"])
+    # Stable sort: ties keep retrieval order.
+    return sorted(merged.values(), key=lambda context: -len(context["queries"]))
+
+
+async def rag_batch_query(
+    corpus_name: str,
+    queries: List[str],
+    tool_context: ToolContext,
+) -> dict:
+    """
+    Query a Vertex AI RAG corpus with several questions at once, such as one query per
+    job description, and return the results of each plus the merged set of contexts.
+
+    Use this instead of calling rag_query repeatedly.
+
+    Args:
+        corpus_name (str): The name of the corpus to query. If empty, the current corpus will be used.
+                          Preferably use the resource_name from list_corpora results.
+        queries (List[str]): The text queries to search for in the corpus
+        tool_context (ToolContext): The tool context
+
+    Returns:
+        dict: The results of each query and the merged, deduplicated contexts
+    """
+    # Identical queries (ignoring case and spacing) are retrieved once
+    unique_queries: dict[str, str] = {}
+    for query in queries or []:
+        if isinstance(query, str) and query.strip():
+            unique_queries.setdefault(normalize_query(query), query.strip())
+    if not unique_queries:
+        return {
+            "status": "error",
+            "message": "Please provide at least one non-empty query",
+            "corpus_name": corpus_name,
+            "queries": queries,
+        }
+    if len(unique_queries) > RAG_BATCH_MAX_QUERIES:
+        return {
+            "status": "error",
+            "message": f"Too many queries: at most {RAG_BATCH_MAX_QUERIES} can be run in one batch",
+            "corpus_name": corpus_name,
+            "queries": queries,
+        }
+
+    # The corpus is resolved once for the whole batch
+    corpus_resource_name = await resolve_corpus(corpus_name, tool_context)
+    if isinstance(corpus_resource_name, dict):
+        return {**corpus_resource_name, "queries": queries}
+
+    semaphore = asyncio.Semaphore(RAG_BATCH_CONCURRENCY)
+
+    async def query_one(query: str) -> dict:
+        async with semaphore:
+            results = await run_tool(retrieve_contexts, corpus_resource_name, query)
+        if isinstance(results, dict):
+            return {
+                "query": query,
+                "status": "error",
+                "message": results["message"],
+                "results": [],
+                "results_count": 0,
+            }
+        return {
+            "query": query,
+            "status": "success" if results else "warning",
+            "results": results,
+            "results_count": len(results),
+        }
+
+    per_query = list(await asyncio.gather(*(query_one(query) for query in unique_queries.values())))
+    contexts = merge_contexts(per_query)
+    failed = sum(entry["status"] == "error" for entry in per_query)
+    if failed == len(per_query):
+        status = "error"
+    elif failed or not contexts:
+        status = "warning"
+    else:
+        status = "success"
+    return {
+        "status": status,
+        "message": (
+            f"Ran {len(per_query)} unique queries against corpus '{corpus_name}' "
+            f"({failed} failed), found {len(contexts)} distinct contexts"
+        ),
+        "corpus_name": corpus_name,
+        "queries_count": len(per_query),
+        "duplicates_skipped": sum(isinstance(q, str) and bool(q.strip()) for q in queries) - len(per_query),
+        "per_query": per_query,
+        "contexts": contexts,
+        "contexts_count": len(contexts),
+    }
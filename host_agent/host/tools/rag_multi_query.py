@@ -0,0 +1,165 @@
+"""
+Tool for querying several Vertex AI RAG corpora at once and fusing the results.
+
+The query runs against every corpus concurrently. Each corpus returns its
+`DEFAULT_TOP_K` closest contexts within `DEFAULT_DISTANCE_THRESHOLD`, and
+the per-corpus rankings are fused into one list. The fused list is cut to
+`DEFAULT_TOP_K`, so the global top-k and distance threshold mean the same as
+for a single corpus.
+"""
+
+import asyncio
+from typing import List, Optional
+
+from google.adk.tools.tool_context import ToolContext
+
+from ..config import DEFAULT_TOP_K, RAG_BATCH_CONCURRENCY, RRF_K
+from .async_tools import resolve_corpus, run_tool
+from .rag_query import retrieve_contexts
+
+FUSION_METHODS = ("rrf", "score")
+
+
+def reciprocal_rank_fusion(rankings: dict[str, list[dict]], k: int = RRF_K) -> dict[tuple, float]:
+    """Fused score of each context: the sum of 1 / (k + rank) over the rankings."""
+    fused: dict[tuple, float] = {}
+    for results in rankings.values():
+        for rank, result in enumerate(results, start=1):
+            key = (result["source_uri"], result["text"])
+            fused[key] = fused.get(key, 0.0) + 1.0 / (k + rank)
+    return fused
+
+
+def normalized_score_fusion(rankings: dict[str, list[dict]]) -> dict[tuple, float]:
+    """Fused score of each context: the sum of its min-max normalized similarities.
+
+    Scores are vector distances, so the closest context of each corpus gets 1
+    and the farthest 0 (or 1 when a corpus returned a single distance).
+    """
+    fused: dict[tuple, float] = {}
+    for results in rankings.values():
+        if not results:
+            continue
+        distances = [float(result["score"]) for result in results]
+        low, high = min(distances), max(distances)
+        for result, distance in zip(results, distances):
+            key = (result["source_uri"], result["text"])
+            similarity = 1.0 - (distance - low) / (high - low) if high > low else 1.0
+            fused[key] = fused.get(key, 0.0) + similarity
+    return fused
+
+
+def fuse_results(
+    rankings: dict[str, list[dict]], method: str = "rrf", top_k: int = DEFAULT_TOP_K
+) -> list[dict]:
+    """The `top_k` best contexts across the per-corpus rankings with their provenance."""
+    if method == "score":
+        fused = normalized_score_fusion(rankings)
+    else:
+        fused = reciprocal_rank_fusion(rankings)
+    contexts: dict[tuple, dict] = {}
+    for corpus_name, results in rankings.items():
+        for rank, result in enumerate(results, start=1):
+            key = (result["source_uri"], result["text"])
+            context = contexts.get(key)
+            if context is None:
+                contexts[key] = context = {**result, "fused_score": round(fused[key], 6), "provenance": []}
+            # The closest distance across corpora is kept as the context's score.
+            context["score"] = min(context["score"], result["score"])
+            context["provenance"].append(
+                {"corpus_name": corpus_name, "rank": rank, "score": result["score"]}
+            )
+    ranked = sorted(contexts.values(), key=lambda context: (-context["fused_score"], context["score"]))
+    return ranked[:top_k]
+
+
+async def rag_multi_query(
+    corpus_names: List[str],
+    query: str,
+    tool_context: ToolContext,
+    fusion: Optional[str] = None,
+) -> dict:
+    """
+    Query several Vertex AI RAG corpora at once, such as regional guides and policy
+    documents, and return one ranked list of the most relevant information.
+
+    Use this instead of calling rag_query once per corpus.
+
+    Args:
+        corpus_names (List[str]): The names of the corpora to query.
+                          Preferably use the resource_name values from list_corpora results.
+        query (str): The text query to search for in the corpora
+        tool_context (ToolContext): The tool context
+        fusion (str): How rankings are combined: "rrf" (reciprocal rank fusion, the
+                      default) or "score" (normalized distance scores)
+
+    Returns:
+        dict: The fused results, each with the corpora and ranks it was retrieved at
+    """
+    fusion = (fusion or "rrf").lower()
+    if fusion not in FUSION_METHODS:
+        return {
+            "status": "error",
+            "message": f"Unknown fusion method '{fusion}'. Use one of: {', '.join(FUSION_METHODS)}",
+            "query": query,
+            "corpus_names": corpus_names,
+        }
+    # Keep the first mention of each corpus
+    corpus_names = list(dict.fromkeys(name for name in corpus_names or [] if name))
+    if not corpus_names:
+        return {
+            "status": "error",
+            "message": "Please provide at least one corpus name",
+            "query": query,
+            "corpus_names": corpus_names,
+        }
+
+    semaphore = asyncio.Semaphore(RAG_BATCH_CONCURRENCY)
+
+    async def query_corpus(corpus_name: str) -> list[dict] | dict:
+        async with semaphore:
+            corpus_resource_name = await resolve_corpus(corpus_name, tool_context)
+            if isinstance(corpus_resource_name, dict):
+                return corpus_resource_name
+            return await run_tool(retrieve_contexts, corpus_resource_name, query)
+
+    outcomes = await asyncio.gather(*(query_corpus(name) for name in corpus_names))
+    rankings = {name: outcome for name, outcome in zip(corpus_names, outcomes) if isinstance(outcome, list)}
+    errors = {
+        name: outcome["message"]
+        for name, outcome in zip(corpus_names, outcomes)
+        if isinstance(outcome, dict)
+    }
+    if not rankings:
+        return {
+            "status": "error",
+            "message": f"Could not query any of the corpora: {'; '.join(errors.values())}",
+            "query": query,
+            "corpus_names": corpus_names,
+            "errors": errors,
+        }
+
+    results = fuse_results(rankings, fusion)
+    if not results:
+        return {
+            "status": "warning",
+            "message": f"No results found in {len(rankings)} corpora for query: '{query}'",
+            "query": query,
+            "corpus_names": corpus_names,
+            "results": [],
+            "results_count": 0,
+            "errors": errors,
+        }
+    return {
+        "status": "warning" if errors else "success",
+        "message": (
+            f"Successfully queried {len(rankings)} of {len(corpus_names)} corpora"
+            + (f" ({len(errors)} failed)" if errors else "")
+        ),
+        "query": query,
+        "corpus_names": corpus_names,
+        "fusion": fusion,
+        "results": results,
+        "results_count": len(results),
+        "errors": errors,
+    }
@@ -1,19 +1,44 @@
 """
-Tool for querying Vertex AI RAG corpora and retrieving relevant information.
+Tool for querying RAG corpora and retrieving relevant information.
 """
 
 import logging
+from typing import Optional
 
 from google.adk.tools.tool_context import ToolContext
-from vertexai import rag
 
-from ..config import (
-    DEFAULT_DISTANCE_THRESHOLD,
-    DEFAULT_TOP_K,
-)
+from ..config import DEFAULT_TOP_K
+from .rag_backend import get_rag_backend
+from .retrieval_cache import get_retrieval_cache
 from .utils import check_corpus_exists, get_corpus_resource_name
 
 
+def retrieve_contexts(
+    corpus_resource_name: str,
+    query: str,
+    top_k: int = DEFAULT_TOP_K,
+    distance_threshold: Optional[float] = None,
+) -> list[dict]:
+    """
+    Run one retrieval query against a corpus and return the matching contexts.
+
+    Args:
+        corpus_resource_name (str): The full resource name of the corpus
+        query (str): The text query to search for in the corpus
+        top_k (int): The maximum number of contexts to return
+        distance_threshold (float): Contexts farther from the query than this are dropped;
+            defaults to the backend's threshold
+
+    Returns:
+        list[dict]: The retrieved contexts with their source, text and score (the
+            vector distance, lower is closer), closest first. Repeated queries are
+            answered from the retrieval cache until the corpus changes.
+    """
+    return get_retrieval_cache().get_or_retrieve(
+        corpus_resource_name, query, top_k, distance_threshold, get_rag_backend().retrieve
+    )
+
+
 def rag_query(
     corpus_name: str,
     query: str,
@@ -45,41 +70,7 @@ def rag_query(
         # Get the corpus resource name
         corpus_resource_name = get_corpus_resource_name(corpus_name)
 
-        # Configure retrieval parameters
-        rag_retrieval_config = rag.RagRetrievalConfig(
-            top_k=DEFAULT_TOP_K,
-            filter=rag.Filter(vector_distance_threshold=DEFAULT_DISTANCE_THRESHOLD),
-        )
-
-        # Perform the query
-        print("Performing retrieval query...")
-        response = rag.retrieval_query(
-            rag_resources=[
-                rag.RagResource(
-                    rag_corpus=corpus_resource_name,
-                )
-            ],
-            text=query,
-            rag_retrieval_config=rag_retrieval_config,
-        )
-
-        # Process the response into a more usable format
-        results = []
-        if hasattr(response, "contexts") and response.contexts:
-            for ctx_group in response.contexts.contexts:
-                result = {
-                    "source_uri": (
-                        ctx_group.source_uri if hasattr(ctx_group, "source_uri") else ""
-                    ),
-                    "source_name": (
-                        ctx_group.source_display_name
-                        if hasattr(ctx_group, "source_display_name")
-                        else ""
-                    ),
-                    "text": ctx_group.text if hasattr(ctx_group, "text") else "",
-                    "score": ctx_group.score if hasattr(ctx_group, "score") else 0.0,
-                }
-                results.append(result)
+        results = retrieve_contexts(corpus_resource_name, query)
 
         # If we didn't find any results
         if not results:
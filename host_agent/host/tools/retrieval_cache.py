@@ -0,0 +1,158 @@
+"""
+Process-wide cache of RAG retrieval results.
+
+A repeated question re-ran the full embedding and vector search on every
+call. The cache keeps the contexts of the last `RAG_CACHE_MAX_ENTRIES`
+retrievals, keyed by corpus, normalized query, top_k and distance threshold,
+for `RAG_CACHE_TTL` seconds, evicting the least recently used entry first.
+
+Every corpus has a version counter that the tools which import into, delete
+from or delete a corpus bump, which also drops the corpus's entries. A
+retrieval that was running while its corpus changed is returned to its caller
+but not cached, so stale contexts are never served.
+
+Hits, misses and the retrieval time saved by hits are exported as metrics.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from ..config import RAG_CACHE_MAX_ENTRIES, RAG_CACHE_TTL
+from ..metrics import RAG_CACHE_LOOKUPS, RAG_CACHE_SAVED_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_query(query: str) -> str:
+    """The query with case and whitespace differences removed."""
+    return " ".join(query.split()).lower()
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    results: tuple
+    stored_at: float
+    # How long the retrieval took; a hit saves about this much.
+    latency: float
+
+
+class RetrievalCache:
+    """LRU + TTL cache of retrieval results with per-corpus versions."""
+
+    def __init__(self, max_entries: int = RAG_CACHE_MAX_ENTRIES, ttl: float = RAG_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[tuple, CacheEntry] = OrderedDict()
+        self._versions: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl > 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def version(self, corpus_resource_name: str) -> int:
+        return self._versions.get(corpus_resource_name, 0)
+
+    def _lookup(self, key: tuple) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry.stored_at >= self.ttl:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self.saved_seconds += entry.latency
+            return entry
+
+    def _store(self, key: tuple, version: int, entry: CacheEntry) -> None:
+        with self._lock:
+            # The corpus changed while the retrieval ran.
+            if self.version(key[0]) != version:
+                return
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_retrieve(
+        self,
+        corpus_resource_name: str,
+        query: str,
+        top_k: int,
+        distance_threshold: float,
+        retrieve: Callable[[str, str, int, float], list[dict]],
+    ) -> list[dict]:
+        """The cached contexts for this retrieval, or the result of `retrieve(...)`."""
+        if not self.enabled:
+            return retrieve(corpus_resource_name, query, top_k, distance_threshold)
+
+        key = (corpus_resource_name, normalize_query(query), top_k, distance_threshold)
+        entry = self._lookup(key)
+        if entry is not None:
+            RAG_CACHE_LOOKUPS.inc(result="hit")
+            RAG_CACHE_SAVED_SECONDS.inc(entry.latency)
+            logger.debug("Retrieval cache hit for %r in %s", query, corpus_resource_name)
+            # Callers may modify the contexts they get.
+            return [dict(result) for result in entry.results]
+
+        RAG_CACHE_LOOKUPS.inc(result="miss")
+        version = self.version(corpus_resource_name)
+        started_at = time.monotonic()
+        results = retrieve(corpus_resource_name, query, top_k, distance_threshold)
+        finished_at = time.monotonic()
+        self._store(
+            key,
+            version,
+            CacheEntry(
+                results=tuple(dict(result) for result in results),
+                stored_at=finished_at,
+                latency=finished_at - started_at,
+            ),
+        )
+        return results
+
+    def invalidate_corpus(self, corpus_resource_name: str) -> None:
+        """Bumps the corpus version and drops its entries after it changed."""
+        with self._lock:
+            self._versions[corpus_resource_name] = self.version(corpus_resource_name) + 1
+            for key in [key for key in self._entries if key[0] == corpus_resource_name]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hit_ratio, 4),
+            "saved_seconds": round(self.saved_seconds, 3),
+        }
+
+
+_default_cache: Optional[RetrievalCache] = None
+
+
+def get_retrieval_cache() -> RetrievalCache:
+    """Returns the process-wide retrieval cache."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = RetrievalCache()
+    return _default_cache
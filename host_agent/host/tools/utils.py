@@ -6,12 +6,11 @@ import logging
 import re
 
 from google.adk.tools.tool_context import ToolContext
-from vertexai import rag
-
 from ..config import (
     LOCATION,
     PROJECT_ID,
 )
+from .corpus_catalog import get_corpus_catalog
 
 logger = logging.getLogger(__name__)
 
@@ -35,11 +34,9 @@ def get_corpus_resource_name(corpus_name: str) -> str:
 
     # Check if this is a display name of an existing corpus
     try:
-        # List all corpora and check if there's a match with the display name
-        corpora = rag.list_corpora()
-        for corpus in corpora:
-            if hasattr(corpus, "display_name") and corpus.display_name == corpus_name:
-                return corpus.name
+        corpus = get_corpus_catalog().get(corpus_name)
+        if corpus is not None:
+            return corpus.name
     except Exception as e:
         logger.warning(f"Error when checking for corpus display name: {str(e)}")
         # If we can't check, continue with the default behavior
@@ -78,19 +75,15 @@ def check_corpus_exists(corpus_name: str, tool_context: ToolContext) -> bool:
         # Get full resource name
         corpus_resource_name = get_corpus_resource_name(corpus_name)
 
-        # List all corpora and check if this one exists
-        corpora = rag.list_corpora()
-        for corpus in corpora:
-            if (
-                corpus.name == corpus_resource_name
-                or corpus.display_name == corpus_name
-            ):
-                # Update state
-                tool_context.state[f"corpus_exists_{corpus_name}"] = True
-                # Also set this as the current corpus if no current corpus is set
-                if not tool_context.state.get("current_corpus"):
-                    tool_context.state["current_corpus"] = corpus_name
-                return True
+        # Look the corpus up in the cached catalog
+        catalog = get_corpus_catalog()
+        if catalog.get(corpus_resource_name) or catalog.get(corpus_name):
+            # Update state
+            tool_context.state[f"corpus_exists_{corpus_name}"] = True
+            # Also set this as the current corpus if no current corpus is set
+            if not tool_context.state.get("current_corpus"):
+                tool_context.state["current_corpus"] = corpus_name
+            return True
 
         return False
     except Exception as e:
@@ -0,0 +1,124 @@
+"""Per-task token and cost accounting.
+
+Executors accumulate the `usage_metadata` reported on ADK events into a
+`TokenUsage` for the task being executed. The totals (including tokens spent
+by remote agents the task was delegated to) are attached to the completed
+task's metadata under the `usage` key and exported as metrics.
+"""
+
+import os
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+from a2a.server.tasks import TaskUpdater
+from a2a.types import TaskState, TaskStatus, TaskStatusUpdateEvent
+
+from .metrics import TASK_COST, TASK_TOKENS
+
+# USD per one million tokens, defaults match gemini-2.0-flash list prices.
+PROMPT_TOKEN_PRICE = float(os.getenv("PROMPT_TOKEN_PRICE_PER_MILLION", "0.10"))
+CANDIDATES_TOKEN_PRICE = float(os.getenv("CANDIDATES_TOKEN_PRICE_PER_MILLION", "0.40"))
+CACHED_TOKEN_PRICE = float(os.getenv("CACHED_TOKEN_PRICE_PER_MILLION", "0.025"))
+
+
+@dataclass
+class TokenUsage:
+    """Token counts for a single task."""
+
+    prompt_tokens: int = 0
+    candidates_tokens: int = 0
+    cached_tokens: int = 0
+    delegated: dict[str, "TokenUsage"] = field(default_factory=dict)
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.candidates_tokens
+
+    @property
+    def estimated_cost_usd(self) -> float:
+        # Cached tokens are part of the prompt count but billed at a discount.
+        uncached_prompt = max(self.prompt_tokens - self.cached_tokens, 0)
+        return (
+            uncached_prompt * PROMPT_TOKEN_PRICE
+            + self.cached_tokens * CACHED_TOKEN_PRICE
+            + self.candidates_tokens * CANDIDATES_TOKEN_PRICE
+        ) / 1_000_000
+
+    def add_usage_metadata(self, usage_metadata) -> None:
+        """Add the counts of a `GenerateContentResponseUsageMetadata`."""
+        if usage_metadata is None:
+            return
+        self.prompt_tokens += usage_metadata.prompt_token_count or 0
+        self.candidates_tokens += usage_metadata.candidates_token_count or 0
+        self.cached_tokens += usage_metadata.cached_content_token_count or 0
+
+    def add_delegated(self, agent_name: str, usage: "TokenUsage") -> None:
+        """Add the usage reported by a remote agent for a delegated task."""
+        self.prompt_tokens += usage.prompt_tokens
+        self.candidates_tokens += usage.candidates_tokens
+        self.cached_tokens += usage.cached_tokens
+        previous = self.delegated.setdefault(agent_name, TokenUsage())
+        previous.prompt_tokens += usage.prompt_tokens
+        previous.candidates_tokens += usage.candidates_tokens
+        previous.cached_tokens += usage.cached_tokens
+
+    def as_dict(self) -> dict:
+        data = {
+            "prompt_tokens": self.prompt_tokens,
+            "candidates_tokens": self.candidates_tokens,
+            "cached_tokens": self.cached_tokens,
+            "total_tokens": self.total_tokens,
+            "estimated_cost_usd": round(self.estimated_cost_usd, 8),
+        }
+        if self.delegated:
+            data["delegated"] = {
+                name: usage.as_dict() for name, usage in self.delegated.items()
+            }
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict | None) -> "TokenUsage":
+        data = data or {}
+        return cls(
+            prompt_tokens=int(data.get("prompt_tokens", 0)),
+            candidates_tokens=int(data.get("candidates_tokens", 0)),
+            cached_tokens=int(data.get("cached_tokens", 0)),
+        )
+
+
+# Usage of the task currently executing; lets tools attribute delegated usage.
+current_task_usage: ContextVar[TokenUsage | None] = ContextVar(
+    "current_task_usage", default=None
+)
+
+
+def add_delegated_usage(agent_name: str, metadata: dict | None) -> None:
+    """Adds the usage a remote agent reported in its task metadata."""
+    task_usage = current_task_usage.get()
+    if task_usage is not None and metadata and "usage" in metadata:
+        task_usage.add_delegated(agent_name, TokenUsage.from_dict(metadata["usage"]))
+
+
+def record_task_usage(usage: TokenUsage) -> None:
+    """Export the totals of a finished task as metrics."""
+    TASK_TOKENS.observe(usage.prompt_tokens, kind="prompt")
+    TASK_TOKENS.observe(usage.candidates_tokens, kind="candidates")
+    TASK_TOKENS.observe(usage.cached_tokens, kind="cached")
+    TASK_COST.inc(usage.estimated_cost_usd)
+
+
+async def complete_task(task_updater: TaskUpdater, usage: TokenUsage) -> None:
+    """Mark the task completed, attaching the token usage to its metadata."""
+    await task_updater.event_queue.enqueue_event(
+        TaskStatusUpdateEvent(
+            taskId=task_updater.task_id,
+            contextId=task_updater.context_id,
+            final=True,
+            status=TaskStatus(
+                state=TaskState.completed,
+                timestamp=datetime.now(timezone.utc).isoformat(),
+            ),
+            metadata={"usage": usage.as_dict()},
+        )
+    )
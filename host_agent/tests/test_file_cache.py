@@ -0,0 +1,145 @@
+import asyncio
+import os
+
+import httpx
+import pytest
+
+from host.file_cache import FetchNotAllowed, FileUriCache, host_allowed, is_public_address
+
+PUBLIC_ADDRESS = "93.184.216.34"
+
+
+def make_cache(tmp_path, handler, addresses=None, **kwargs):
+    """A cache fetching through `handler`, with a fake resolver mapping host names to addresses."""
+    addresses = {"files.example.com": PUBLIC_ADDRESS, **(addresses or {})}
+    options = {"fetch_enabled": True, "allowed_hosts": ("files.example.com", "*.cdn.example.com"), **kwargs}
+    cache = FileUriCache(
+        str(tmp_path),
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        **options,
+    )
+    real_resolve = cache._resolve
+
+    async def resolve(host, port):
+        address = addresses.get(host, host)
+        # Check the fake answer like a real one.
+        if not is_public_address(address):
+            raise FetchNotAllowed(f"{host} does not resolve to public addresses only")
+        return address
+
+    cache._resolve = resolve
+    cache.real_resolve = real_resolve
+    return cache
+
+
+def test_host_allowlist_patterns():
+    allowed = ("files.example.com", "*.cdn.example.com")
+    assert host_allowed("files.example.com", allowed)
+    assert host_allowed("eu.cdn.example.com", allowed)
+    assert not host_allowed("cdn.example.com.evil.net", allowed)
+    assert not host_allowed("example.com", allowed)
+
+
+@pytest.mark.parametrize(
+    "address, public",
+    [
+        (PUBLIC_ADDRESS, True),
+        ("127.0.0.1", False),
+        ("10.1.2.3", False),
+        ("192.168.0.10", False),
+        ("169.254.169.254", False),
+        ("100.64.0.1", False),
+        ("0.0.0.0", False),
+        ("::1", False),
+        ("fe80::1", False),
+        ("::ffff:127.0.0.1", False),
+        ("2606:4700:4700::1111", True),
+    ],
+)
+def test_is_public_address(address, public):
+    assert is_public_address(address) is public
+
+
+def test_fetching_is_disabled_by_default(tmp_path):
+    cache = FileUriCache(str(tmp_path))
+    assert not cache.allows("https://files.example.com/visa.pdf")
+    with pytest.raises(FetchNotAllowed):
+        asyncio.run(cache.get("https://files.example.com/visa.pdf"))
+
+
+def test_only_allowed_hosts_are_fetched(tmp_path):
+    cache = make_cache(tmp_path, lambda request: httpx.Response(200, content=b"ok"))
+    assert cache.allows("https://files.example.com/a.pdf")
+    assert not cache.allows("http://169.254.169.254/latest/meta-data/")
+    assert not cache.allows("file:///etc/passwd")
+    with pytest.raises(FetchNotAllowed):
+        asyncio.run(cache.get("http://internal.example.com/a.pdf"))
+
+
+def test_fetch_is_pinned_to_the_checked_address(tmp_path):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, content=b"brochure", headers={"content-type": "application/pdf"})
+
+    cache = make_cache(tmp_path, handler)
+    entry = asyncio.run(cache.get("https://files.example.com/brochure.pdf"))
+    assert entry.size == 8 and entry.mime_type == "application/pdf"
+    assert requests[0].url.host == PUBLIC_ADDRESS
+    assert requests[0].headers["host"] == "files.example.com"
+    assert requests[0].extensions["sni_hostname"] == "files.example.com"
+
+
+def test_allowed_host_resolving_to_an_internal_address_is_refused(tmp_path):
+    cache = make_cache(
+        tmp_path,
+        lambda request: httpx.Response(200, content=b"secret"),
+        addresses={"files.example.com": "169.254.169.254"},
+    )
+    with pytest.raises(FetchNotAllowed):
+        asyncio.run(cache.get("https://files.example.com/a.pdf"))
+
+
+def test_resolver_refuses_loopback_names(tmp_path):
+    cache = make_cache(tmp_path, lambda request: httpx.Response(200))
+    with pytest.raises(FetchNotAllowed):
+        asyncio.run(cache.real_resolve("localhost", 80))
+
+
+def test_redirects_are_checked_at_every_hop(tmp_path):
+    def handler(request):
+        if request.url.path == "/internal":
+            return httpx.Response(302, headers={"location": "http://127.0.0.1:8080/admin"})
+        if request.url.path == "/moved":
+            return httpx.Response(301, headers={"location": "https://eu.cdn.example.com/final.pdf"})
+        return httpx.Response(200, content=b"final")
+
+    cache = make_cache(tmp_path, handler, addresses={"eu.cdn.example.com": "8.8.4.4"})
+    with pytest.raises(FetchNotAllowed):
+        asyncio.run(cache.get("https://files.example.com/internal"))
+    entry = asyncio.run(cache.get("https://files.example.com/moved"))
+    assert entry.size == 5
+
+
+def test_oversized_downloads_are_aborted(tmp_path):
+    cache = make_cache(tmp_path, lambda request: httpx.Response(200, content=b"x" * 100), max_download_bytes=50)
+    with pytest.raises(ValueError):
+        asyncio.run(cache.get("https://files.example.com/big.pdf"))
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".part")]
+
+
+def test_not_modified_revalidation_is_persisted(tmp_path):
+    def handler(request):
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, content=b"visa rules", headers={"etag": '"v1"'})
+
+    cache = make_cache(tmp_path, handler, revalidate_after=0)
+    first = asyncio.run(cache.get("https://files.example.com/visa.pdf"))
+    validated_at = first.validated_at
+    second = asyncio.run(cache.get("https://files.example.com/visa.pdf"))
+    assert second.digest == first.digest and second.validated_at > validated_at
+
+    reloaded = FileUriCache(str(tmp_path))
+    assert reloaded._entries["https://files.example.com/visa.pdf"].validated_at == second.validated_at
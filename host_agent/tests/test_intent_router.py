@@ -0,0 +1,228 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from a2a.types import (
+    AgentCapabilities,
+    AgentCard,
+    AgentSkill,
+    Artifact,
+    JSONRPCError,
+    JSONRPCErrorResponse,
+    Part,
+    SendStreamingMessageResponse,
+    SendStreamingMessageSuccessResponse,
+    Task,
+    TaskArtifactUpdateEvent,
+    TaskState,
+    TaskStatus,
+    TaskStatusUpdateEvent,
+    TextPart,
+)
+
+from host.intent_router import DirectDelegation, IntentRouter
+
+# The cards the search and travel planning agents publish.
+SEARCH_CARD = AgentCard(
+    name="Search Agent",
+    description="Expert travel search agent that uses Google search to gather real-time information about flights, accommodations, activities, and destinations",
+    url="http://localhost:10003/",
+    version="1.0.0",
+    defaultInputModes=["text/plain"],
+    defaultOutputModes=["text/plain", "text/event-stream"],
+    capabilities=AgentCapabilities(streaming=True),
+    skills=[
+        AgentSkill(
+            id="travel_search",
+            name="Travel Search",
+            description="Performs real-time searches for travel information including flights, hotels, activities, and local details",
+            tags=["travel", "search", "google"],
+            examples=[
+                "Find current hotel prices in Tokyo for March 2024",
+                "Search for flight options from New York to Paris",
+                "Get information about attractions in Barcelona",
+            ],
+        )
+    ],
+)
+PLANNING_CARD = AgentCard(
+    name="Travel Planning Agent",
+    description="Expert travel planning agent specializing in creating comprehensive, personalized itineraries with accommodations, activities, and detailed logistics",
+    url="http://localhost:10002/",
+    version="1.0.0",
+    defaultInputModes=["text/plain"],
+    defaultOutputModes=["text/plain"],
+    capabilities=AgentCapabilities(streaming=True),
+    skills=[
+        AgentSkill(
+            id="travel_planning",
+            name="Travel_Planning",
+            description="Creates comprehensive, personalized travel itineraries with accommodations, activities, and logistics",
+            tags=["travel", "planning", "itinerary"],
+            examples=[
+                "Plan a 7-day trip to Paris for a couple with $3000 budget",
+                "Create family-friendly Tokyo itinerary for 5 days",
+            ],
+        )
+    ],
+)
+
+
+@pytest.fixture
+def router():
+    registry = SimpleNamespace(
+        cards={SEARCH_CARD.name: SEARCH_CARD, PLANNING_CARD.name: PLANNING_CARD}
+    )
+    return IntentRouter(registry, min_score=3)
+
+
+def artifact(text, append=False, last_chunk=False):
+    return TaskArtifactUpdateEvent(
+        taskId="t",
+        contextId="c",
+        artifact=Artifact(artifactId="a", parts=[Part(root=TextPart(text=text))]),
+        append=append,
+        lastChunk=last_chunk,
+    )
+
+
+def status(state, final=False):
+    return TaskStatusUpdateEvent(
+        taskId="t", contextId="c", status=TaskStatus(state=state), final=final
+    )
+
+
+class Connection:
+    card = SimpleNamespace(name="Search Agent")
+
+    def __init__(self, events):
+        self.events = events
+
+    async def send_message_streaming(self, request):
+        for event in self.events:
+            if isinstance(event, JSONRPCErrorResponse):
+                yield SendStreamingMessageResponse(root=event)
+            else:
+                yield SendStreamingMessageResponse(
+                    root=SendStreamingMessageSuccessResponse(id=request.id, result=event)
+                )
+
+
+def delegate(events):
+    delegation = DirectDelegation(Connection(events))
+    chunks = []
+
+    async def main():
+        async for text in delegation.stream("Find hotels in Lisbon"):
+            chunks.append(text)
+
+    asyncio.run(main())
+    return delegation, chunks
+
+
+def test_completed_task_relays_each_new_piece_once():
+    delegation, chunks = delegate(
+        [
+            status(TaskState.working),
+            artifact("Hotels in "),
+            artifact("Lisbon: ...", append=True),
+            artifact("Hotels in Lisbon: ...", last_chunk=True),
+            status(TaskState.completed, final=True),
+        ]
+    )
+    assert chunks == ["Hotels in ", "Lisbon: ..."]
+    assert delegation.text == "Hotels in Lisbon: ..."
+
+
+def test_completed_task_snapshot_is_accepted():
+    task = Task(
+        id="t",
+        contextId="c",
+        status=TaskStatus(state=TaskState.completed),
+        artifacts=[Artifact(artifactId="a", parts=[Part(root=TextPart(text="Done"))])],
+    )
+    delegation, _ = delegate([task])
+    assert delegation.text == "Done"
+
+
+@pytest.mark.parametrize(
+    "state", [TaskState.failed, TaskState.rejected, TaskState.canceled, TaskState.input_required]
+)
+def test_unsuccessful_states_raise_even_without_final(state):
+    with pytest.raises(RuntimeError, match=state.value):
+        delegate([artifact("Sorry, something went wrong"), status(state)])
+
+
+@pytest.mark.parametrize(
+    "events",
+    [
+        # The stream stopped before the task completed.
+        [artifact("Hotels in "), status(TaskState.working)],
+        # Completed, but without any text to relay.
+        [status(TaskState.working), artifact("  "), status(TaskState.completed, final=True)],
+        [status(TaskState.completed, final=True)],
+        [JSONRPCErrorResponse(id="1", error=JSONRPCError(code=-32603, message="boom"))],
+    ],
+)
+def test_incomplete_or_empty_delegations_raise(events):
+    with pytest.raises(RuntimeError):
+        delegate(events)
+
+
+@pytest.mark.parametrize(
+    "text", ["What time is it?", "hi, what's the date today", "What is today's date?"]
+)
+def test_date_and_time_questions_are_answered_locally(router, text):
+    assert router.classify(text).kind == "time"
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Find current hotel prices in Lisbon",
+        "Search for cheap flights and hotel deals in Tokyo",
+        "What are the latest visa requirements and flight prices for Peru?",
+    ],
+)
+def test_clear_search_requests_go_to_the_search_agent(router, text):
+    route = router.classify(text)
+    assert route.kind == "agent" and route.agent_name == "Search Agent"
+    assert route.score >= 3
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Plan a 5 day trip to Rome with a 2000 budget",
+        "Plan my honeymoon, I'd like a couple of days",
+        "Create a detailed itinerary for Kyoto and schedule each day",
+        "Plan a 7-day trip to Paris for a couple with $3000 budget",
+    ],
+)
+def test_planning_requests_go_to_the_orchestrator(router, text):
+    assert router.classify(text) is None
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "I want to visit Barcelona and New York",
+        "New York or Barcelona?",
+        "Tokyo in March",
+    ],
+)
+def test_place_names_alone_are_not_routed(router, text):
+    assert router.classify(text) is None
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Find flights to Rome and plan an itinerary",
+        "Is the museum open?",
+        "Search for hotels",
+        "Tell me a joke",
+    ],
+)
+def test_ambiguous_requests_go_to_the_orchestrator(router, text):
+    assert router.classify(text) is None
@@ -0,0 +1,110 @@
+import os
+
+import numpy as np
+import pytest
+
+from host.tools.local_vector_store import (
+    HashingEmbedder,
+    LocalRagBackend,
+    VectorStore,
+    chunk_text,
+    normalize_rows,
+)
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+
+@pytest.fixture
+def backend(tmp_path):
+    return LocalRagBackend(str(tmp_path / "store"), embed=HashingEmbedder(), import_root=DATA_DIR)
+
+
+@pytest.fixture
+def corpus(backend):
+    corpus = backend.create_corpus("guides")
+    assert backend.import_files(corpus.name, ["."]) == 2
+    return corpus
+
+
+def test_chunk_text_overlaps_windows():
+    words = [f"w{i}" for i in range(10)]
+    chunks = chunk_text(" ".join(words), chunk_size=4, chunk_overlap=1)
+    assert chunks == ["w0 w1 w2 w3", "w3 w4 w5 w6", "w6 w7 w8 w9"]
+
+
+@pytest.mark.parametrize(
+    "query, source",
+    [
+        ("How do I get around Tokyo by train?", "tokyo_transport.txt"),
+        ("Eiffel Tower", "paris_sights.txt"),
+        ("Which museums have Impressionist paintings?", "paris_sights.txt"),
+        ("subway pass for unlimited rides", "tokyo_transport.txt"),
+        ("airport transfer from Haneda", "tokyo_transport.txt"),
+        ("Montmartre", "paris_sights.txt"),
+    ],
+)
+def test_hashing_backend_retrieves_relevant_chunk(backend, corpus, query, source):
+    results = backend.retrieve(corpus.name, query)
+    assert results, f"no results for {query!r}"
+    assert results[0]["source_name"] == source
+    assert results[0]["score"] <= backend.distance_threshold
+
+
+@pytest.mark.parametrize("query", ["What is the capital of Peru?", "ramen restaurants in Osaka"])
+def test_hashing_backend_drops_unrelated_queries(backend, corpus, query):
+    assert backend.retrieve(corpus.name, query) == []
+
+
+def test_deleted_document_is_not_retrieved(backend, corpus):
+    paris = next(f for f in backend.list_files(corpus.name) if f.display_name == "paris_sights.txt")
+    backend.delete_file(paris.name)
+    results = backend.retrieve(corpus.name, "Eiffel Tower", distance_threshold=2.0)
+    assert all(result["source_name"] == "tokyo_transport.txt" for result in results)
+
+
+def test_imports_are_confined_to_the_import_root(backend, tmp_path):
+    secret = tmp_path / "secret.txt"
+    secret.write_text("api key hunter2")
+    assert backend.resolve_local_path("tokyo_transport.txt") == os.path.join(
+        os.path.realpath(DATA_DIR), "tokyo_transport.txt"
+    )
+    assert backend.resolve_local_path(f"file://{DATA_DIR}/paris_sights.txt")
+    for path in [str(secret), f"file://{secret}", "../../../etc/passwd", "/etc/passwd", "missing.txt"]:
+        assert backend.resolve_local_path(path) is None
+    corpus = backend.create_corpus("guides")
+    assert backend.import_files(corpus.name, [str(secret), "/etc/passwd"]) == 0
+
+
+def test_symlinks_out_of_the_import_root_are_skipped(tmp_path):
+    root = tmp_path / "docs"
+    root.mkdir()
+    (root / "guide.txt").write_text("Tokyo trains run every few minutes")
+    secret = tmp_path / "secret.txt"
+    secret.write_text("private key")
+    (root / "link.txt").symlink_to(secret)
+    backend = LocalRagBackend(str(tmp_path / "store"), embed=HashingEmbedder(), import_root=str(root))
+    assert backend.resolve_local_path("link.txt") is None
+    corpus = backend.create_corpus("docs")
+    assert backend.import_files(corpus.name, ["."]) == 1
+
+
+def test_local_paths_are_disabled_without_an_import_root(tmp_path):
+    backend = LocalRagBackend(str(tmp_path / "store"), embed=HashingEmbedder(), import_root=None)
+    assert not backend.supports_local_paths
+    assert backend.resolve_local_path(os.path.join(DATA_DIR, "paris_sights.txt")) is None
+
+
+def test_ivf_search_matches_exact_search(tmp_path):
+    rng = np.random.default_rng(0)
+    centers = normalize_rows(rng.standard_normal((20, 32)))
+    vectors = centers[rng.integers(0, 20, 2_000)] + 0.05 * rng.standard_normal((2_000, 32))
+    store = VectorStore(str(tmp_path), 32)
+    store.append(vectors, [str(row) for row in range(2_000)], owner=1)
+    query = vectors[7]
+    exact_rows, exact_distances = store.search(query, 5, exact=True)
+    assert exact_rows[0] == 7 and exact_distances[0] == pytest.approx(0.0, abs=1e-5)
+    store.build_ivf(nlist=10)
+    ivf_rows, _ = store.search(query, 5, nprobe=3)
+    assert ivf_rows[0] == 7
+    store.delete(7, 8)
+    assert 7 not in store.search(query, 5, exact=True)[0]
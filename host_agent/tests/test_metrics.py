@@ -0,0 +1,80 @@
+from google.adk.events import Event
+from google.genai import types
+
+from host.metrics import LLM_LATENCY, LLM_TOKENS, CallUsage, ModelCallObserver
+
+
+def model_event(text=None, partial=None, usage=None, function_call=None, function_response=None):
+    if function_call:
+        part = types.Part(function_call=types.FunctionCall(name=function_call, args={}))
+    elif function_response:
+        part = types.Part(function_response=types.FunctionResponse(name=function_response, response={}))
+    else:
+        part = types.Part(text=text)
+    return Event(
+        invocation_id="run",
+        author="travel_agent",
+        partial=partial,
+        content=types.Content(role="model", parts=[part]),
+        usage_metadata=(
+            types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=usage[0], candidates_token_count=usage[1]
+            )
+            if usage
+            else None
+        ),
+    )
+
+
+def test_streamed_call_usage_is_counted_once_with_running_totals():
+    calls = []
+    observer = ModelCallObserver(calls.append)
+    # Tool call streamed after some text: the aggregated text event and the
+    # function call event carry the same usage.
+    for event in [
+        model_event("Let me ", partial=True, usage=(100, 2)),
+        model_event("check.", partial=True, usage=(100, 4)),
+        model_event("Let me check.", usage=(100, 4)),
+        model_event(function_call="search", usage=(100, 4)),
+        model_event(function_response="search"),
+        model_event("Paris ", partial=True, usage=(150, 3)),
+        model_event("is lovely.", partial=True, usage=(150, 8)),
+        model_event("Paris is lovely.", usage=(150, 8)),
+    ]:
+        observer.observe(event)
+    observer.finish()
+    observer.finish()
+    assert [(call.prompt_token_count, call.candidates_token_count) for call in calls] == [(100, 4), (150, 8)]
+
+
+def test_usage_reported_only_on_the_last_chunk_is_kept():
+    calls = []
+    observer = ModelCallObserver(calls.append)
+    observer.observe(model_event("Hel", partial=True))
+    observer.observe(model_event("lo", partial=True, usage=(10, 2)))
+    observer.observe(model_event("Hello"))
+    observer.finish()
+    assert calls == [CallUsage(prompt_token_count=10, candidates_token_count=2)]
+
+
+def test_latency_is_timed_from_the_call_start_not_the_last_chunk(monkeypatch):
+    clock = iter([0.0, 1.0, 2.0, 3.0, 3.5])
+    monkeypatch.setattr("host.metrics.time.perf_counter", lambda: next(clock))
+    observed = []
+    monkeypatch.setattr(LLM_LATENCY, "observe", lambda value, **labels: observed.append(value))
+    observer = ModelCallObserver()
+    observer.observe(model_event("a", partial=True))
+    observer.observe(model_event("b", partial=True))
+    observer.observe(model_event("ab"))
+    observer.observe(model_event(function_call="plan"))
+    assert observed == [3.0]
+
+
+def test_tokens_are_exported_once_per_call(monkeypatch):
+    exported = []
+    monkeypatch.setattr(LLM_TOKENS, "inc", lambda amount, **labels: exported.append((labels["kind"], amount)))
+    observer = ModelCallObserver()
+    observer.observe(model_event("Hi", partial=True, usage=(5, 1)))
+    observer.observe(model_event("Hi", usage=(5, 1)))
+    observer.finish()
+    assert exported == [("prompt", 5), ("candidates", 1), ("cached", 0)]
@@ -0,0 +1,43 @@
+import base64
+import os
+
+import pytest
+
+from host.part_conversion import decode_file_bytes, encode_file_bytes
+
+
+@pytest.mark.parametrize("size", [0, 1, 2, 3, 1000, 3 * 1024 * 1024 + 1])
+def test_round_trip(size):
+    payload = os.urandom(size)
+    encoded = encode_file_bytes(payload)
+    assert encoded == base64.b64encode(payload).decode("ascii")
+    assert decode_file_bytes(encoded) == payload
+
+
+def test_line_wrapped_base64_is_accepted():
+    payload = os.urandom(1000)
+    wrapped = base64.encodebytes(payload).decode("ascii")
+    assert "\n" in wrapped
+    assert decode_file_bytes(wrapped) == payload
+    assert decode_file_bytes("aGVs bG8=\r\n") == b"hello"
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        "aGVsbG8",  # missing padding
+        "aGVsbG8=!",  # data after the padding
+        "aGVs*bG8=",  # character outside the alphabet
+        "=aGVsbG8",  # leading padding
+        "aGVsbG8=é",  # non-ASCII
+    ],
+)
+def test_invalid_base64_is_rejected(data):
+    with pytest.raises(ValueError):
+        decode_file_bytes(data)
+
+
+def test_large_invalid_payload_is_rejected():
+    data = encode_file_bytes(os.urandom(3 * 1024 * 1024))
+    with pytest.raises(ValueError):
+        decode_file_bytes(data[:1000] + "*" + data[1000:])
@@ -0,0 +1,118 @@
+import asyncio
+import uuid
+from types import SimpleNamespace
+
+from a2a.types import (
+    Artifact,
+    Part,
+    SendMessageResponse,
+    SendMessageSuccessResponse,
+    SendStreamingMessageResponse,
+    SendStreamingMessageSuccessResponse,
+    Task,
+    TaskArtifactUpdateEvent,
+    TaskState,
+    TaskStatus,
+    TextPart,
+)
+
+from host.pipeline import SearchPlanPipeline, complete_sections
+
+SECTIONS = [
+    f"## {name}\n" + " ".join(f"{name} finding {n}." for n in range(30)) + "\n\n"
+    for name in ("Flights", "Hotels", "Weather", "Visa", "Events", "Transport")
+]
+
+
+def test_complete_sections_stop_before_the_latest_heading():
+    assert complete_sections("Intro text, still stream") == ""
+    assert complete_sections("## Flights\nFrom $500 to $") == ""
+    assert complete_sections("## Flights\nFrom $500.\n\n## Hotels\nThe Bai") == "## Flights\nFrom $500."
+    assert complete_sections("**Flights**\nFrom $500.\n**Hotels:**\nThe") == "**Flights**\nFrom $500."
+    # Bold text inside a paragraph is not a heading.
+    assert complete_sections("Flights cost **about $500** now") == ""
+
+
+class Search:
+    card = SimpleNamespace(name="Search Agent")
+
+    async def send_message_streaming(self, request):
+        artifact_id = str(uuid.uuid4())
+        text = "".join(SECTIONS)
+        # Chunks that cut sections mid-sentence.
+        chunks = [text[start : start + 97] for start in range(0, len(text), 97)]
+        for index, chunk in enumerate(chunks):
+            await asyncio.sleep(0.001)
+            yield self._event(artifact_id, chunk, append=index > 0)
+        yield self._event(artifact_id, text, append=False, last_chunk=True)
+
+    @staticmethod
+    def _event(artifact_id, text, append, last_chunk=False):
+        return SendStreamingMessageResponse(
+            root=SendStreamingMessageSuccessResponse(
+                id="1",
+                result=TaskArtifactUpdateEvent(
+                    taskId="t",
+                    contextId="c",
+                    artifact=Artifact(artifactId=artifact_id, parts=[Part(root=TextPart(text=text))]),
+                    append=append,
+                    lastChunk=last_chunk,
+                ),
+            )
+        )
+
+
+class Planning:
+    card = SimpleNamespace(name="Travel Planning Agent")
+
+    def __init__(self):
+        self.messages = []
+
+    async def send_message(self, request):
+        self.messages.append(request.params.message.parts[0].root.text)
+        await asyncio.sleep(0.01)
+        return SendMessageResponse(
+            root=SendMessageSuccessResponse(
+                id=request.id,
+                result=Task(
+                    id="p",
+                    contextId=request.params.message.contextId,
+                    status=TaskStatus(state=TaskState.completed),
+                    artifacts=[
+                        Artifact(
+                            artifactId="a",
+                            parts=[Part(root=TextPart(text=f"plan {len(self.messages)}"))],
+                        )
+                    ],
+                ),
+            )
+        )
+
+
+def run_pipeline(**kwargs):
+    planning = Planning()
+    pipeline = SearchPlanPipeline(Search(), planning, min_findings_chars=100, **kwargs)
+    result = asyncio.run(pipeline.run("search", "Plan a trip"))
+    return result, planning.messages
+
+
+def test_planning_starts_on_a_section_boundary_and_gets_every_finding():
+    result, messages = run_pipeline(max_revisions=1)
+    assert result["search_results"] == "".join(SECTIONS)
+    assert result["plan"] == f"plan {len(messages)}"
+    first = messages[0].split("Search findings so far:\n", 1)[1]
+    # Only whole sections, cut before the heading of the section still streaming.
+    assert "".join(SECTIONS).startswith(first) and (first + "\n\n") in {
+        "".join(SECTIONS[:n]) for n in range(1, len(SECTIONS))
+    }
+    sent = first + "".join(message.split("\n\nRevise")[0].split(":\n", 1)[1] for message in messages[1:])
+    for section in SECTIONS:
+        assert section.strip() in sent
+
+
+def test_revisions_are_batched_and_capped():
+    _, messages = run_pipeline(max_revisions=1)
+    # The first plan, at most one revision during the search and one final revision.
+    assert len(messages) <= 3
+    _, messages = run_pipeline(max_revisions=0)
+    assert len(messages) == 2
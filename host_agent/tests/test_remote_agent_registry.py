@@ -0,0 +1,88 @@
+import asyncio
+
+import httpx
+from a2a.types import AgentCapabilities, AgentCard
+
+from host.remote_agent_registry import ADMIN_SOURCE, CONFIG_SOURCE, RemoteAgentRegistry, read_agent_urls
+
+AGENTS = {
+    "http://search:10003": "Search Agent",
+    "http://planner:10002": "Travel Planning Agent",
+    "http://weather:10004": "Weather Agent",
+}
+
+
+def card_handler(request: httpx.Request) -> httpx.Response:
+    url = f"{request.url.scheme}://{request.url.host}:{request.url.port}"
+    card = AgentCard(
+        name=AGENTS[url],
+        description=f"{AGENTS[url]} for tests",
+        url=url,
+        version="1.0.0",
+        defaultInputModes=["text/plain"],
+        defaultOutputModes=["text/plain"],
+        capabilities=AgentCapabilities(),
+        skills=[],
+    )
+    return httpx.Response(200, json=card.model_dump(mode="json", exclude_none=True))
+
+
+def run(scenario, handler=card_handler):
+    async def main():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        registry = RemoteAgentRegistry(http_client=client, drain_timeout=0.1)
+        try:
+            await scenario(registry)
+        finally:
+            await registry.aclose()
+            await client.aclose()
+
+    asyncio.run(main())
+
+
+def test_file_syncs_keep_admin_added_agents():
+    async def scenario(registry):
+        await registry.sync(["http://search:10003", "http://planner:10002"])
+        assert await registry.add("http://weather:10004") is not None
+        assert registry.sources == {
+            "Search Agent": CONFIG_SOURCE,
+            "Travel Planning Agent": CONFIG_SOURCE,
+            "Weather Agent": ADMIN_SOURCE,
+        }
+
+        # The file drops the planner; the admin-added agent stays.
+        await registry.sync(["http://search:10003"])
+        assert set(registry.connections) == {"Search Agent", "Weather Agent"}
+        assert "Weather Agent" in registry.listing
+
+        # Listing an admin-added URL in the file does not duplicate or take it over.
+        await registry.sync(["http://search:10003", "http://weather:10004"])
+        await registry.sync(["http://search:10003"])
+        assert registry.sources["Weather Agent"] == ADMIN_SOURCE
+
+        assert await registry.remove("Weather Agent")
+        assert set(registry.connections) == {"Search Agent"}
+
+    run(scenario)
+
+
+def test_unreachable_agents_are_skipped():
+    async def scenario(registry):
+        assert await registry.add("http://unknown:1") is None
+        await registry.sync(["http://search:10003", "http://unknown:1"])
+        assert set(registry.connections) == {"Search Agent"}
+
+    def handler(request):
+        if request.url.host == "unknown":
+            raise httpx.ConnectError("refused", request=request)
+        return card_handler(request)
+
+    run(scenario, handler)
+
+
+def test_read_agent_urls(tmp_path):
+    path = tmp_path / "agents.txt"
+    path.write_text("# agents\nhttp://search:10003\n\n  http://planner:10002 \n")
+    assert read_agent_urls(str(path)) == ["http://search:10003", "http://planner:10002"]
+    path.write_text('["http://search:10003", " "]')
+    assert read_agent_urls(str(path)) == ["http://search:10003"]
@@ -0,0 +1,136 @@
+from host.tools import retrieval_cache as retrieval_cache_module
+from host.tools.retrieval_cache import RetrievalCache, normalize_query
+
+CORPUS = "projects/p/locations/l/ragCorpora/1"
+OTHER_CORPUS = "projects/p/locations/l/ragCorpora/2"
+
+
+class Retriever:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, corpus, query, top_k, distance_threshold):
+        self.calls.append((corpus, query, top_k, distance_threshold))
+        return [{"source_uri": f"{corpus}/{query}", "text": query, "score": 0.9}]
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+def test_normalize_query_ignores_case_and_whitespace():
+    assert normalize_query("  Python   Engineer\nBerlin ") == "python engineer berlin"
+
+
+def test_repeated_query_is_served_from_the_cache():
+    cache, retrieve = RetrievalCache(max_entries=10, ttl=60), Retriever()
+    first = cache.get_or_retrieve(CORPUS, "Python engineer", 5, 0.5, retrieve)
+    second = cache.get_or_retrieve(CORPUS, "python   ENGINEER", 5, 0.5, retrieve)
+    assert second == first
+    assert len(retrieve.calls) == 1
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+    assert cache.hit_ratio == 0.5
+
+
+def test_different_parameters_are_cached_separately():
+    cache, retrieve = RetrievalCache(max_entries=10, ttl=60), Retriever()
+    cache.get_or_retrieve(CORPUS, "q", 5, 0.5, retrieve)
+    cache.get_or_retrieve(CORPUS, "q", 10, 0.5, retrieve)
+    cache.get_or_retrieve(CORPUS, "q", 5, 0.7, retrieve)
+    cache.get_or_retrieve(OTHER_CORPUS, "q", 5, 0.5, retrieve)
+    assert len(retrieve.calls) == 4
+
+
+def test_callers_cannot_modify_cached_results():
+    cache, retrieve = RetrievalCache(max_entries=10, ttl=60), Retriever()
+    cache.get_or_retrieve(CORPUS, "q", 5, 0.5, retrieve)[0]["text"] = "changed"
+    cache.get_or_retrieve(CORPUS, "q", 5, 0.5, retrieve)[0]["text"] = "changed again"
+    assert cache.get_or_retrieve(CORPUS, "q", 5, 0.5, retrieve)[0]["text"] == "q"
+
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(retrieval_cache_module, "time", clock)
+    cache, retrieve = RetrievalCache(max_entries=10, ttl=60), Retriever()
+    cache.get_or_retrieve(CORPUS, "q", 5, 0.5, retrieve)
+    clock.now += 59
+    cache.get_or_retrieve(CORPUS, "q", 5, 0.5, retrieve)
+    assert len(retrieve.calls) == 1
+    clock.now += 1
+    cache.get_or_retrieve(CORPUS, "q", 5, 0.5, retrieve)
+    assert len(retrieve.calls) == 2
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache, retrieve = RetrievalCache(max_entries=2, ttl=60), Retriever()
+    cache.get_or_retrieve(CORPUS, "a", 5, 0.5, retrieve)
+    cache.get_or_retrieve(CORPUS, "b", 5, 0.5, retrieve)
+    cache.get_or_retrieve(CORPUS, "a", 5, 0.5, retrieve)
+    cache.get_or_retrieve(CORPUS, "c", 5, 0.5, retrieve)
+    assert cache.stats()["entries"] == 2
+    cache.get_or_retrieve(CORPUS, "a", 5, 0.5, retrieve)
+    assert len(retrieve.calls) == 3
+    cache.get_or_retrieve(CORPUS, "b", 5, 0.5, retrieve)
+    assert len(retrieve.calls) == 4
+
+
+def test_invalidating_a_corpus_drops_only_its_entries():
+    cache, retrieve = RetrievalCache(max_entries=10, ttl=60), Retriever()
+    cache.get_or_retrieve(CORPUS, "q", 5, 0.5, retrieve)
+    cache.get_or_retrieve(OTHER_CORPUS, "q", 5, 0.5, retrieve)
+    cache.invalidate_corpus(CORPUS)
+    assert cache.version(CORPUS) == 1 and cache.version(OTHER_CORPUS) == 0
+    cache.get_or_retrieve(CORPUS, "q", 5, 0.5, retrieve)
+    cache.get_or_retrieve(OTHER_CORPUS, "q", 5, 0.5, retrieve)
+    assert [call[0] for call in retrieve.calls] == [CORPUS, OTHER_CORPUS, CORPUS]
+
+
+def test_retrieval_running_during_an_invalidation_is_not_cached():
+    cache = RetrievalCache(max_entries=10, ttl=60)
+    calls = []
+
+    def retrieve(corpus, query, top_k, distance_threshold):
+        calls.append(query)
+        if len(calls) == 1:
+            # Files are imported while the first retrieval runs.
+            cache.invalidate_corpus(corpus)
+        return [{"text": f"result {len(calls)}"}]
+
+    assert cache.get_or_retrieve(CORPUS, "q", 5, 0.5, retrieve) == [{"text": "result 1"}]
+    assert cache.stats()["entries"] == 0
+    assert cache.get_or_retrieve(CORPUS, "q", 5, 0.5, retrieve) == [{"text": "result 2"}]
+    assert cache.get_or_retrieve(CORPUS, "q", 5, 0.5, retrieve) == [{"text": "result 2"}]
+    assert len(calls) == 2
+
+
+def test_disabled_cache_always_retrieves():
+    for cache in (RetrievalCache(max_entries=0, ttl=60), RetrievalCache(max_entries=10, ttl=0)):
+        retrieve = Retriever()
+        assert not cache.enabled
+        cache.get_or_retrieve(CORPUS, "q", 5, 0.5, retrieve)
+        cache.get_or_retrieve(CORPUS, "q", 5, 0.5, retrieve)
+        assert len(retrieve.calls) == 2
+        assert cache.stats()["entries"] == 0 and cache.stats()["hits"] == 0
+
+
+def test_hits_record_the_retrieval_time_saved(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(retrieval_cache_module, "time", clock)
+    cache = RetrievalCache(max_entries=10, ttl=60)
+
+    def slow_retrieve(corpus, query, top_k, distance_threshold):
+        clock.now += 1.5
+        return []
+
+    cache.get_or_retrieve(CORPUS, "q", 5, 0.5, slow_retrieve)
+    cache.get_or_retrieve(CORPUS, "q", 5, 0.5, slow_retrieve)
+    cache.get_or_retrieve(CORPUS, "q", 5, 0.5, slow_retrieve)
+    assert cache.stats() == {
+        "entries": 1, "hits": 2, "misses": 1, "hit_ratio": 0.6667, "saved_seconds": 3.0,
+    }
+    cache.clear()
+    assert cache.stats()["entries"] == 0
@@ -7,6 +7,7 @@ and starts the server to handle incoming requests.
 from asyncio import Runner
 import logging
 import os
+from contextlib import asynccontextmanager
 
 import uvicorn
 from a2a.server.apps import A2AStarletteApplication
@@ -24,10 +25,15 @@ from a2a.types import (
 from agent import root_agent
 from agent_executor import SearchAgentExecutor
 from dotenv import load_dotenv
+from search_cache import get_search_cache
+from metrics import SESSIONS, RequestCounterMiddleware, count_sessions, metrics_endpoint
+from structured_logging import configure_logging
+from starlette.middleware import Middleware
+from starlette.routing import Route
 
 load_dotenv()
 
-logging.basicConfig(level=logging.INFO)
+configure_logging()
 logger = logging.getLogger(__name__)
 
 
@@ -85,7 +91,23 @@ def main():
             agent_card=agent_card, http_handler=request_handler
         )
 
-        uvicorn.run(server.build(), host=host, port=port)
+        SESSIONS.set_function(lambda: count_sessions(runner.session_service))
+
+        @asynccontextmanager
+        async def lifespan(app):
+            try:
+                yield
+            finally:
+                # Write the changes still waiting for their debounced save.
+                await get_search_cache().flush()
+
+        app = server.build(
+            routes=[Route("/metrics", metrics_endpoint, methods=["GET"])],
+            middleware=[Middleware(RequestCounterMiddleware)],
+            lifespan=lifespan,
+        )
+
+        uvicorn.run(app, host=host, port=port)
 
     except MissingAPIKeyError as e:
         logger.error(f"Error: {e}")
@@ -1,13 +1,34 @@
+import os
+
 from google.adk.agents import LlmAgent
 from google.adk.tools import google_search
 
+from model_routing import ModelRouter
+from search_planner import search_travel
+
+# Search through the parallel planner tool instead of one google_search per turn.
+SEARCH_PLANNER_ENABLED = os.getenv("SEARCH_PLANNER_ENABLED", "true").lower() == "true"
+
+PLANNER_TOOLS_INSTRUCTION = """
+        ## Search Tools Available:
+        - **search_travel**: Searches all the categories a request needs (flights, hotels, weather, visas, ...) in parallel and returns the findings per category with sources
+
+        Call `search_travel` once with the complete request, including destinations, dates and preferences, then write your answer from the returned findings. Only call it again if an essential category is missing from the results.
+"""
+
+GOOGLE_SEARCH_TOOLS_INSTRUCTION = """
+        ## Search Tools Available:
+        - **google_search**: Perform Google searches for any travel-related information
+"""
+
 
 def create_agent() -> LlmAgent:
     """Constructs the ADK agent for travel search."""
+    router = ModelRouter()
     return LlmAgent(
-        model="gemini-2.0-flash-001",
+        model=router.strong_model,
         name="Search_Agent",
-        instruction="""
+        instruction=f"""
         **Role:** Expert travel search agent with real-time information gathering capabilities
 
         You are a specialized search agent focused on gathering comprehensive, current travel information. Your expertise includes:
@@ -27,10 +48,7 @@ def create_agent() -> LlmAgent:
         3. **Current Information**: Focus on finding the most recent and up-to-date information available
         4. **Verification**: Cross-reference information from multiple sources when possible
         5. **Practical Focus**: Prioritize actionable information that travelers can use
-
-        ## Search Tools Available:
-        - **google_search**: Perform Google searches for any travel-related information
-
+{PLANNER_TOOLS_INSTRUCTION if SEARCH_PLANNER_ENABLED else GOOGLE_SEARCH_TOOLS_INSTRUCTION}
         ## Information Categories to Search:
         - **Flights**: Airlines, routes, pricing, schedules, booking platforms
         - **Accommodations**: Hotels, vacation rentals, hostels, pricing, availability, reviews
@@ -47,9 +65,11 @@ def create_agent() -> LlmAgent:
         - Organize findings in categories that are useful for travel planning
         - Note any limitations or gaps in available information
 
-        Always use the google_search tool to gather current, accurate information rather than relying on potentially outdated knowledge. Focus on providing actionable intelligence that enables informed travel decisions.
+        Always use your search tool to gather current, accurate information rather than relying on potentially outdated knowledge. Focus on providing actionable intelligence that enables informed travel decisions.
         """,
-        tools=[google_search],
+        tools=[search_travel] if SEARCH_PLANNER_ENABLED else [google_search],
+        before_model_callback=router.before_model,
+        after_model_callback=router.after_model,
     )
 
 root_agent = create_agent()
\ No newline at end of file
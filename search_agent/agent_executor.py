@@ -1,5 +1,6 @@
 import asyncio
 import logging
+import time
 from collections.abc import AsyncGenerator
 
 from a2a.server.agent_execution import AgentExecutor
@@ -7,9 +8,6 @@ from a2a.server.agent_execution.context import RequestContext
 from a2a.server.events.event_queue import EventQueue
 from a2a.server.tasks import TaskUpdater
 from a2a.types import (
-    FilePart,
-    FileWithBytes,
-    FileWithUri,
     Part,
     TaskState,
     TextPart,
@@ -21,8 +19,14 @@ from google.adk import Runner
 from google.adk.events import Event
 from google.genai import types
 
+from file_cache import get_file_cache
+from metrics import TASK_LATENCY, TASKS_IN_FLIGHT, ModelCallObserver
+from part_conversion import convert_a2a_parts_to_genai_cached, convert_genai_parts_to_a2a
+from streaming import ArtifactStreamer, build_run_config
+from structured_logging import correlation_id, log_payload
+from usage import TokenUsage, complete_task, current_task_usage, record_task_usage
+
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
 
 
 class SearchAgentExecutor(AgentExecutor):
@@ -32,13 +36,15 @@ class SearchAgentExecutor(AgentExecutor):
     
         self.runner = runner
         self._running_sessions = {}
+        self._run_config = build_run_config()
 
     def _run_agent(
         self, session_id, new_message: types.Content
     ) -> AsyncGenerator[Event, None]:
         try:
             return self.runner.run_async(
-                session_id=session_id, user_id="search_agent", new_message=new_message
+                session_id=session_id, user_id="search_agent", new_message=new_message,
+                run_config=self._run_config,
             )
         except asyncio.CancelledError as e:
             logger.error(f"Agent execution was cancelled: {e}")
@@ -53,25 +59,40 @@ class SearchAgentExecutor(AgentExecutor):
         new_message: types.Content,
         session_id: str,
         task_updater: TaskUpdater,
-    ) -> None:
+    ) -> TaskState:
+        usage = TokenUsage()
+        usage_token = current_task_usage.set(usage)
         try:
             session_obj = await self._upsert_session(session_id)
             session_id = session_obj.id
-            print(f"new_message {new_message}")
+            log_payload(logger, "Running agent", new_message, session_id=session_id)
             
             # Set a timeout for the API call
             try:
                 async with asyncio.timeout(30):  # 30 second timeout
+                    model_calls = ModelCallObserver(usage.add_usage_metadata)
+                    streamer = ArtifactStreamer(task_updater)
                     async for event in self._run_agent(session_id, new_message):
+                        model_calls.observe(event)
+                        if event.partial:
+                            await streamer.append(
+                                convert_genai_parts_to_a2a(
+                                    event.content.parts
+                                    if event.content and event.content.parts
+                                    else []
+                                )
+                            )
+                            continue
                         if event.is_final_response():
+                            model_calls.finish()
                             parts = convert_genai_parts_to_a2a(
                                 event.content.parts if event.content and event.content.parts else []
                             )
                             logger.debug("Yielding final response: %s", parts)
-                            await task_updater.add_artifact(parts)
-                            await task_updater.complete()
-                            
-                            break
+                            await streamer.finish(parts)
+                            await complete_task(task_updater, usage)
+                            record_task_usage(usage)
+                            return TaskState.completed
                         if not event.get_function_calls():
                             logger.debug("Yielding update response")
                             await task_updater.update_status(
@@ -95,6 +116,7 @@ class SearchAgentExecutor(AgentExecutor):
                         Part(root=TextPart(text="The API call timed out. Please try again later."))
                     ]),
                 )
+                return TaskState.failed
         except Exception as e:
             logger.error(f"Error processing request: {e}")
             await task_updater.update_status(
@@ -103,6 +125,10 @@ class SearchAgentExecutor(AgentExecutor):
                     Part(root=TextPart(text=f"An error occurred: {str(e)}"))
                 ]),
             )
+            return TaskState.failed
+        finally:
+            current_task_usage.reset(usage_token)
+        return TaskState.working
 
     async def execute(
         self,
@@ -113,8 +139,10 @@ class SearchAgentExecutor(AgentExecutor):
             raise ValueError("RequestContext must have task_id and context_id")
         if not context.message:
             raise ValueError("RequestContext must have a message")
-        print("================================================\n")
-        print(f"context ==== {context}")
+        correlation_id.set(
+            (context.message.metadata or {}).get("correlation_id") or context.task_id
+        )
+        log_payload(logger, "Received request", context)
         task = context.current_task
         if not task:
             task = new_task(context.message)
@@ -133,15 +161,30 @@ class SearchAgentExecutor(AgentExecutor):
         except Exception as e:
             logger.error(f"Error starting work: {e}")
             
-        print("================================================\n")
-        print(f"updater ==== started working....")
-        await self._process_request(
-            types.UserContent(
-                parts=convert_a2a_parts_to_genai(context.message.parts),
-            ),
-            task.contextId,
-            updater,
-        )
+        logger.info("Started working on task %s", task.id)
+        started_at = time.perf_counter()
+        TASKS_IN_FLIGHT.inc()
+        state = TaskState.failed
+        try:
+            try:
+                parts = await convert_a2a_parts_to_genai_cached(
+                    context.message.parts, get_file_cache()
+                )
+            except Exception as e:
+                logger.error(f"Error converting message parts: {e}")
+                await updater.update_status(
+                    TaskState.failed,
+                    message=updater.new_agent_message([
+                        Part(root=TextPart(text=f"Could not read the attached files: {str(e)}"))
+                    ]),
+                )
+                return
+            state = await self._process_request(
+                types.UserContent(parts=parts), task.contextId, updater
+            )
+        finally:
+            TASKS_IN_FLIGHT.dec()
+            TASK_LATENCY.observe(time.perf_counter() - started_at, state=state.value)
 
     async def cancel(self, context: RequestContext, event_queue: EventQueue):
         raise ServerError(error=UnsupportedOperationError())
@@ -160,68 +203,3 @@ class SearchAgentExecutor(AgentExecutor):
             raise RuntimeError(f"Failed to get or create session: {session_id}")
         return session
 
-
-def convert_a2a_parts_to_genai(parts: list[Part]) -> list[types.Part]:
-    """Convert a list of A2A Part types into a list of Google Gen AI Part types."""
-    return [convert_a2a_part_to_genai(part) for part in parts]
-
-
-def convert_a2a_part_to_genai(part: Part) -> types.Part:
-    """Convert a single A2A Part type into a Google Gen AI Part type."""
-    root = part.root
-    if isinstance(root, TextPart):
-        return types.Part(text=root.text)
-    if isinstance(root, FilePart):
-        if isinstance(root.file, FileWithUri):
-            return types.Part(
-                file_data=types.FileData(
-                    file_uri=root.file.uri, mime_type=root.file.mimeType
-                )
-            )
-        if isinstance(root.file, FileWithBytes):
-            return types.Part(
-                inline_data=types.Blob(
-                    data=root.file.bytes.encode("utf-8"),
-                    mime_type=root.file.mimeType or "application/octet-stream",
-                )
-            )
-        raise ValueError(f"Unsupported file type: {type(root.file)}")
-    raise ValueError(f"Unsupported part type: {type(part)}")
-
-
-def convert_genai_parts_to_a2a(parts: list[types.Part]) -> list[Part]:
-    """Convert a list of Google Gen AI Part types into a list of A2A Part types."""
-    return [
-        convert_genai_part_to_a2a(part)
-        for part in parts
-        if (part.text or part.file_data or part.inline_data)
-    ]
-
-
-def convert_genai_part_to_a2a(part: types.Part) -> Part:
-    """Convert a single Google Gen AI Part type into an A2A Part type."""
-    if part.text:
-        return Part(root=TextPart(text=part.text))
-    if part.file_data:
-        if not part.file_data.file_uri:
-            raise ValueError("File URI is missing")
-        return Part(
-            root=FilePart(
-                file=FileWithUri(
-                    uri=part.file_data.file_uri,
-                    mimeType=part.file_data.mime_type,
-                )
-            )
-        )
-    if part.inline_data:
-        if not part.inline_data.data:
-            raise ValueError("Inline data is missing")
-        return Part(
-            root=FilePart(
-                file=FileWithBytes(
-                    bytes=part.inline_data.data.decode("utf-8"),
-                    mimeType=part.inline_data.mime_type,
-                )
-            )
-        )
-    raise ValueError(f"Unsupported part type: {part}")
@@ -0,0 +1,206 @@
+"""Memory-mapped BM25 inverted index over curated travel documents.
+
+The index is built offline (see `build_search_index.py`) into a single binary
+file and opened with `mmap`, so loading it costs a few system calls no matter
+how large it is: the term dictionary, postings and documents are read
+directly from the mapped pages through `memoryview` casts, and only the
+postings of the query terms are touched at search time.
+
+File layout (arrays in little-endian byte order, sections 8-byte aligned)::
+
+    header          magic, version, counts, BM25 parameters, section offsets
+    term_offsets    uint64[n_terms + 1]   offsets into term_blob (sorted terms)
+    term_blob       UTF-8 term bytes
+    term_postings   uint64[n_terms + 1]   offsets into postings, in pairs
+    postings        uint32[2 * n_postings] (doc id, term frequency) pairs
+    doc_lengths     uint32[n_docs]        tokens per document
+    doc_offsets     uint64[n_docs + 1]    offsets into doc_blob
+    doc_blob        one JSON object per document
+"""
+
+import heapq
+import json
+import math
+import mmap
+import os
+import re
+import struct
+import sys
+from array import array
+from collections import Counter
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+LOCAL_SEARCH_INDEX = os.getenv(
+    "LOCAL_SEARCH_INDEX", os.path.join(os.path.dirname(os.path.abspath(__file__)), "knowledge.idx")
+)
+
+MAGIC = b"BM25IDX\x00"
+VERSION = 1
+# magic, version, n_docs, n_terms, k1, b, avgdl, then 7 section offsets.
+_HEADER = struct.Struct("<8sIII3d7Q")
+
+_TOKEN = re.compile(r"\w+")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the "
+    "this to was were will with what when where which who how do does i my me".split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    """Lower-cased word tokens without stopwords, as used for indexing and queries."""
+    return [token for token in _TOKEN.findall(text.lower()) if token not in STOPWORDS]
+
+
+@dataclass
+class Hit:
+    doc_id: int
+    score: float
+    document: dict
+    # The score relative to a document of average length that contains every
+    # query term once: about 1 when the whole query matches, lower for partial
+    # matches, comparable across queries and indexes.
+    relevance: float = 0.0
+
+
+def _aligned(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def build_index(
+    documents: Iterable[dict], path: str, k1: float = 1.2, b: float = 0.75
+) -> int:
+    """Writes the index for `documents` (dicts with at least `text`) to `path`.
+
+    Returns the number of indexed documents.
+    """
+    postings: dict[str, list[tuple[int, int]]] = {}
+    doc_lengths = array("I")
+    doc_blobs: list[bytes] = []
+    for doc_id, document in enumerate(documents):
+        tokens = tokenize(f"{document.get('title', '')} {document['text']}")
+        doc_lengths.append(len(tokens))
+        doc_blobs.append(json.dumps(document, ensure_ascii=False).encode("utf-8"))
+        for term, tf in Counter(tokens).items():
+            postings.setdefault(term, []).append((doc_id, tf))
+
+    terms = sorted(postings, key=lambda term: term.encode("utf-8"))
+    term_offsets, term_blob = array("Q", [0]), bytearray()
+    term_postings, posting_pairs = array("Q", [0]), array("I")
+    for term in terms:
+        term_blob += term.encode("utf-8")
+        term_offsets.append(len(term_blob))
+        for doc_id, tf in postings[term]:
+            posting_pairs.extend((doc_id, tf))
+        term_postings.append(len(posting_pairs) // 2)
+    doc_offsets = array("Q", [0])
+    for blob in doc_blobs:
+        doc_offsets.append(doc_offsets[-1] + len(blob))
+
+    sections = [
+        term_offsets, bytes(term_blob), term_postings, posting_pairs,
+        doc_lengths, doc_offsets, b"".join(doc_blobs),
+    ]
+    if sys.byteorder != "little":
+        for section in sections:
+            if isinstance(section, array):
+                section.byteswap()
+    offsets, position = [], _HEADER.size
+    for section in sections:
+        position = _aligned(position)
+        offsets.append(position)
+        position += len(section) * getattr(section, "itemsize", 1)
+
+    n_docs = len(doc_lengths)
+    avgdl = sum(doc_lengths) / n_docs if n_docs else 0.0
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, n_docs, len(terms), k1, b, avgdl, *offsets))
+        for offset, section in zip(offsets, sections):
+            f.write(b"\0" * (offset - f.tell()))
+            f.write(section.tobytes() if isinstance(section, array) else section)
+    return n_docs
+
+
+class BM25Index:
+    """Read-only view of an index file mapped into memory."""
+
+    def __init__(self, path: str):
+        if sys.byteorder != "little":
+            raise ValueError("The memory-mapped BM25 index requires a little-endian host")
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (
+            magic, version, self.n_docs, self.n_terms, self.k1, self.b, self.avgdl,
+            *offsets,
+        ) = _HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != VERSION:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a version {VERSION} BM25 index")
+        view = memoryview(self._mmap)
+
+        def section(index: int, fmt: str, count: int) -> memoryview:
+            start = offsets[index]
+            size = struct.calcsize(fmt)
+            return view[start:start + count * size].cast(fmt) if count else view[0:0]
+
+        self._term_offsets = section(0, "Q", self.n_terms + 1)
+        self._term_blob = view[offsets[1]:offsets[1] + self._term_offsets[-1]]
+        self._term_postings = section(2, "Q", self.n_terms + 1)
+        self._postings = section(3, "I", 2 * self._term_postings[-1])
+        self._doc_lengths = section(4, "I", self.n_docs)
+        self._doc_offsets = section(5, "Q", self.n_docs + 1)
+        self._doc_blob = view[offsets[6]:]
+        self._views = [
+            self._term_offsets, self._term_blob, self._term_postings, self._postings,
+            self._doc_lengths, self._doc_offsets, self._doc_blob, view,
+        ]
+
+    def _term(self, index: int) -> bytes:
+        return self._term_blob[self._term_offsets[index]:self._term_offsets[index + 1]].tobytes()
+
+    def _find(self, term: str) -> Optional[int]:
+        """Binary search over the sorted term dictionary."""
+        key = term.encode("utf-8")
+        low, high = 0, self.n_terms
+        while low < high:
+            middle = (low + high) // 2
+            if self._term(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low if low < self.n_terms and self._term(low) == key else None
+
+    def document(self, doc_id: int) -> dict:
+        start, end = self._doc_offsets[doc_id], self._doc_offsets[doc_id + 1]
+        return json.loads(self._doc_blob[start:end].tobytes())
+
+    def search(self, query: str, top_k: int = 5) -> list[Hit]:
+        """Returns the `top_k` documents by BM25 score for `query`."""
+        scores: dict[int, float] = {}
+        k1, b, avgdl = self.k1, self.b, self.avgdl or 1.0
+        # Terms missing from the index count as rare terms nobody matched.
+        query_weight = 0.0
+        for term in set(tokenize(query)):
+            index = self._find(term)
+            start, end = (
+                (self._term_postings[index], self._term_postings[index + 1])
+                if index is not None
+                else (0, 0)
+            )
+            df = end - start
+            idf = math.log(1 + (self.n_docs - df + 0.5) / (df + 0.5))
+            query_weight += idf
+            for position in range(2 * start, 2 * end, 2):
+                doc_id, tf = self._postings[position], self._postings[position + 1]
+                norm = k1 * (1 - b + b * self._doc_lengths[doc_id] / avgdl)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (k1 + 1) / (tf + norm)
+        best = heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
+        return [
+            Hit(doc_id, score, self.document(doc_id), score / query_weight)
+            for doc_id, score in best
+        ]
+
+    def close(self) -> None:
+        for view in self._views:
+            view.release()
+        self._mmap.close()
@@ -0,0 +1,102 @@
+"""Builds the local BM25 knowledge index used by the Search Agent.
+
+Input documents are curated, slow-changing travel knowledge (destination
+overviews, entry rules, transit basics, ...). Each input is one of:
+
+- a `.jsonl` file with one `{"title", "text", "url"?, "category"?}` object per line,
+- a `.json` file holding a list of such objects,
+- a `.md` or `.txt` file (its first heading or file name is used as the title),
+- a directory, searched recursively for the above.
+
+Documents are split into passages of about `--passage-chars` characters so
+search results quote the relevant part of a long document.
+
+Usage:
+    python build_search_index.py docs/ [more inputs...] [--output knowledge.idx]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Iterator
+
+from bm25_index import LOCAL_SEARCH_INDEX, build_index
+
+SUPPORTED_EXTENSIONS = (".jsonl", ".json", ".md", ".txt")
+
+
+def _read_documents(path: str) -> Iterator[dict]:
+    if path.endswith(".jsonl"):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    elif path.endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            yield from json.load(f)
+    else:
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+        first_line = text.lstrip().split("\n", 1)[0]
+        title = (
+            first_line.lstrip("#").strip()
+            if first_line.startswith("#")
+            else os.path.splitext(os.path.basename(path))[0].replace("_", " ")
+        )
+        yield {"title": title, "text": text}
+
+
+def iter_documents(inputs: list[str]) -> Iterator[dict]:
+    for path in inputs:
+        if os.path.isdir(path):
+            for directory, _, files in sorted(os.walk(path)):
+                for name in sorted(files):
+                    if name.endswith(SUPPORTED_EXTENSIONS):
+                        yield from _read_documents(os.path.join(directory, name))
+        else:
+            yield from _read_documents(path)
+
+
+def split_passages(document: dict, passage_chars: int) -> Iterator[dict]:
+    """Splits a document on paragraph boundaries into passages of bounded size."""
+    passage = ""
+    for paragraph in document["text"].split("\n\n"):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if passage and len(passage) + len(paragraph) > passage_chars:
+            yield {**document, "text": passage}
+            passage = ""
+        passage = f"{passage}\n\n{paragraph}" if passage else paragraph
+    if passage:
+        yield {**document, "text": passage}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("inputs", nargs="+", help="Document files or directories")
+    parser.add_argument("--output", default=LOCAL_SEARCH_INDEX)
+    parser.add_argument("--passage-chars", type=int, default=1200)
+    args = parser.parse_args()
+
+    started_at = time.perf_counter()
+    passages = (
+        passage
+        for document in iter_documents(args.inputs)
+        for passage in split_passages(document, args.passage_chars)
+    )
+    tmp_path = f"{args.output}.tmp"
+    count = build_index(passages, tmp_path)
+    os.replace(tmp_path, args.output)
+    print(
+        f"Indexed {count} passages into {args.output} "
+        f"({os.path.getsize(args.output) / 2**20:.1f} MB) "
+        f"in {time.perf_counter() - started_at:.1f}s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,354 @@
+"""Lightweight Prometheus-compatible metrics for the agent server.
+
+The A2A server runs every request on a single asyncio event loop, so the
+collectors below are plain Python objects that are updated without locks.
+Anything expensive (for example counting sessions) is computed lazily at
+scrape time instead of on the request path.
+"""
+
+import time
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Callable, Iterable, Optional
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+COMPLEXITY_BUCKETS = (0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0)
+TOKEN_BUCKETS = (100, 500, 1_000, 2_500, 5_000, 10_000, 25_000, 50_000, 100_000, 250_000)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labelnames: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: dict) -> tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def _samples(self) -> list[str]:
+        raise NotImplementedError
+
+    def collect(self) -> list[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+            *self._samples(),
+        ]
+
+
+class Counter(_Metric):
+    """A monotonically increasing counter."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _samples(self) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in list(self._values.items())
+        ]
+
+
+class Gauge(_Metric):
+    """A value that can go up and down, or be computed at scrape time."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+        self._function: Callable[[], float] | None = None
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels) -> None:
+        self._values[self._key(labels)] = value
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Compute the (unlabelled) value by calling `function` on every scrape."""
+        self._function = function
+
+    def _samples(self) -> list[str]:
+        if self._function is not None:
+            try:
+                return [f"{self.name} {_format_value(self._function())}"]
+            except Exception:
+                return []
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in list(self._values.items())
+        ]
+
+
+class Histogram(_Metric):
+    """A cumulative histogram with fixed upper bounds."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [bucket counts..., +Inf count], sum
+        self._counts: dict[tuple[str, ...], list[int]] = {}
+        self._sums: dict[tuple[str, ...], float] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        counts = self._counts.get(key)
+        if counts is None:
+            counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+            self._sums[key] = 0.0
+        # Only the matching bucket is incremented; cumulative counts are
+        # built when rendering so the hot path stays O(log n).
+        counts[bisect_left(self.buckets, value)] += 1
+        self._sums[key] += value
+
+    def _samples(self) -> list[str]:
+        lines = []
+        for key, counts in list(self._counts.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}"
+                )
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(self._sums[key])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Registry:
+    """Holds the metrics exposed on `/metrics`."""
+
+    def __init__(self):
+        self._metrics: list[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.collect())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+HTTP_REQUESTS = REGISTRY.register(
+    Counter("a2a_http_requests_total", "HTTP requests received.", ["method"])
+)
+TASK_LATENCY = REGISTRY.register(
+    Histogram("a2a_task_duration_seconds", "Task latency by terminal state.", ["state"])
+)
+TASKS_IN_FLIGHT = REGISTRY.register(
+    Gauge("a2a_tasks_in_flight", "Tasks currently being executed.")
+)
+TIME_TO_FIRST_CHUNK = REGISTRY.register(
+    Histogram(
+        "a2a_time_to_first_chunk_seconds",
+        "Time from the start of an agent run to its first streamed output chunk.",
+    )
+)
+LLM_LATENCY = REGISTRY.register(
+    Histogram("a2a_llm_call_duration_seconds", "Latency of LLM calls.")
+)
+LLM_TOKENS = REGISTRY.register(
+    Counter("a2a_llm_tokens_total", "Tokens reported by the model.", ["kind"])
+)
+TASK_TOKENS = REGISTRY.register(
+    Histogram(
+        "a2a_task_tokens",
+        "Tokens consumed per task, including delegated tasks.",
+        ["kind"],
+        buckets=TOKEN_BUCKETS,
+    )
+)
+TASK_COST = REGISTRY.register(
+    Counter("a2a_task_estimated_cost_usd_total", "Estimated model cost of completed tasks.")
+)
+TOOL_CALLS = REGISTRY.register(
+    Counter("a2a_tool_calls_total", "Tool calls requested by the model.", ["tool"])
+)
+SEARCH_QUERIES = REGISTRY.register(
+    Counter("a2a_search_queries_total", "Search sub-queries executed.", ["category"])
+)
+SEARCH_CACHE_LOOKUPS = REGISTRY.register(
+    Counter(
+        "a2a_search_cache_lookups_total",
+        "Search cache lookups by category and result (hit or miss).",
+        ["category", "result"],
+    )
+)
+SEARCH_PROVIDER_RESULTS = REGISTRY.register(
+    Counter(
+        "a2a_search_provider_results_total",
+        "Search sub-queries answered, by provider and category.",
+        ["provider", "category"],
+    )
+)
+MODEL_ROUTES = REGISTRY.register(
+    Counter("a2a_model_routes_total", "Model calls by routed tier (fast or strong).", ["route"])
+)
+MODEL_CALL_LATENCY = REGISTRY.register(
+    Histogram("a2a_model_call_duration_seconds", "Latency of model calls by routed tier.", ["route"])
+)
+REQUEST_COMPLEXITY = REGISTRY.register(
+    Histogram(
+        "a2a_request_complexity",
+        "Complexity scores assigned by the model router.",
+        ["route"],
+        buckets=COMPLEXITY_BUCKETS,
+    )
+)
+SESSIONS = REGISTRY.register(
+    Gauge("a2a_sessions", "Sessions held by the session service.")
+)
+
+
+def count_sessions(session_service) -> int:
+    """Count the sessions held by an in-memory ADK session service."""
+    sessions = getattr(session_service, "sessions", None)
+    if not isinstance(sessions, dict):
+        return 0
+    return sum(
+        len(user_sessions)
+        for app_sessions in sessions.values()
+        for user_sessions in app_sessions.values()
+    )
+
+
+def observe_llm_usage(usage) -> None:
+    """Record the token counts of a model response."""
+    if usage is not None:
+        LLM_TOKENS.inc(usage.prompt_token_count or 0, kind="prompt")
+        LLM_TOKENS.inc(usage.candidates_token_count or 0, kind="candidates")
+        LLM_TOKENS.inc(usage.cached_content_token_count or 0, kind="cached")
+
+
+@dataclass
+class CallUsage:
+    """Token counts of one model call, named like Gen AI usage metadata."""
+
+    prompt_token_count: int = 0
+    candidates_token_count: int = 0
+    cached_content_token_count: int = 0
+
+    def merge(self, usage_metadata) -> None:
+        # Streamed chunks report running totals, so the largest count is the call's.
+        for name in ("prompt_token_count", "candidates_token_count", "cached_content_token_count"):
+            setattr(self, name, max(getattr(self, name), getattr(usage_metadata, name, None) or 0))
+
+
+class ModelCallObserver:
+    """Records LLM latency, token and tool-call metrics for the ADK events of one run.
+
+    With SSE streaming a model call yields partial chunks, then an aggregated
+    event and, when text is followed by a function call, another complete event
+    carrying the same usage. Events are therefore grouped into model calls: a
+    call ends when tool results arrive, when the next call starts streaming or
+    when the run finishes. Its latency runs from its start to its first
+    complete event, and its usage (the largest counts seen on any of its
+    events) is recorded once and passed to `on_usage`.
+    """
+
+    def __init__(self, on_usage: Optional[Callable[[CallUsage], None]] = None):
+        self._on_usage = on_usage
+        self._call_started_at = self._last_event_at = time.perf_counter()
+        self._call_usage: Optional[CallUsage] = None
+        self._call_completed = False
+
+    def observe(self, event) -> None:
+        now = time.perf_counter()
+        if event.get_function_responses():
+            # Tools ran; the next model call starts now.
+            self._end_call()
+            self._call_started_at = now
+        elif event.author != "user":
+            if event.partial and self._call_completed:
+                # The next call started streaming without tool calls in between.
+                self._end_call()
+                self._call_started_at = self._last_event_at
+            if event.usage_metadata is not None:
+                self._call_usage = self._call_usage or CallUsage()
+                self._call_usage.merge(event.usage_metadata)
+            if not event.partial and event.content is not None and not self._call_completed:
+                LLM_LATENCY.observe(now - self._call_started_at)
+                self._call_completed = True
+        for call in event.get_function_calls():
+            TOOL_CALLS.inc(tool=call.name)
+        self._last_event_at = now
+
+    def finish(self) -> None:
+        """Records the last model call of the run; safe to call more than once."""
+        self._end_call()
+
+    def _end_call(self) -> None:
+        if self._call_usage is not None:
+            observe_llm_usage(self._call_usage)
+            if self._on_usage is not None:
+                self._on_usage(self._call_usage)
+        self._call_usage = None
+        self._call_completed = False
+
+
+class RequestCounterMiddleware:
+    """ASGI middleware counting incoming HTTP requests."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            HTTP_REQUESTS.inc(method=scope["method"])
+        await self.app(scope, receive, send)
+
+
+async def metrics_endpoint(request: Request) -> Response:
+    """Starlette endpoint rendering the registry in the Prometheus text format."""
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,142 @@
+"""Per-agent model tiers and complexity-based model routing.
+
+Each agent has a strong model (`SEARCH_AGENT_MODEL`) and a fast model
+(`SEARCH_AGENT_FAST_MODEL`). Before every model call a lightweight classifier
+scores the complexity of the latest user message from local features (length,
+number of places and days mentioned, planning keywords, attachments); requests
+scoring below `MODEL_ROUTING_THRESHOLD` go to the fast model. Requests that
+carry built-in Gemini tools such as `google_search` always use the strong
+model, since the fast tier does not support them. The route, the score and
+the call latency are exported as metrics and logged, so the threshold can be
+tuned from data.
+"""
+
+import logging
+import os
+import re
+import time
+from collections import OrderedDict
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+
+from metrics import MODEL_CALL_LATENCY, MODEL_ROUTES, REQUEST_COMPLEXITY
+
+logger = logging.getLogger(__name__)
+
+STRONG_MODEL = os.getenv("SEARCH_AGENT_MODEL", "gemini-2.0-flash-001")
+FAST_MODEL = os.getenv("SEARCH_AGENT_FAST_MODEL", "gemini-2.0-flash-lite")
+MODEL_ROUTING_ENABLED = os.getenv("MODEL_ROUTING_ENABLED", "true").lower() == "true"
+MODEL_ROUTING_THRESHOLD = float(os.getenv("MODEL_ROUTING_THRESHOLD", "0.35"))
+# Model calls whose start is remembered. A call that raises never reaches
+# after_model, so the oldest entries are dropped beyond this.
+MAX_TRACKED_CALLS = 1024
+
+COMPLEX_KEYWORDS = (
+    "itinerary", "plan", "compare", "budget", "route", "multi", "each day", "day-by-day",
+    "schedule", "optimi", "visa", "flights", "hotels", "cities", "countries", "options",
+)
+_PLACE = re.compile(r"(?<![.!?]\s)(?<!^)\b[A-Z][a-z]{2,}(?:\s+[A-Z][a-z]{2,})*")
+_DAYS = re.compile(r"\b(\d{1,2})[\s-]*(?:day|night)s?\b", re.IGNORECASE)
+
+
+def classify_complexity(text: str, has_attachments: bool = False) -> float:
+    """Complexity score in [0, 1] of a request; higher needs the stronger model."""
+    lower = text.lower()
+    words = len(text.split())
+    places = len(set(_PLACE.findall(text)))
+    days = max((int(match) for match in _DAYS.findall(text)), default=0)
+    keywords = sum(keyword in lower for keyword in COMPLEX_KEYWORDS)
+    score = (
+        0.3 * min(words / 150, 1.0)
+        + 0.2 * min(places / 3, 1.0)
+        + 0.3 * min(keywords / 3, 1.0)
+        + 0.1 * min(days / 7, 1.0)
+        + 0.1 * has_attachments
+    )
+    return round(min(score, 1.0), 3)
+
+
+# Tools executed by the Gemini API itself rather than by the agent.
+BUILTIN_TOOL_FIELDS = (
+    "google_search", "google_search_retrieval", "retrieval", "code_execution",
+    "url_context", "enterprise_web_search", "google_maps",
+)
+
+
+def uses_builtin_tools(llm_request: LlmRequest) -> bool:
+    """Whether the request carries a built-in tool such as Google Search grounding."""
+    tools = (llm_request.config.tools if llm_request.config else None) or []
+    return any(
+        getattr(tool, field, None) is not None for tool in tools for field in BUILTIN_TOOL_FIELDS
+    )
+
+
+def _latest_user_message(llm_request: LlmRequest) -> tuple[str, bool]:
+    for content in reversed(llm_request.contents or []):
+        if content.role != "user" or not content.parts:
+            continue
+        # Function responses are sent with the user role; skip them.
+        if any(part.function_response for part in content.parts):
+            continue
+        text = " ".join(part.text for part in content.parts if part.text)
+        attachments = any(part.inline_data or part.file_data for part in content.parts)
+        return text, attachments
+    return "", False
+
+
+class ModelRouter:
+    """ADK model callbacks that pick the model tier for each call."""
+
+    def __init__(
+        self,
+        strong_model: str = STRONG_MODEL,
+        fast_model: str = FAST_MODEL,
+        threshold: float = MODEL_ROUTING_THRESHOLD,
+        enabled: bool = MODEL_ROUTING_ENABLED,
+    ):
+        self.strong_model = strong_model
+        self.fast_model = fast_model
+        self.threshold = threshold
+        self.enabled = enabled
+        # invocation id -> (route, started_at) of the model call in progress
+        self._calls: OrderedDict[str, tuple[str, float]] = OrderedDict()
+
+    def route(
+        self, text: str, has_attachments: bool = False, builtin_tools: bool = False
+    ) -> tuple[str, float]:
+        """Returns the route ("fast" or "strong") and the complexity score."""
+        score = classify_complexity(text, has_attachments)
+        if not self.enabled or self.fast_model == self.strong_model or builtin_tools:
+            return "strong", score
+        return ("fast" if score < self.threshold else "strong"), score
+
+    def before_model(
+        self, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> LlmResponse | None:
+        text, has_attachments = _latest_user_message(llm_request)
+        route, score = self.route(text, has_attachments, uses_builtin_tools(llm_request))
+        llm_request.model = self.fast_model if route == "fast" else self.strong_model
+        self._calls[callback_context.invocation_id] = (route, time.perf_counter())
+        self._calls.move_to_end(callback_context.invocation_id)
+        while len(self._calls) > MAX_TRACKED_CALLS:
+            self._calls.popitem(last=False)
+        MODEL_ROUTES.inc(route=route)
+        REQUEST_COMPLEXITY.observe(score, route=route)
+        logger.info(
+            "Model route",
+            extra={"fields": {"route": route, "model": llm_request.model, "complexity": score}},
+        )
+        return None
+
+    def after_model(
+        self, callback_context: CallbackContext, llm_response: LlmResponse
+    ) -> LlmResponse | None:
+        # Streamed calls produce partial responses before the final one.
+        if llm_response.partial:
+            return None
+        call = self._calls.pop(callback_context.invocation_id, None)
+        if call is not None:
+            route, started_at = call
+            MODEL_CALL_LATENCY.observe(time.perf_counter() - started_at, route=route)
+        return None
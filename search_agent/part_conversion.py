@@ -0,0 +1,147 @@
+"""Conversion between A2A parts and Google Gen AI parts.
+
+A2A carries file contents as base64 text (`FileWithBytes.bytes`) while Gen AI
+blobs hold raw bytes, so file payloads are base64-decoded and encoded here.
+Payloads of any size are validated and decoded in a single pass straight from
+the string into one buffer, without intermediate ASCII or validation copies.
+Line-wrapped (MIME) base64 is accepted; its whitespace is removed first.
+
+`convert_a2a_parts_to_genai_cached` additionally resolves http(s) file URIs
+that the file cache is allowed to fetch (see `file_cache.py`) and inlines their
+contents, so files attached by URI again in later turns are served from disk
+instead of being re-downloaded. Other URIs are passed through unchanged.
+"""
+
+import binascii
+import logging
+import os
+import re
+
+from a2a.types import FilePart, FileWithBytes, FileWithUri, Part, TextPart
+from google.genai import types
+
+from file_cache import FileUriCache
+
+logger = logging.getLogger(__name__)
+
+# Largest cached URI download that is sent inline to the model.
+INLINE_URI_MAX_BYTES = int(os.getenv("INLINE_URI_MAX_BYTES", str(20 * 1024 * 1024)))
+_WHITESPACE = re.compile(r"\s+")
+
+
+def decode_file_bytes(data: str) -> bytes:
+    """Decode the base64 contents of an A2A file part."""
+    # Strict mode rejects the line breaks of wrapped base64; unwrapped payloads
+    # are not copied.
+    if _WHITESPACE.search(data):
+        data = _WHITESPACE.sub("", data)
+    try:
+        # a2b_base64 reads ASCII str buffers in place and allocates the result
+        # once; strict mode rejects characters outside the alphabet and bad padding.
+        return binascii.a2b_base64(data, strict_mode=True)
+    except (binascii.Error, ValueError) as e:
+        raise ValueError(f"Invalid base64 file contents: {e}") from e
+
+
+def encode_file_bytes(data: bytes) -> str:
+    """Encode raw file contents as base64 for an A2A file part."""
+    return binascii.b2a_base64(data, newline=False).decode("ascii")
+
+
+def convert_a2a_parts_to_genai(parts: list[Part]) -> list[types.Part]:
+    """Convert a list of A2A Part types into a list of Google Gen AI Part types."""
+    return [convert_a2a_part_to_genai(part) for part in parts]
+
+
+def convert_a2a_part_to_genai(part: Part) -> types.Part:
+    """Convert a single A2A Part type into a Google Gen AI Part type."""
+    root = part.root
+    if isinstance(root, TextPart):
+        return types.Part(text=root.text)
+    if isinstance(root, FilePart):
+        if isinstance(root.file, FileWithUri):
+            return types.Part(
+                file_data=types.FileData(
+                    file_uri=root.file.uri, mime_type=root.file.mimeType
+                )
+            )
+        if isinstance(root.file, FileWithBytes):
+            return types.Part(
+                inline_data=types.Blob(
+                    data=decode_file_bytes(root.file.bytes),
+                    mime_type=root.file.mimeType or "application/octet-stream",
+                )
+            )
+        raise ValueError(f"Unsupported file type: {type(root.file)}")
+    raise ValueError(f"Unsupported part type: {type(part)}")
+
+
+async def convert_a2a_parts_to_genai_cached(
+    parts: list[Part], file_cache: FileUriCache
+) -> list[types.Part]:
+    """Convert A2A parts, resolving http(s) file URIs through `file_cache`."""
+    return [await _convert_a2a_part_to_genai_cached(part, file_cache) for part in parts]
+
+
+async def _convert_a2a_part_to_genai_cached(
+    part: Part, file_cache: FileUriCache
+) -> types.Part:
+    root = part.root
+    if not (
+        isinstance(root, FilePart)
+        and isinstance(root.file, FileWithUri)
+        and file_cache.allows(root.file.uri)
+    ):
+        return convert_a2a_part_to_genai(part)
+    try:
+        entry = await file_cache.get(root.file.uri)
+        if entry.size <= INLINE_URI_MAX_BYTES:
+            return types.Part(
+                inline_data=types.Blob(
+                    data=await file_cache.read(entry),
+                    mime_type=root.file.mimeType
+                    or entry.mime_type
+                    or "application/octet-stream",
+                )
+            )
+    except Exception as e:
+        logger.warning(f"Could not fetch {root.file.uri}, passing the URI through: {e}")
+    return convert_a2a_part_to_genai(part)
+
+
+def convert_genai_parts_to_a2a(parts: list[types.Part]) -> list[Part]:
+    """Convert a list of Google Gen AI Part types into a list of A2A Part types."""
+    return [
+        convert_genai_part_to_a2a(part)
+        for part in parts
+        if (part.text or part.file_data or part.inline_data)
+    ]
+
+
+def convert_genai_part_to_a2a(part: types.Part) -> Part:
+    """Convert a single Google Gen AI Part type into an A2A Part type."""
+    if part.text:
+        return Part(root=TextPart(text=part.text))
+    if part.file_data:
+        if not part.file_data.file_uri:
+            raise ValueError("File URI is missing")
+        return Part(
+            root=FilePart(
+                file=FileWithUri(
+                    uri=part.file_data.file_uri,
+                    mimeType=part.file_data.mime_type,
+                )
+            )
+        )
+    if part.inline_data:
+        if not part.inline_data.data:
+            raise ValueError("Inline data is missing")
+        return Part(
+            root=FilePart(
+                file=FileWithBytes(
+                    bytes=encode_file_bytes(part.inline_data.data),
+                    mimeType=part.inline_data.mime_type,
+                )
+            )
+        )
+    raise ValueError(f"Unsupported part type: {part}")
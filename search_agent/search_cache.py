@@ -0,0 +1,284 @@
+"""Category-aware cache for search sub-query results.
+
+Some answers stay valid for weeks (visa rules, local customs) while others
+(prices, availability) go stale in minutes, so each entry expires after the
+TTL of its search category. Queries are normalized before lookup (case,
+whitespace, date formats and common location aliases), so equivalent
+requests from different users share an entry. The cache is an LRU bounded
+by `SEARCH_CACHE_MAX_ENTRIES` and is optionally persisted to
+`SEARCH_CACHE_FILE`: changes are written at most every
+`SEARCH_CACHE_SAVE_DELAY` seconds, off the event loop, by atomically
+replacing the file. Hits and misses are exported per category.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+from collections import OrderedDict
+from dataclasses import asdict
+from typing import Awaitable, Callable, Optional
+
+from metrics import SEARCH_CACHE_LOOKUPS
+from search_types import SearchResult, SubQuery
+
+logger = logging.getLogger(__name__)
+
+SEARCH_CACHE_MAX_ENTRIES = int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "2000"))
+SEARCH_CACHE_FILE = os.getenv("SEARCH_CACHE_FILE")
+SEARCH_CACHE_SAVE_DELAY = float(os.getenv("SEARCH_CACHE_SAVE_DELAY", "5"))
+
+# Seconds a result stays fresh, per search category. Each can be overridden
+# with SEARCH_CACHE_TTL_<CATEGORY>, and a TTL of 0 disables caching.
+_DEFAULT_TTLS = {
+    "flights": 10 * 60,
+    "accommodation": 15 * 60,
+    "transportation": 6 * 3600,
+    "weather": 3 * 3600,
+    "events": 24 * 3600,
+    "activities": 3 * 24 * 3600,
+    "dining": 3 * 24 * 3600,
+    "visa": 7 * 24 * 3600,
+    "culture": 30 * 24 * 3600,
+    "general": 3600,
+}
+CATEGORY_TTLS = {
+    category: float(os.getenv(f"SEARCH_CACHE_TTL_{category.upper()}", str(ttl)))
+    for category, ttl in _DEFAULT_TTLS.items()
+}
+DEFAULT_TTL = CATEGORY_TTLS["general"]
+
+LOCATION_ALIASES = {
+    "nyc": "new york",
+    "new york city": "new york",
+    "sf": "san francisco",
+    "dc": "washington",
+    "washington dc": "washington",
+    "uk": "united kingdom",
+    "great britain": "united kingdom",
+    "usa": "united states",
+    "u s a": "united states",
+    "uae": "united arab emirates",
+    "holland": "netherlands",
+    "bombay": "mumbai",
+    "peking": "beijing",
+    "saigon": "ho chi minh city",
+}
+_ALIAS_PATTERN = re.compile(
+    r"\b(" + "|".join(sorted(map(re.escape, LOCATION_ALIASES), key=len, reverse=True)) + r")\b"
+)
+
+_MONTHS = {
+    name: index
+    for index, names in enumerate(
+        (
+            ("jan", "january"), ("feb", "february"), ("mar", "march"), ("apr", "april"),
+            ("may",), ("jun", "june"), ("jul", "july"), ("aug", "august"),
+            ("sep", "sept", "september"), ("oct", "october"), ("nov", "november"),
+            ("dec", "december"),
+        ),
+        start=1,
+    )
+    for name in names
+}
+_MONTH = "(" + "|".join(sorted(_MONTHS, key=len, reverse=True)) + r")\b\.?"
+_DAY = r"(\d{1,2})(?:st|nd|rd|th)?"
+_YEAR = r"(?:,?\s*(\d{4}))?"
+_ISO_DATE = re.compile(r"\b(\d{4})[-/.](\d{1,2})[-/.](\d{1,2})\b")
+_DAY_MONTH = re.compile(rf"\b{_DAY}\s+(?:of\s+)?{_MONTH}{_YEAR}")
+_MONTH_DAY = re.compile(rf"\b{_MONTH}\s+{_DAY}\b{_YEAR}")
+
+
+def _format_date(year: Optional[str], month: int, day: str) -> str:
+    date = f"{month:02d}-{int(day):02d}"
+    return f"{year}-{date}" if year else date
+
+
+def normalize_query(query: str) -> str:
+    """Canonical form of a query used as the cache key."""
+    text = query.lower()
+    text = _ISO_DATE.sub(lambda m: _format_date(m[1], int(m[2]), m[3]), text)
+    text = _DAY_MONTH.sub(lambda m: _format_date(m[3], _MONTHS[m[2]], m[1]), text)
+    text = _MONTH_DAY.sub(lambda m: _format_date(m[3], _MONTHS[m[1]], m[2]), text)
+    text = re.sub(r"[^\w\s-]+", " ", text)
+    text = re.sub(r"\s+", " ", text).strip()
+    return _ALIAS_PATTERN.sub(lambda m: LOCATION_ALIASES[m[1]], text)
+
+
+class SearchCache:
+    """LRU cache of search results with per-category expiry."""
+
+    def __init__(
+        self,
+        max_entries: int = SEARCH_CACHE_MAX_ENTRIES,
+        path: Optional[str] = SEARCH_CACHE_FILE,
+        ttls: Optional[dict[str, float]] = None,
+        save_delay: float = SEARCH_CACHE_SAVE_DELAY,
+    ):
+        self.max_entries = max_entries
+        self.path = path
+        self.ttls = CATEGORY_TTLS if ttls is None else ttls
+        self.save_delay = save_delay
+        # key -> (expires_at, result)
+        self._entries: OrderedDict[str, tuple[float, SearchResult]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._dirty = False
+        self._save_task: Optional[asyncio.Task] = None
+        self._save_lock = asyncio.Lock()
+        self._hits: dict[str, int] = {}
+        self._misses: dict[str, int] = {}
+        if path:
+            self._load()
+
+    def ttl_for(self, category: str) -> float:
+        return self.ttls.get(category, DEFAULT_TTL)
+
+    @staticmethod
+    def key_for(subquery: SubQuery) -> str:
+        return f"{subquery.category}:{normalize_query(subquery.query)}"
+
+    def get(self, subquery: SubQuery) -> Optional[SearchResult]:
+        """Returns the fresh cached result for `subquery`, if any."""
+        key = self.key_for(subquery)
+        cached = self._entries.get(key)
+        if cached is not None and cached[0] > time.time():
+            self._entries.move_to_end(key)
+            self._record(subquery.category, hit=True)
+            return cached[1]
+        if cached is not None:
+            del self._entries[key]
+        self._record(subquery.category, hit=False)
+        return None
+
+    def put(self, result: SearchResult) -> None:
+        ttl = self.ttl_for(result.category)
+        if ttl <= 0 or result.error:
+            return
+        key = self.key_for(SubQuery(result.category, result.query))
+        self._entries[key] = (time.time() + ttl, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        if self.path:
+            self._schedule_save()
+
+    async def get_or_search(
+        self,
+        subquery: SubQuery,
+        search: Callable[[SubQuery], Awaitable[SearchResult]],
+    ) -> SearchResult:
+        """Returns the cached result or runs `search`, sharing concurrent misses."""
+        cached = self.get(subquery)
+        if cached is not None:
+            return cached
+        key = self.key_for(subquery)
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await search(subquery)
+            self.put(result)
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else is waiting.
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    def stats(self) -> dict[str, dict]:
+        """Hits, misses and hit rate per category."""
+        stats = {}
+        for category in sorted(set(self._hits) | set(self._misses)):
+            hits, misses = self._hits.get(category, 0), self._misses.get(category, 0)
+            stats[category] = {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": hits / (hits + misses),
+            }
+        return stats
+
+    def _record(self, category: str, hit: bool) -> None:
+        counts = self._hits if hit else self._misses
+        counts[category] = counts.get(category, 0) + 1
+        SEARCH_CACHE_LOOKUPS.inc(category=category, result="hit" if hit else "miss")
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                records = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        now = time.time()
+        for record in records:
+            if record["expires_at"] > now:
+                self._entries[record["key"]] = (
+                    record["expires_at"],
+                    SearchResult(**record["result"]),
+                )
+        logger.info("Loaded %d cached search results from %s", len(self._entries), self.path)
+
+    @staticmethod
+    def _records(entries: list[tuple[str, tuple[float, SearchResult]]]) -> list[dict]:
+        return [
+            {"key": key, "expires_at": expires_at, "result": asdict(result)}
+            for key, (expires_at, result) in entries
+        ]
+
+    def _schedule_save(self) -> None:
+        """Persists the cache soon, batching the changes made until then."""
+        self._dirty = True
+        if self._save_task is not None and not self._save_task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Outside the server there is no loop to write from.
+            self._dirty = False
+            self._save(list(self._entries.items()))
+            return
+        self._save_task = loop.create_task(self._save_later())
+
+    async def _save_later(self) -> None:
+        while self._dirty:
+            await asyncio.sleep(self.save_delay)
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Writes pending changes to `path` now."""
+        async with self._save_lock:
+            if not self._dirty:
+                return
+            self._dirty = False
+            # Results are never modified once cached, so a shallow copy is a snapshot.
+            await asyncio.to_thread(self._save, list(self._entries.items()))
+
+    def _save(self, entries: list[tuple[str, tuple[float, SearchResult]]]) -> None:
+        """Replaces the file atomically, so a crash never leaves a partial one."""
+        try:
+            with open(f"{self.path}.tmp", "w", encoding="utf-8") as f:
+                json.dump(self._records(entries), f)
+            os.replace(f"{self.path}.tmp", self.path)
+        except OSError as e:
+            logger.warning(f"Could not persist the search cache to {self.path}: {e}")
+
+
+_default_cache: Optional[SearchCache] = None
+
+
+def get_search_cache() -> SearchCache:
+    """Returns the process-wide search cache."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = SearchCache()
+    return _default_cache
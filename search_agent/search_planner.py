@@ -0,0 +1,277 @@
+"""Query decomposition and parallel search for the Search Agent.
+
+With the built-in `google_search` tool the model searches one query per LLM
+turn, so a request covering flights, hotels, weather and visas takes several
+sequential round-trips. `search_travel` instead extracts the destination,
+origin, dates and nationality from the request, builds one short sub-query per
+category it mentions from those fields, runs them concurrently against the search
+providers (at most `SEARCH_FANOUT_LIMIT` at a time, consulting the search
+cache first) and returns the merged, de-duplicated findings, leaving the
+agent a single synthesis turn.
+"""
+
+import asyncio
+import logging
+import os
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+from metrics import SEARCH_QUERIES
+from search_cache import get_search_cache
+from search_providers import get_search_provider
+from search_types import SearchResult, SubQuery
+
+logger = logging.getLogger(__name__)
+
+SEARCH_FANOUT_LIMIT = int(os.getenv("SEARCH_FANOUT_LIMIT", "4"))
+SEARCH_MAX_SUBQUERIES = int(os.getenv("SEARCH_MAX_SUBQUERIES", "6"))
+
+# Category -> (trigger keywords, sub-query template). Templates only use the
+# fields extracted from the request, so sub-queries stay short, match on the
+# category's topic and share cache entries across users.
+CATEGORIES: dict[str, tuple[tuple[str, ...], str]] = {
+    "flights": (
+        (
+            "flight", "flights", "fly", "flying", "airline", "airlines", "airfare", "airfares",
+            "airport", "airports", "plane", "planes",
+        ),
+        "flights{origin} to {destination}{dates}",
+    ),
+    "accommodation": (
+        (
+            "hotel", "hotels", "hostel", "hostels", "stay", "stays", "staying", "accommodation",
+            "accommodations", "lodging", "airbnb", "resort", "resorts", "rental", "rentals",
+        ),
+        "hotels in {destination}{dates}",
+    ),
+    "weather": (
+        (
+            "weather", "climate", "season", "seasons", "temperature", "temperatures", "rain",
+            "rainy", "best time",
+        ),
+        "{destination} weather{dates}",
+    ),
+    "visa": (
+        (
+            "visa", "visas", "passport", "passports", "entry requirement", "entry requirements",
+            "entry rule", "entry rules", "border", "borders", "customs",
+        ),
+        "{destination} visa and entry requirements{nationality}",
+    ),
+    "transportation": (
+        (
+            "train", "trains", "bus", "buses", "metro", "subway", "transport", "transportation",
+            "transit", "car rental", "car rentals", "transfer", "transfers", "taxi", "taxis",
+        ),
+        "{destination} public transportation",
+    ),
+    "activities": (
+        (
+            "things to do", "attraction", "attractions", "tour", "tours", "museum", "museums",
+            "activity", "activities", "sightseeing", "excursion", "excursions",
+        ),
+        "top attractions in {destination}",
+    ),
+    "dining": (
+        ("restaurant", "restaurants", "food", "dining", "cuisine", "eat", "eating"),
+        "best restaurants in {destination}",
+    ),
+    "culture": (
+        (
+            "culture", "cultural", "etiquette", "tipping", "language", "languages", "currency",
+            "local custom", "local customs",
+        ),
+        "{destination} culture and etiquette",
+    ),
+    "events": (
+        ("event", "events", "festival", "festivals", "concert", "concerts"),
+        "events in {destination}{dates}",
+    ),
+}
+
+GENERAL_CATEGORY = "general"
+GENERAL_TEMPLATE = "{destination} travel guide{dates}"
+
+# Keywords match whole words, so "tour" does not match "tourist" nor "eat" "weather".
+_CATEGORY_PATTERNS = {
+    category: re.compile(r"\b(?:" + "|".join(map(re.escape, keywords)) + r")\b")
+    for category, (keywords, _) in CATEGORIES.items()
+}
+
+_MONTH_NAMES = (
+    "January|February|March|April|June|July|August|September|October|November|December"
+    "|Jan|Feb|Mar|Apr|Jun|Jul|Aug|Sept|Sep|Oct|Nov|Dec"
+)
+# "may" is only a month when capitalized.
+_MONTH = rf"(?:(?i:{_MONTH_NAMES})\b\.?|May\b)"
+_DAY = r"\d{1,2}(?:st|nd|rd|th)?\b"
+_DATES = re.compile(
+    rf"\b(?:\d{{4}}-\d{{2}}-\d{{2}}(?:\s*(?:to|-|–)\s*\d{{4}}-\d{{2}}-\d{{2}})?"
+    rf"|(?:{_DAY}\s+(?:of\s+)?)?{_MONTH}(?:\s+{_DAY}(?:\s*(?:-|–|to)\s*{_DAY})?)?(?:,?\s+\d{{4}})?"
+    r"|(?i:christmas|new year'?s?|easter|spring|summer|autumn|fall|winter)(?:\s+\d{4})?)"
+)
+# Capitalized names, joined by connectors like "de", "and" or a comma
+# ("Rio de Janeiro", "Paris and Rome", "Tokyo, Japan").
+_NAME = r"[A-Z][\w'’.-]*"
+_PLACE = rf"{_NAME}(?:(?:,?\s+(?:de|del|da|di|do|la|le|of|and|&)\s+|,\s+|\s+){_NAME})*"
+_DESTINATION = re.compile(rf"\b(?i:to|in|at|around|across|visit|visiting|explore|exploring)\s+(?:the\s+)?({_PLACE})")
+# Weaker cues, used when none of the above matched ("an itinerary for Costa Rica").
+_DESTINATION_FALLBACK = re.compile(rf"\b(?i:for|of|about)\s+(?:the\s+)?({_PLACE})")
+# A lowercase place name ("hotels in tokyo") as a last resort.
+_DESTINATION_LOWERCASE = re.compile(r"\b(?:to|in|visit|visiting)\s+([a-z][a-z'-]{2,})\b")
+_ORIGIN = re.compile(rf"\b(?i:from|leaving|departing)\s+(?:the\s+)?({_PLACE})")
+_NATIONALITY = re.compile(rf"\b({_NAME})\s+(?i:citizens?|passports?|nationals?)\b")
+_NOT_PLACES = frozenset(
+    "I January February March April May June July August September October November December "
+    "Monday Tuesday Wednesday Thursday Friday Saturday Sunday Christmas Easter".split()
+)
+_CONNECTORS = frozenset({",", "and", "&", "of", "de", "del", "da", "di", "do", "la", "le"})
+_NOT_LOWERCASE_PLACES = frozenset(
+    "the a an my our your his her their this that these those which what where there here "
+    "see do go get find book plan make have be know stay eat travel visit fly spend take "
+    "january february march april may june july august september october november december "
+    "spring summer autumn fall winter order total advance person town city country".split()
+)
+
+
+@dataclass(frozen=True)
+class SearchFields:
+    """The parts of a travel request that sub-queries are built from."""
+
+    destination: Optional[str] = None
+    origin: Optional[str] = None
+    dates: Optional[str] = None
+    nationality: Optional[str] = None
+
+
+def _place(match: Optional[re.Match]) -> Optional[str]:
+    if match is None:
+        return None
+    words = match.group(1).replace(",", " ,").split()
+    # Drop trailing months or weekdays picked up by the name pattern ("Lisbon May").
+    while words and words[-1] in _NOT_PLACES | _CONNECTORS:
+        words.pop()
+    return " ".join(words).replace(" ,", ",").rstrip(".") or None
+
+
+def extract_search_fields(request: str) -> SearchFields:
+    """Pulls the destination, origin, dates and nationality out of a travel request."""
+    destination = next(
+        (place for place in map(_place, _DESTINATION.finditer(request)) if place), None
+    ) or next(
+        (place for place in map(_place, _DESTINATION_FALLBACK.finditer(request)) if place), None
+    ) or next(
+        (
+            match.group(1)
+            for match in _DESTINATION_LOWERCASE.finditer(request)
+            if match.group(1) not in _NOT_LOWERCASE_PLACES
+            and not any(pattern.match(match.group(1)) for pattern in _CATEGORY_PATTERNS.values())
+        ),
+        None,
+    )
+    origin = _place(_ORIGIN.search(request))
+    if origin == destination:
+        origin = None
+    dates = _DATES.search(request)
+    nationality = _NATIONALITY.search(request)
+    return SearchFields(
+        destination=destination,
+        origin=origin,
+        dates=dates.group(0).strip() if dates else None,
+        nationality=nationality.group(1) if nationality and nationality.group(1) not in _NOT_PLACES else None,
+    )
+
+
+def build_query(template: str, fields: SearchFields) -> str:
+    return template.format(
+        destination=fields.destination,
+        origin=f" from {fields.origin}" if fields.origin else "",
+        dates=f" {fields.dates}" if fields.dates else "",
+        nationality=f" for {fields.nationality} citizens" if fields.nationality else "",
+    )
+
+
+def decompose_request(request: str, max_subqueries: int = SEARCH_MAX_SUBQUERIES) -> list[SubQuery]:
+    """Splits a travel request into short, independent per-category sub-queries.
+
+    Requests without a recognizable destination are searched as they are.
+    """
+    fields = extract_search_fields(request)
+    if not fields.destination:
+        return [SubQuery(GENERAL_CATEGORY, request.strip())]
+    text = request.lower()
+    subqueries = [
+        SubQuery(category, build_query(template, fields))
+        for category, (_, template) in CATEGORIES.items()
+        if _CATEGORY_PATTERNS[category].search(text)
+    ]
+    return subqueries[:max_subqueries] or [
+        SubQuery(GENERAL_CATEGORY, build_query(GENERAL_TEMPLATE, fields))
+    ]
+
+
+async def run_search_plan(
+    subqueries: list[SubQuery], fanout_limit: int = SEARCH_FANOUT_LIMIT
+) -> list[SearchResult]:
+    """Executes the sub-queries concurrently, at most `fanout_limit` at a time."""
+    semaphore = asyncio.Semaphore(max(fanout_limit, 1))
+
+    async def run(subquery: SubQuery) -> SearchResult:
+        async with semaphore:
+            SEARCH_QUERIES.inc(category=subquery.category)
+            try:
+                return await get_search_cache().get_or_search(
+                    subquery, get_search_provider().search
+                )
+            except Exception as e:
+                logger.warning(f"Search for {subquery.category} failed: {e}")
+                return SearchResult(subquery.category, subquery.query, error=str(e))
+
+    return list(await asyncio.gather(*(run(subquery) for subquery in subqueries)))
+
+
+def _normalize(line: str) -> str:
+    return re.sub(r"\W+", " ", line).strip().lower()
+
+
+def merge_results(results: list[SearchResult]) -> dict:
+    """Merges the per-category results, dropping repeated lines and sources."""
+    seen_lines: set[str] = set()
+    seen_uris: set[str] = set()
+    merged = []
+    for result in results:
+        lines = []
+        for line in result.summary.splitlines():
+            key = _normalize(line)
+            if not key:
+                lines.append(line)
+            elif key not in seen_lines:
+                seen_lines.add(key)
+                lines.append(line)
+        sources = [source for source in result.sources if source["uri"] not in seen_uris]
+        seen_uris.update(source["uri"] for source in sources)
+        entry = {"category": result.category, "findings": "\n".join(lines).strip()}
+        if sources:
+            entry["sources"] = sources
+        if result.error:
+            entry["error"] = result.error
+        merged.append(entry)
+    return {"results": merged}
+
+
+async def search_travel(request: str) -> dict:
+    """Searches the web for everything a travel request needs in one call.
+
+    The request is split into categories (flights, accommodation, weather,
+    visas, ...) that are searched in parallel.
+
+    Args:
+        request: The full travel search request, including destination and dates.
+
+    Returns:
+        The findings and sources for each category.
+    """
+    subqueries = decompose_request(request)
+    logger.info("Searching %d categories: %s", len(subqueries), [q.category for q in subqueries])
+    return merge_results(await run_search_plan(subqueries))
@@ -0,0 +1,171 @@
+"""Search backends used by the search planner.
+
+A provider answers one sub-query or returns None when it has nothing
+confident to say, so providers can be chained: by default the local BM25
+knowledge index is consulted first for stable categories (entry rules,
+culture, transit basics, ...) and the live web search is used as the
+fallback. `SEARCH_PROVIDERS=local` gives a network-free backend for
+benchmarks and offline development.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Optional
+
+from google import genai
+from google.genai import types
+
+from bm25_index import LOCAL_SEARCH_INDEX, BM25Index
+from metrics import LLM_LATENCY, SEARCH_PROVIDER_RESULTS, observe_llm_usage
+from search_types import SearchResult, SubQuery
+from usage import current_task_usage
+
+logger = logging.getLogger(__name__)
+
+SEARCH_MODEL = os.getenv("SEARCH_MODEL", "gemini-2.0-flash-001")
+# Comma-separated provider chain, tried in order.
+SEARCH_PROVIDERS = os.getenv("SEARCH_PROVIDERS", "local,web")
+LOCAL_SEARCH_CATEGORIES = frozenset(
+    category.strip()
+    for category in os.getenv(
+        "LOCAL_SEARCH_CATEGORIES", "visa,culture,transportation,activities,general"
+    ).split(",")
+    if category.strip()
+)
+# Smallest `Hit.relevance` answered locally: the share of the query's
+# (IDF-weighted) terms a passage has to match.
+LOCAL_SEARCH_MIN_RELEVANCE = float(os.getenv("LOCAL_SEARCH_MIN_RELEVANCE", "0.75"))
+LOCAL_SEARCH_TOP_K = int(os.getenv("LOCAL_SEARCH_TOP_K", "3"))
+
+
+class SearchProvider:
+    """Answers search sub-queries."""
+
+    name = "provider"
+
+    async def search(self, subquery: SubQuery) -> Optional[SearchResult]:
+        """Returns the result for `subquery`, or None to defer to the next provider."""
+        raise NotImplementedError
+
+
+class WebSearchProvider(SearchProvider):
+    """Live web search through a Google Search grounded model call."""
+
+    name = "web"
+
+    def __init__(self, model: str = SEARCH_MODEL):
+        self.model = model
+        self._client: Optional[genai.Client] = None
+
+    async def search(self, subquery: SubQuery) -> SearchResult:
+        if self._client is None:
+            self._client = genai.Client()
+        started_at = time.perf_counter()
+        response = await self._client.aio.models.generate_content(
+            model=self.model,
+            contents=subquery.query,
+            config=types.GenerateContentConfig(
+                tools=[types.Tool(google_search=types.GoogleSearch())],
+            ),
+        )
+        LLM_LATENCY.observe(time.perf_counter() - started_at)
+        observe_llm_usage(response.usage_metadata)
+        task_usage = current_task_usage.get()
+        if task_usage is not None:
+            task_usage.add_usage_metadata(response.usage_metadata)
+        sources = []
+        candidate = response.candidates[0] if response.candidates else None
+        metadata = candidate.grounding_metadata if candidate else None
+        for chunk in (metadata.grounding_chunks if metadata else None) or []:
+            if chunk.web and chunk.web.uri:
+                sources.append({"title": chunk.web.title, "uri": chunk.web.uri})
+        return SearchResult(
+            subquery.category, subquery.query, summary=response.text or "", sources=sources
+        )
+
+
+class LocalIndexProvider(SearchProvider):
+    """Curated knowledge from the memory-mapped BM25 index."""
+
+    name = "local"
+
+    def __init__(
+        self,
+        index: BM25Index,
+        categories: frozenset[str] = LOCAL_SEARCH_CATEGORIES,
+        min_relevance: float = LOCAL_SEARCH_MIN_RELEVANCE,
+        top_k: int = LOCAL_SEARCH_TOP_K,
+    ):
+        self.index = index
+        self.categories = categories
+        self.min_relevance = min_relevance
+        self.top_k = top_k
+
+    async def search(self, subquery: SubQuery) -> Optional[SearchResult]:
+        # Prices and availability are never answered from the offline index.
+        if subquery.category not in self.categories:
+            return None
+        # Scoring walks the postings in Python, so keep it off the event loop.
+        hits = await asyncio.to_thread(self.index.search, subquery.query, self.top_k)
+        hits = [hit for hit in hits if hit.relevance >= self.min_relevance]
+        if not hits:
+            return None
+        sections, sources = [], []
+        for hit in hits:
+            title = hit.document.get("title", "")
+            sections.append(f"{title}\n{hit.document['text']}" if title else hit.document["text"])
+            sources.append(
+                {"title": title, "uri": hit.document.get("url") or f"local:{hit.doc_id}"}
+            )
+        return SearchResult(
+            subquery.category, subquery.query, summary="\n\n".join(sections), sources=sources
+        )
+
+
+class ChainedSearchProvider(SearchProvider):
+    """Tries each provider in turn and returns the first answer."""
+
+    name = "chain"
+
+    def __init__(self, providers: list[SearchProvider]):
+        self.providers = providers
+
+    async def search(self, subquery: SubQuery) -> SearchResult:
+        for provider in self.providers:
+            result = await provider.search(subquery)
+            if result is not None:
+                SEARCH_PROVIDER_RESULTS.inc(provider=provider.name, category=subquery.category)
+                return result
+        return SearchResult(
+            subquery.category, subquery.query, error="No search provider returned results"
+        )
+
+
+def create_search_provider(names: str = SEARCH_PROVIDERS) -> ChainedSearchProvider:
+    """Builds the provider chain listed in `names`, skipping unavailable providers."""
+    providers: list[SearchProvider] = []
+    for name in (name.strip() for name in names.split(",")):
+        if name == "web":
+            providers.append(WebSearchProvider())
+        elif name == "local":
+            try:
+                providers.append(LocalIndexProvider(BM25Index(LOCAL_SEARCH_INDEX)))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Local search index unavailable at {LOCAL_SEARCH_INDEX}: {e}")
+        elif name:
+            raise ValueError(f"Unknown search provider: {name}")
+    logger.info("Search providers: %s", [provider.name for provider in providers])
+    return ChainedSearchProvider(providers)
+
+
+_default_provider: Optional[ChainedSearchProvider] = None
+
+
+def get_search_provider() -> ChainedSearchProvider:
+    """Returns the process-wide search provider chain."""
+    global _default_provider
+    if _default_provider is None:
+        _default_provider = create_search_provider()
+    return _default_provider
@@ -0,0 +1,19 @@
+"""Data types shared by the search planner and the search cache."""
+
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+@dataclass
+class SubQuery:
+    category: str
+    query: str
+
+
+@dataclass
+class SearchResult:
+    category: str
+    query: str
+    summary: str = ""
+    sources: list[dict] = field(default_factory=list)
+    error: Optional[str] = None
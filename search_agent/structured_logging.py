@@ -0,0 +1,109 @@
+"""Structured, non-blocking logging for the agent server.
+
+Log records are handed to a queue on the request path and formatted as JSON
+lines and written to stdout by a background listener thread, so large
+payloads never block the event loop. Payload dumps are truncated and sampled,
+and every record carries the correlation ID of the request being handled.
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+from contextvars import ContextVar
+from datetime import datetime, timezone
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+# Maximum number of characters of a payload that are written to the log.
+LOG_PAYLOAD_MAX_CHARS = int(os.getenv("LOG_PAYLOAD_MAX_CHARS", "2000"))
+# Fraction of debug-level payload dumps that are actually emitted.
+LOG_PAYLOAD_SAMPLE_RATE = float(os.getenv("LOG_PAYLOAD_SAMPLE_RATE", "0.1"))
+
+correlation_id: ContextVar[str] = ContextVar("correlation_id", default="-")
+
+_listener: logging.handlers.QueueListener | None = None
+
+
+class _Payload:
+    """Defers rendering and truncating a payload until the record is written."""
+
+    __slots__ = ("value", "limit")
+
+    def __init__(self, value, limit: int):
+        self.value = value
+        self.limit = limit
+
+    def __str__(self) -> str:
+        text = self.value if isinstance(self.value, str) else repr(self.value)
+        if self.limit and len(text) > self.limit:
+            return f"{text[:self.limit]}... [truncated {len(text) - self.limit} chars]"
+        return text
+
+
+class CorrelationIdFilter(logging.Filter):
+    """Stamps records with the correlation ID of the current request."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.correlation_id = correlation_id.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as single-line JSON objects."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "correlation_id": getattr(record, "correlation_id", "-"),
+            "message": record.getMessage(),
+        }
+        fields = getattr(record, "fields", None)
+        if fields:
+            entry.update({key: str(value) if isinstance(value, _Payload) else value
+                          for key, value in fields.items()})
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """A QueueHandler that leaves formatting to the listener thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def configure_logging(level: str = LOG_LEVEL) -> None:
+    """Route the root logger through a queue to a background JSON writer."""
+    global _listener
+    if _listener is not None:
+        return
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(JsonFormatter())
+    queue_handler = _DeferredQueueHandler(log_queue)
+    queue_handler.addFilter(CorrelationIdFilter())
+
+    root = logging.getLogger()
+    root.handlers[:] = [queue_handler]
+    root.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+
+def log_payload(logger: logging.Logger, message: str, payload, **fields) -> None:
+    """Log a (potentially large) payload at debug level, sampled and truncated."""
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    if LOG_PAYLOAD_SAMPLE_RATE < 1.0 and random.random() >= LOG_PAYLOAD_SAMPLE_RATE:
+        return
+    fields["payload"] = _Payload(payload, LOG_PAYLOAD_MAX_CHARS)
+    logger.debug(message, extra={"fields": fields})
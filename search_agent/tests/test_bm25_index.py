@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+
+from bm25_index import BM25Index, build_index, tokenize
+from search_providers import LocalIndexProvider
+from search_types import SubQuery
+
+DOCUMENTS = [
+    {
+        "title": "Japan entry requirements",
+        "text": "US citizens can enter Japan visa-free for up to 90 days as tourists. A passport "
+        "valid for the stay is required, and entry requirements include a return ticket.",
+        "url": "https://example.com/japan-entry",
+    },
+    {
+        "title": "Thailand visa",
+        "text": "Many nationalities receive a 30 day visa exemption on arrival in Thailand. "
+        "Check the embassy for the current visa requirements.",
+    },
+    {
+        "title": "Tokyo public transportation",
+        "text": "Tokyo's metro and JR lines cover the city. Buy a Suica card for trains and buses. "
+        "Public transportation runs until about midnight.",
+    },
+    {
+        "title": "Japanese etiquette",
+        "text": "Bowing is a common greeting in Japan. Tipping is not customary. Remove shoes when "
+        "entering homes. Japanese culture values quiet on trains.",
+    },
+    *(
+        {"title": f"Note {n}", "text": "travelers note that planning ahead helps as local rules vary by season"}
+        for n in range(30)
+    ),
+]
+
+
+@pytest.fixture(scope="module")
+def index(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("index") / "knowledge.idx")
+    build_index(DOCUMENTS, path)
+    index = BM25Index(path)
+    yield index
+    index.close()
+
+
+def test_tokenize_drops_stopwords_and_case():
+    assert tokenize("What is the Visa policy for the UK?") == ["visa", "policy", "uk"]
+
+
+def test_index_metadata(index):
+    assert index.n_docs == len(DOCUMENTS)
+    assert index.document(2)["title"] == "Tokyo public transportation"
+
+
+def test_search_ranks_the_matching_document_first(index):
+    hits = index.search("Tokyo public transportation", top_k=3)
+    assert hits[0].document["title"] == "Tokyo public transportation"
+    assert [hit.score for hit in hits] == sorted((hit.score for hit in hits), reverse=True)
+    assert index.search("Tokyo", top_k=1)[0].doc_id == 2
+
+
+def test_unknown_terms_return_nothing(index):
+    assert index.search("zanzibar snorkeling") == []
+    assert index.search("the and of") == []
+
+
+@pytest.mark.parametrize(
+    "query",
+    ["Japan visa and entry requirements for US citizens", "Tokyo public transportation", "Japan culture and etiquette"],
+)
+def test_full_matches_are_relevant(index, query):
+    assert index.search(query, top_k=1)[0].relevance >= 0.75
+
+
+@pytest.mark.parametrize(
+    "query",
+    ["Vietnam visa and entry requirements for US citizens", "Osaka public transportation", "Lisbon visa and entry requirements"],
+)
+def test_other_destinations_are_not_relevant(index, query):
+    # Query terms the index does not know count as unmatched.
+    assert index.search(query, top_k=1)[0].relevance < 0.75
+
+
+def test_local_provider_answers_only_relevant_stable_categories(index):
+    provider = LocalIndexProvider(index, categories=frozenset({"visa", "transportation"}))
+
+    result = asyncio.run(provider.search(SubQuery("visa", "Japan visa and entry requirements for US citizens")))
+    assert result.summary.startswith("Japan entry requirements\n")
+    assert result.sources[0] == {"title": "Japan entry requirements", "uri": "https://example.com/japan-entry"}
+    assert asyncio.run(provider.search(SubQuery("visa", "Lisbon visa and entry requirements"))) is None
+    # Prices and availability always go to the web.
+    assert asyncio.run(provider.search(SubQuery("flights", "flights to Tokyo"))) is None
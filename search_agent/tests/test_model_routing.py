@@ -0,0 +1,56 @@
+import asyncio
+from types import SimpleNamespace
+
+from google.adk.models import LlmRequest, LlmResponse
+from google.adk.tools import google_search
+from google.genai import types
+
+from model_routing import MAX_TRACKED_CALLS, ModelRouter, uses_builtin_tools
+
+
+def request(text, model="gemini-2.0-flash-001"):
+    return LlmRequest(
+        model=model,
+        contents=[types.Content(role="user", parts=[types.Part(text=text)])],
+        config=types.GenerateContentConfig(),
+    )
+
+
+def route(router, llm_request):
+    router.before_model(SimpleNamespace(invocation_id="i"), llm_request)
+    return llm_request.model
+
+
+def test_simple_requests_use_the_fast_model():
+    router = ModelRouter(strong_model="strong", fast_model="fast", threshold=0.35, enabled=True)
+    assert route(router, request("Weather in Rome?")) == "fast"
+
+
+def test_requests_with_google_search_keep_the_strong_model():
+    router = ModelRouter(strong_model="strong", fast_model="fast", threshold=0.35, enabled=True)
+    llm_request = request("Weather in Rome?")
+    # The tool adds itself to the request the way ADK does before the model callbacks run.
+    asyncio.run(google_search.process_llm_request(tool_context=None, llm_request=llm_request))
+    assert uses_builtin_tools(llm_request)
+    assert route(router, llm_request) == "strong"
+
+
+def test_function_tools_are_not_builtin():
+    llm_request = request("Weather in Rome?")
+    llm_request.config.tools = [
+        types.Tool(function_declarations=[types.FunctionDeclaration(name="search_travel")])
+    ]
+    assert not uses_builtin_tools(llm_request)
+
+
+def test_calls_that_never_finish_are_not_kept_forever():
+    router = ModelRouter(strong_model="strong", fast_model="fast", threshold=0.35, enabled=True)
+    for number in range(MAX_TRACKED_CALLS + 10):
+        # A call that raises never reaches after_model.
+        router.before_model(SimpleNamespace(invocation_id=f"i{number}"), request("Weather in Rome?"))
+    assert len(router._calls) == MAX_TRACKED_CALLS
+    assert "i0" not in router._calls
+
+    last = SimpleNamespace(invocation_id=f"i{MAX_TRACKED_CALLS + 9}")
+    router.after_model(last, LlmResponse())
+    assert last.invocation_id not in router._calls
@@ -0,0 +1,70 @@
+import asyncio
+import json
+
+import pytest
+
+from search_cache import SearchCache, normalize_query
+from search_types import SearchResult, SubQuery
+
+
+@pytest.mark.parametrize(
+    "query, normalized",
+    [
+        ("  Hotels in   TOKYO ", "hotels in tokyo"),
+        ("Flights NYC to Paris", "flights new york to paris"),
+        ("flights new york city to paris", "flights new york to paris"),
+        ("weather in Saigon, USA?", "weather in ho chi minh city united states"),
+        ("hotels May 3rd 2025", "hotels 2025-05-03"),
+        ("hotels 3 May, 2025", "hotels 2025-05-03"),
+        ("hotels 2025/5/3", "hotels 2025-05-03"),
+        ("hotels on the 3rd of May", "hotels on the 05-03"),
+        ("events Sept. 14", "events 09-14"),
+        # Words that only contain an alias or a month are left alone.
+        ("snyc sfo decor", "snyc sfo decor"),
+        ("may I bring a dog", "may i bring a dog"),
+    ],
+)
+def test_normalize_query(query, normalized):
+    assert normalize_query(query) == normalized
+
+
+def result(query, category="visa"):
+    return SearchResult(category, query, summary=f"About {query}")
+
+
+def test_equivalent_queries_share_an_entry():
+    cache = SearchCache(path=None)
+    cache.put(result("Japan visa for USA citizens"))
+    assert cache.get(SubQuery("visa", "japan visa for  United States citizens")) is not None
+    assert cache.get(SubQuery("culture", "Japan visa for USA citizens")) is None
+
+
+def test_entries_expire_per_category():
+    cache = SearchCache(path=None, ttls={"visa": 60, "flights": -1})
+    cache.put(result("Japan visa"))
+    cache.put(result("flights to Tokyo", category="flights"))
+    assert cache.get(SubQuery("visa", "Japan visa")) is not None
+    assert cache.get(SubQuery("flights", "flights to Tokyo")) is None
+
+
+def test_saves_are_batched_off_the_event_loop(tmp_path, monkeypatch):
+    path = str(tmp_path / "cache.json")
+    writes = []
+
+    async def main():
+        cache = SearchCache(path=path, save_delay=0.05)
+        real_save = cache._save
+        monkeypatch.setattr(cache, "_save", lambda entries: writes.append(len(entries)) or real_save(entries))
+        for n in range(20):
+            cache.put(result(f"visa {n}"))
+        assert writes == []
+        await asyncio.sleep(0.2)
+        assert writes == [20]
+        cache.put(result("visa 20"))
+        await cache.flush()
+
+    asyncio.run(main())
+    assert writes == [20, 21]
+    with open(path, encoding="utf-8") as f:
+        assert len(json.load(f)) == 21
+    assert SearchCache(path=path).get(SubQuery("visa", "visa 20")) is not None
@@ -0,0 +1,76 @@
+import pytest
+
+from search_planner import SearchFields, decompose_request, extract_search_fields
+
+
+@pytest.mark.parametrize(
+    "request_text, expected",
+    [
+        (
+            "I need flights from NYC to Lisbon on May 3-10, 2025, a hotel near the old town, "
+            "and do US citizens need a visa?",
+            SearchFields(destination="Lisbon", origin="NYC", dates="May 3-10, 2025", nationality="US"),
+        ),
+        (
+            "Search for current flight prices, hotels, and weather for a 7-day trip to Tokyo, Japan in April 2025",
+            SearchFields(destination="Tokyo, Japan", dates="April 2025"),
+        ),
+        (
+            "What's the weather like in Rio de Janeiro in December?",
+            SearchFields(destination="Rio de Janeiro", dates="December"),
+        ),
+        ("Create an adventure itinerary for Costa Rica", SearchFields(destination="Costa Rica")),
+        ("Visit Lisbon on 2025-05-03 to 2025-05-10", SearchFields(destination="Lisbon", dates="2025-05-03 to 2025-05-10")),
+        ("hotels in tokyo", SearchFields(destination="tokyo")),
+        ("I may fly to Berlin next week", SearchFields(destination="Berlin")),
+        ("where should I go for a beach holiday?", SearchFields()),
+    ],
+)
+def test_extract_search_fields(request_text, expected):
+    assert extract_search_fields(request_text) == expected
+
+
+def test_subqueries_are_built_from_the_extracted_fields_only():
+    request = (
+        "I need flights from NYC to Lisbon on May 3-10, 2025, a hotel near the old town, "
+        "and do US citizens need a visa?"
+    )
+    assert [(q.category, q.query) for q in decompose_request(request)] == [
+        ("flights", "flights from NYC to Lisbon May 3-10, 2025"),
+        ("accommodation", "hotels in Lisbon May 3-10, 2025"),
+        ("visa", "Lisbon visa and entry requirements for US citizens"),
+    ]
+
+
+@pytest.mark.parametrize(
+    "request_text, categories",
+    [
+        # "eat" in "weather" must not add a dining search.
+        ("weather in Oslo in March", ["weather"]),
+        ("tourist hotels in Rome", ["accommodation"]),
+        ("touring around Iceland, where to stay", ["accommodation"]),
+        ("hotels near a training center in Munich", ["accommodation"]),
+        ("eventually I want to fly to Lima", ["flights"]),
+        ("a holiday in Crete with good food", ["dining"]),
+        ("museum tours and festivals in Vienna", ["activities", "events"]),
+    ],
+)
+def test_keywords_match_whole_words(request_text, categories):
+    assert [q.category for q in decompose_request(request_text)] == categories
+
+
+def test_request_without_categories_gets_a_destination_overview():
+    assert [(q.category, q.query) for q in decompose_request("A week in Kyoto in November")] == [
+        ("general", "Kyoto travel guide November"),
+    ]
+
+
+def test_request_without_destination_is_searched_as_is():
+    assert [(q.category, q.query) for q in decompose_request(" cheap beach holidays with kids ")] == [
+        ("general", "cheap beach holidays with kids"),
+    ]
+
+
+def test_subqueries_are_capped():
+    request = "flights, hotels, weather, visa, trains and restaurants in Rome"
+    assert len(decompose_request(request, max_subqueries=2)) == 2
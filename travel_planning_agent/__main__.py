@@ -1,5 +1,6 @@
 import logging
 import os
+from contextlib import asynccontextmanager
 
 import uvicorn
 from a2a.server.apps import A2AStarletteApplication
@@ -13,14 +14,20 @@ from a2a.types import (
 from agent import create_agent
 from agent_executor import TravelPlanningAgentExecutor
 from dotenv import load_dotenv
+from itinerary_memo import get_itinerary_memo
+from metrics import SESSIONS, RequestCounterMiddleware, count_sessions, metrics_endpoint
+from structured_logging import configure_logging
+from tools.poi_index import get_poi_index
 from google.adk.artifacts import InMemoryArtifactService
 from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
+from starlette.middleware import Middleware
+from starlette.routing import Route
 
 load_dotenv()
 
-logging.basicConfig(level=logging.INFO)
+configure_logging()
 logger = logging.getLogger(__name__)
 
 
@@ -61,6 +68,8 @@ def main():
             skills=[skill],
         )
 
+        # Build the nearby-POI index before serving so lookups never pay for loading it.
+        get_poi_index()
         adk_agent = create_agent()
         runner = Runner(    
             app_name=agent_card.name,
@@ -79,7 +88,23 @@ def main():
             agent_card=agent_card, http_handler=request_handler
         )
 
-        uvicorn.run(server.build(), host=host, port=port)
+        SESSIONS.set_function(lambda: count_sessions(runner.session_service))
+
+        @asynccontextmanager
+        async def lifespan(app):
+            try:
+                yield
+            finally:
+                # Write the changes still waiting for their debounced save.
+                await get_itinerary_memo().flush()
+
+        app = server.build(
+            routes=[Route("/metrics", metrics_endpoint, methods=["GET"])],
+            middleware=[Middleware(RequestCounterMiddleware)],
+            lifespan=lifespan,
+        )
+
+        uvicorn.run(app, host=host, port=port)
     except MissingAPIKeyError as e:
         logger.error(f"Error: {e}")
         exit(1)
@@ -3,14 +3,17 @@ from datetime import date, datetime, timedelta
 
 from google.adk.agents import LlmAgent
 
+from model_routing import ModelRouter
+from tools import find_nearby_places, optimize_budget, optimize_route
 
 
 
 
 def create_agent() -> LlmAgent:
     """Constructs the ADK agent for travel planning."""
+    router = ModelRouter()
     return LlmAgent(
-        model="gemini-2.0-flash-001", 
+        model=router.strong_model,
         name="Travel_Planning_Agent",
         instruction="""
         **Role:** Expert travel planning agent specializing in creating comprehensive, personalized itineraries
@@ -34,6 +37,11 @@ def create_agent() -> LlmAgent:
         5. **Provide Alternatives**: Offer backup options for weather, availability, or preference changes
         6. **Include Details**: Provide specific recommendations with names, addresses, estimated costs, and booking information
 
+        ## Planning Tools:
+        - **optimize_route**: When you know the places to visit and their coordinates, call it to order each day's stops. It returns a travel-time efficient schedule that respects opening hours and visit durations. Use its order and times in the itinerary instead of ordering stops yourself, and mention any places it could not fit.
+        - **optimize_budget**: When the traveler has a budget, call it with the candidate hotels, transport and activities (total cost and a 1-10 utility score for how well each fits the traveler). It returns the best selection that fits the budget and the remaining budget. Use its totals in the budget breakdown instead of doing the arithmetic yourself.
+        - **find_nearby_places**: Finds attractions, restaurants and other places near a location (such as the hotel), within a radius or the nearest ones, optionally filtered by category. Use it for "what is near ..." questions and to pick candidate stops for `optimize_route`.
+
         ## Output Format:
         Provide structured travel plans with:
         - Daily itineraries with timing and locations
@@ -45,6 +53,9 @@ def create_agent() -> LlmAgent:
 
         Always create practical, enjoyable, and memorable travel experiences tailored to the specific traveler's needs and preferences.
         """,
+        tools=[optimize_route, optimize_budget, find_nearby_places],
+        before_model_callback=router.before_model,
+        after_model_callback=router.after_model,
     )
 
 root_agent = create_agent()
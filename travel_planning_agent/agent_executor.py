@@ -1,5 +1,7 @@
 import asyncio
 import logging
+import time
+import uuid
 from collections.abc import AsyncGenerator
 
 from a2a.server.agent_execution import AgentExecutor
@@ -7,9 +9,6 @@ from a2a.server.agent_execution.context import RequestContext
 from a2a.server.events.event_queue import EventQueue
 from a2a.server.tasks import TaskUpdater
 from a2a.types import (
-    FilePart,
-    FileWithBytes,
-    FileWithUri,
     Part,
     TaskState,
     TextPart,
@@ -21,8 +20,22 @@ from google.adk import Runner
 from google.adk.events import Event
 from google.genai import types
 
+from file_cache import get_file_cache
+from itinerary_memo import (
+    ITINERARY_MEMO_ENABLED,
+    MemoEntry,
+    adapt_itinerary,
+    extract_trip_parameters,
+    get_itinerary_memo,
+    memoizable_itinerary,
+)
+from metrics import TASK_LATENCY, TASKS_IN_FLIGHT, ModelCallObserver
+from part_conversion import convert_a2a_parts_to_genai_cached, convert_genai_parts_to_a2a
+from streaming import ArtifactStreamer, build_run_config
+from structured_logging import correlation_id, log_payload
+from usage import TokenUsage, complete_task, current_task_usage, record_task_usage
+
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
 
 
 class TravelPlanningAgentExecutor(AgentExecutor):
@@ -31,13 +44,15 @@ class TravelPlanningAgentExecutor(AgentExecutor):
     
         self.runner = runner
         self._running_sessions = {}
+        self._run_config = build_run_config()
 
     def _run_agent(
         self, session_id, new_message: types.Content
     ) -> AsyncGenerator[Event, None]:
         try:
             return self.runner.run_async(
-                session_id=session_id, user_id="travel_planning_agent", new_message=new_message
+                session_id=session_id, user_id="travel_planning_agent", new_message=new_message,
+                run_config=self._run_config,
             )
         except asyncio.CancelledError as e:
             logger.error(f"Agent execution was cancelled: {e}")
@@ -52,25 +67,63 @@ class TravelPlanningAgentExecutor(AgentExecutor):
         new_message: types.Content,
         session_id: str,
         task_updater: TaskUpdater,
-    ) -> None:
+    ) -> TaskState:
+        usage = TokenUsage()
+        usage_token = current_task_usage.set(usage)
         try:
             session_obj = await self._upsert_session(session_id)
             session_id = session_obj.id
-            print(f"new_message {new_message}")
+            log_payload(logger, "Running agent", new_message, session_id=session_id)
             
+            request_text = "".join(part.text or "" for part in new_message.parts or [])
+            # Only first turns are memoized; follow-ups depend on the conversation.
+            trip = (
+                extract_trip_parameters(request_text)
+                if ITINERARY_MEMO_ENABLED and not session_obj.events
+                else None
+            )
+
             # Set a timeout for the API call
             try:
                 async with asyncio.timeout(30):  # 30 second timeout
+                    memo_hit = get_itinerary_memo().find(trip) if trip else None
+                    if memo_hit:
+                        state = await self._adapt_cached_itinerary(
+                            memo_hit[0], request_text, new_message, session_obj, task_updater, usage
+                        )
+                        if state is not None:
+                            return state
+                    model_calls = ModelCallObserver(usage.add_usage_metadata)
+                    streamer = ArtifactStreamer(task_updater)
                     async for event in self._run_agent(session_id, new_message):
+                        model_calls.observe(event)
+                        if event.partial:
+                            await streamer.append(
+                                convert_genai_parts_to_a2a(
+                                    event.content.parts
+                                    if event.content and event.content.parts
+                                    else []
+                                )
+                            )
+                            continue
                         if event.is_final_response():
+                            model_calls.finish()
                             parts = convert_genai_parts_to_a2a(
                                 event.content.parts if event.content and event.content.parts else []
                             )
                             logger.debug("Yielding final response: %s", parts)
-                            await task_updater.add_artifact(parts)
-                            await task_updater.complete()
-                            
-                            break
+                            await streamer.finish(parts)
+                            itinerary = "".join(
+                                part.root.text for part in parts if isinstance(part.root, TextPart)
+                            )
+                            memoizable = (
+                                memoizable_itinerary(itinerary, trip, request_text) if trip else None
+                            )
+                            if memoizable:
+                                get_itinerary_memo().store(trip, memoizable)
+                            await complete_task(task_updater, usage)
+                            record_task_usage(usage)
+                            return TaskState.completed
                         if not event.get_function_calls():
                             logger.debug("Yielding update response")
                             await task_updater.update_status(
@@ -94,6 +147,7 @@ class TravelPlanningAgentExecutor(AgentExecutor):
                         Part(root=TextPart(text="The API call timed out. Please try again later."))
                     ]),
                 )
+                return TaskState.failed
         except Exception as e:
             logger.error(f"Error processing request: {e}")
             await task_updater.update_status(
@@ -102,6 +156,59 @@ class TravelPlanningAgentExecutor(AgentExecutor):
                     Part(root=TextPart(text=f"An error occurred: {str(e)}"))
                 ]),
             )
+            return TaskState.failed
+        finally:
+            current_task_usage.reset(usage_token)
+        return TaskState.working
+
+    async def _adapt_cached_itinerary(
+        self,
+        entry: MemoEntry,
+        request_text: str,
+        new_message: types.Content,
+        session,
+        task_updater: TaskUpdater,
+        usage: TokenUsage,
+    ) -> TaskState | None:
+        """Answers with a cached itinerary adapted by the cheaper model.
+
+        Returns None when adaptation failed before anything was streamed, so
+        the request can fall back to the full planning agent.
+        """
+        logger.info(
+            "Adapting a cached itinerary for %d days in %s",
+            entry.parameters.days,
+            entry.parameters.destination,
+        )
+        streamer = ArtifactStreamer(task_updater)
+        chunks = []
+        try:
+            async for text in adapt_itinerary(entry, request_text):
+                chunks.append(text)
+                await streamer.append([Part(root=TextPart(text=text))])
+        except Exception as e:
+            if streamer.chunks:
+                raise
+            logger.warning(f"Could not adapt the cached itinerary, planning from scratch: {e}")
+            return None
+        itinerary = "".join(chunks)
+        # Record the turn so follow-up messages in this context see the itinerary.
+        invocation_id = str(uuid.uuid4())
+        await self.runner.session_service.append_event(
+            session, Event(invocation_id=invocation_id, author="user", content=new_message)
+        )
+        await self.runner.session_service.append_event(
+            session,
+            Event(
+                invocation_id=invocation_id,
+                author=self.runner.agent.name,
+                content=types.Content(role="model", parts=[types.Part(text=itinerary)]),
+            ),
+        )
+        await streamer.finish([Part(root=TextPart(text=itinerary))])
+        await complete_task(task_updater, usage)
+        record_task_usage(usage)
+        return TaskState.completed
 
     async def execute(
         self,
@@ -112,8 +219,10 @@ class TravelPlanningAgentExecutor(AgentExecutor):
             raise ValueError("RequestContext must have task_id and context_id")
         if not context.message:
             raise ValueError("RequestContext must have a message")
-        print("================================================\n")
-        print(f"context ==== {context}")
+        correlation_id.set(
+            (context.message.metadata or {}).get("correlation_id") or context.task_id
+        )
+        log_payload(logger, "Received request", context)
         task = context.current_task
         if not task:
             task = new_task(context.message)
@@ -132,15 +241,30 @@ class TravelPlanningAgentExecutor(AgentExecutor):
         except Exception as e:
             logger.error(f"Error starting work: {e}")
             
-        print("================================================\n")
-        print(f"updater ==== started working....")
-        await self._process_request(
-            types.UserContent(
-                parts=convert_a2a_parts_to_genai(context.message.parts),
-            ),
-            task.contextId,
-            updater,
-        )
+        logger.info("Started working on task %s", task.id)
+        started_at = time.perf_counter()
+        TASKS_IN_FLIGHT.inc()
+        state = TaskState.failed
+        try:
+            try:
+                parts = await convert_a2a_parts_to_genai_cached(
+                    context.message.parts, get_file_cache()
+                )
+            except Exception as e:
+                logger.error(f"Error converting message parts: {e}")
+                await updater.update_status(
+                    TaskState.failed,
+                    message=updater.new_agent_message([
+                        Part(root=TextPart(text=f"Could not read the attached files: {str(e)}"))
+                    ]),
+                )
+                return
+            state = await self._process_request(
+                types.UserContent(parts=parts), task.contextId, updater
+            )
+        finally:
+            TASKS_IN_FLIGHT.dec()
+            TASK_LATENCY.observe(time.perf_counter() - started_at, state=state.value)
 
     async def cancel(self, context: RequestContext, event_queue: EventQueue):
         raise ServerError(error=UnsupportedOperationError())
@@ -159,68 +283,3 @@ class TravelPlanningAgentExecutor(AgentExecutor):
             raise RuntimeError(f"Failed to get or create session: {session_id}")
         return session
 
-
-def convert_a2a_parts_to_genai(parts: list[Part]) -> list[types.Part]:
-    """Convert a list of A2A Part types into a list of Google Gen AI Part types."""
-    return [convert_a2a_part_to_genai(part) for part in parts]
-
-
-def convert_a2a_part_to_genai(part: Part) -> types.Part:
-    """Convert a single A2A Part type into a Google Gen AI Part type."""
-    root = part.root
-    if isinstance(root, TextPart):
-        return types.Part(text=root.text)
-    if isinstance(root, FilePart):
-        if isinstance(root.file, FileWithUri):
-            return types.Part(
-                file_data=types.FileData(
-                    file_uri=root.file.uri, mime_type=root.file.mimeType
-                )
-            )
-        if isinstance(root.file, FileWithBytes):
-            return types.Part(
-                inline_data=types.Blob(
-                    data=root.file.bytes.encode("utf-8"),
-                    mime_type=root.file.mimeType or "application/octet-stream",
-                )
-            )
-        raise ValueError(f"Unsupported file type: {type(root.file)}")
-    raise ValueError(f"Unsupported part type: {type(part)}")
-
-
-def convert_genai_parts_to_a2a(parts: list[types.Part]) -> list[Part]:
-    """Convert a list of Google Gen AI Part types into a list of A2A Part types."""
-    return [
-        convert_genai_part_to_a2a(part)
-        for part in parts
-        if (part.text or part.file_data or part.inline_data)
-    ]
-
-
-def convert_genai_part_to_a2a(part: types.Part) -> Part:
-    """Convert a single Google Gen AI Part type into an A2A Part type."""
-    if part.text:
-        return Part(root=TextPart(text=part.text))
-    if part.file_data:
-        if not part.file_data.file_uri:
-            raise ValueError("File URI is missing")
-        return Part(
-            root=FilePart(
-                file=FileWithUri(
-                    uri=part.file_data.file_uri,
-                    mimeType=part.file_data.mime_type,
-                )
-            )
-        )
-    if part.inline_data:
-        if not part.inline_data.data:
-            raise ValueError("Inline data is missing")
-        return Part(
-            root=FilePart(
-                file=FileWithBytes(
-                    bytes=part.inline_data.data.decode("utf-8"),
-                    mimeType=part.inline_data.mime_type,
-                )
-            )
-        )
-    raise ValueError(f"Unsupported part type: {part}")
@@ -0,0 +1,45 @@
+"""Builds the POI array file used by the Travel Planning Agent's nearby lookups.
+
+Inputs are `.csv` files with `name`, `lat`, `lon` and `category` columns, or
+`.jsonl` files with one object with those fields per line.
+
+Usage:
+    python build_poi_index.py pois.csv [more.jsonl ...] [--output pois.npz]
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+from tools.poi_index import POI_DATA_FILE, save_pois
+
+
+def read_pois(path: str) -> list[dict]:
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.endswith(".jsonl"):
+            return [json.loads(line) for line in f if line.strip()]
+        return list(csv.DictReader(f))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("inputs", nargs="+", help="CSV or JSONL files")
+    parser.add_argument("--output", default=POI_DATA_FILE)
+    args = parser.parse_args()
+
+    started_at = time.perf_counter()
+    pois = [poi for path in args.inputs for poi in read_pois(path)]
+    count = save_pois(args.output, pois)
+    print(
+        f"Wrote {count} POIs to {args.output} "
+        f"({os.path.getsize(args.output) / 2**20:.1f} MB) "
+        f"in {time.perf_counter() - started_at:.1f}s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
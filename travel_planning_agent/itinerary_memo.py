@@ -0,0 +1,414 @@
+"""Memoization of generated itineraries by normalized trip parameters.
+
+Requests such as "5 days in Tokyo, family, mid budget" recur constantly.
+The destination, duration, party type, budget band and interests are
+extracted from each new planning request with local rules. When an earlier
+itinerary was generated for a near-identical trip (same destination, party
+type and budget band, a similar length and overlapping interests), it is
+adapted to the new request with one call to a cheaper model
+(`ITINERARY_ADAPT_MODEL`) instead of re-running the full planning agent.
+
+Only responses that are day-by-day itineraries are memoized, with the
+traveler's names and contact details removed, since entries are shared
+between users. With `ITINERARY_MEMO_FILE` set, changes are written at most
+every `ITINERARY_MEMO_SAVE_DELAY` seconds, off the event loop, by atomically
+replacing the file.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import AsyncIterator, Optional
+
+from google import genai
+from google.genai import types
+
+from metrics import ITINERARY_MEMO_LOOKUPS, LLM_LATENCY, observe_llm_usage
+from usage import current_task_usage
+
+logger = logging.getLogger(__name__)
+
+ITINERARY_MEMO_ENABLED = os.getenv("ITINERARY_MEMO_ENABLED", "true").lower() == "true"
+ITINERARY_ADAPT_MODEL = os.getenv("ITINERARY_ADAPT_MODEL", "gemini-2.0-flash-lite")
+ITINERARY_MEMO_MAX_ENTRIES = int(os.getenv("ITINERARY_MEMO_MAX_ENTRIES", "500"))
+ITINERARY_MEMO_TTL = float(os.getenv("ITINERARY_MEMO_TTL", str(7 * 24 * 3600)))
+ITINERARY_MEMO_MIN_SIMILARITY = float(os.getenv("ITINERARY_MEMO_MIN_SIMILARITY", "0.75"))
+ITINERARY_MEMO_FILE = os.getenv("ITINERARY_MEMO_FILE")
+ITINERARY_MEMO_SAVE_DELAY = float(os.getenv("ITINERARY_MEMO_SAVE_DELAY", "5"))
+# Largest difference in trip length for which a cached itinerary is adapted.
+MAX_DAYS_DIFFERENCE = 2
+
+_NUMBER_WORDS = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7,
+    "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12, "thirteen": 13,
+    "fourteen": 14,
+}
+_NUMBER = r"(\d{1,2}|" + "|".join(_NUMBER_WORDS) + ")"
+_DAYS = re.compile(rf"\b{_NUMBER}[\s-]*(day|night|week)s?\b", re.IGNORECASE)
+_WEEKEND = re.compile(r"\b(?:a|the|long)\s+weekend\b", re.IGNORECASE)
+_A_WEEK = re.compile(r"\ba\s+week\b", re.IGNORECASE)
+_DESTINATION = re.compile(
+    r"\b(?:in|to|visit|visiting|around|of)\s+((?:[A-Z][\w'’-]+)(?:\s+(?:[A-Z][\w'’-]+|de|del|la|da)){0,3})"
+)
+_DESTINATION_BEFORE_TRIP = re.compile(
+    r"\b((?:[A-Z][\w'’-]+)(?:\s+[A-Z][\w'’-]+){0,2})\s+(?:itinerary|trip|vacation|holiday|getaway)"
+)
+# Capitalized words the destination patterns pick up that are not places.
+_NOT_PLACES = frozenset(
+    "January February March April May June July August September October November December "
+    "Monday Tuesday Wednesday Thursday Friday Saturday Sunday Spring Summer Autumn Fall Winter "
+    "Christmas Easter I".split()
+)
+_AMOUNT = re.compile(
+    r"(?:[$€£]\s?(\d[\d,]*)|(\d[\d,]*)\s?(?:usd|eur|gbp|dollars|euros|pounds)\b)"
+    r"(\s*(?:(?:per|a|an|each|/)\s*(?:day|night)\b|daily\b))?",
+    re.IGNORECASE,
+)
+_DAILY_BUDGET = re.compile(r"\b(?:daily|per[\s-]day|a[\s-]day)\s+budget\b", re.IGNORECASE)
+
+PARTY_KEYWORDS = {
+    "family": ("family", "kids", "children", "child", "toddler"),
+    "couple": ("couple", "honeymoon", "partner", "wife", "husband", "romantic", "anniversary"),
+    "friends": ("friends", "group"),
+    "business": ("business", "conference", "work trip"),
+    "solo": ("solo", "alone", "by myself"),
+}
+# Checked in order, so "mid budget" is mid rather than budget.
+BUDGET_KEYWORDS = {
+    "luxury": ("luxury", "high-end", "high end", "5-star", "five-star", "premium"),
+    "mid": ("mid-range", "mid range", "mid budget", "moderate", "mid-budget"),
+    "budget": ("budget", "cheap", "backpack", "affordable", "low-cost", "shoestring"),
+}
+# Interest -> the words that mention it, matched as whole words.
+INTERESTS = {
+    "food": ("food", "foodie", "cuisine"),
+    "museums": ("museum", "museums"),
+    "history": ("history", "historic", "historical"),
+    "art": ("art", "arts", "gallery", "galleries"),
+    "nature": ("nature",),
+    "hiking": ("hike", "hikes", "hiking"),
+    "beaches": ("beach", "beaches"),
+    "nightlife": ("nightlife",),
+    "shopping": ("shopping",),
+    "culture": ("culture", "cultural"),
+    "adventure": ("adventure", "adventures", "adventurous"),
+    "relaxation": ("relaxation", "relaxing"),
+    "architecture": ("architecture",),
+    "temples": ("temple", "temples"),
+    "wine": ("wine", "wines", "winery", "wineries"),
+    "theme parks": ("theme park", "theme parks"),
+    "photography": ("photography",),
+    "markets": ("market", "markets"),
+}
+
+
+@dataclass
+class TripParameters:
+    destination: str
+    days: int
+    party: str = "unspecified"
+    budget_band: str = "unspecified"
+    interests: list[str] = field(default_factory=list)
+
+    @property
+    def bucket(self) -> str:
+        return f"{self.destination}|{self.party}|{self.budget_band}"
+
+    def similarity(self, other: "TripParameters") -> float:
+        """Similarity in [0, 1] of two trips in the same bucket."""
+        if self.bucket != other.bucket or abs(self.days - other.days) > MAX_DAYS_DIFFERENCE:
+            return 0.0
+        length = 1 - abs(self.days - other.days) / max(self.days, other.days)
+        mine, theirs = set(self.interests), set(other.interests)
+        overlap = len(mine & theirs) / len(mine | theirs) if mine | theirs else 1.0
+        return 0.6 * length + 0.4 * overlap
+
+
+def _mentions(text: str, words: tuple[str, ...], whole_words: bool = False) -> bool:
+    end = r"\b" if whole_words else ""
+    return any(re.search(rf"\b{re.escape(word)}{end}", text) for word in words)
+
+
+def _first_match(text: str, keywords: dict[str, tuple[str, ...]]) -> Optional[str]:
+    for value, words in keywords.items():
+        if _mentions(text, words):
+            return value
+    return None
+
+
+def _destination(request: str) -> Optional[str]:
+    """The first candidate place name that is not a month, weekday or season."""
+    for pattern in (_DESTINATION, _DESTINATION_BEFORE_TRIP):
+        for match in pattern.finditer(request):
+            words = match[1].split()
+            # "Paris May" -> "Paris"
+            while words and words[-1] in _NOT_PLACES:
+                words.pop()
+            if words and words[0] not in _NOT_PLACES:
+                return " ".join(words)
+    return None
+
+
+def extract_trip_parameters(request: str) -> Optional[TripParameters]:
+    """Trip parameters of a planning request, or None without a destination and length."""
+    destination = _destination(request)
+    if _WEEKEND.search(request):
+        days = 2
+    elif _A_WEEK.search(request):
+        days = 7
+    else:
+        match = _DAYS.search(request)
+        if match is None:
+            days = 0
+        else:
+            count = int(_NUMBER_WORDS.get(match[1].lower(), match[1]))
+            days = count * 7 if match[2].lower() == "week" else count
+    if destination is None or days <= 0:
+        return None
+
+    text = request.lower()
+    amount = _AMOUNT.search(request)
+    if amount:
+        # An explicit amount is banded per day and wins over budget keywords;
+        # it is a trip total unless it is given per day.
+        value = int((amount[1] or amount[2]).replace(",", ""))
+        per_day = value if amount[3] or _DAILY_BUDGET.search(request) else value / days
+        budget_band = "budget" if per_day < 100 else "mid" if per_day < 350 else "luxury"
+    else:
+        budget_band = _first_match(text, BUDGET_KEYWORDS)
+    return TripParameters(
+        destination=destination.lower(),
+        days=days,
+        party=_first_match(text, PARTY_KEYWORDS) or "unspecified",
+        budget_band=budget_band or "unspecified",
+        interests=sorted(
+            interest for interest, words in INTERESTS.items() if _mentions(text, words, whole_words=True)
+        ),
+    )
+
+
+# Headings of day-by-day plans: "Day 1", "### Days 2-3", "**Saturday**".
+_DAY_HEADING = re.compile(
+    r"^[\W_]*(?:days?\s+(\d+)|(monday|tuesday|wednesday|thursday|friday|saturday|sunday))\b",
+    re.IGNORECASE | re.MULTILINE,
+)
+# Introductions of the traveler or their companions in a request.
+_TRAVELER_NAME = re.compile(
+    r"\b(?:(?i:my name is|i am|i'm|this is|name:)|(?i:my|our)\s+(?i:wife|husband|partner|son|daughter"
+    r"|mom|mother|dad|father|friend|boyfriend|girlfriend|kids?|children)|(?:Mr|Mrs|Ms|Dr)\.?)"
+    r"\s*,?\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)"
+)
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+_PHONE = re.compile(r"(?<![\w:])\+?\d(?:[\s().-]{0,2}\d){8,}(?![\w:])")
+# Booking references and passport numbers.
+_REFERENCE = re.compile(r"\b(?=[A-Z0-9]*\d)(?=[A-Z0-9]*[A-Z])[A-Z0-9]{6,}\b")
+
+
+def is_itinerary(text: str, parameters: TripParameters) -> bool:
+    """Whether a response is a day-by-day plan rather than a question or an error."""
+    days = {match[1] or match[2].lower() for match in _DAY_HEADING.finditer(text)}
+    return len(days) >= min(parameters.days, 2)
+
+
+def redact_personal_details(itinerary: str, request: str) -> str:
+    """The itinerary without the traveler's names, contact details and references from the request."""
+    for match in _TRAVELER_NAME.finditer(request):
+        for name in (match[1], *match[1].split()):
+            itinerary = re.sub(rf"\b{re.escape(name)}\b", "the traveler", itinerary)
+    for pattern, placeholder in ((_EMAIL, "[email]"), (_REFERENCE, "[reference]")):
+        for value in set(pattern.findall(request)):
+            itinerary = re.sub(rf"(?<![\w.]){re.escape(value)}(?!\w)", placeholder, itinerary, flags=re.IGNORECASE)
+    # Phone numbers are compared by their digits, whatever their formatting.
+    phones = {re.sub(r"\D", "", phone)[-9:] for phone in _PHONE.findall(request)}
+    return _PHONE.sub(
+        lambda match: "[phone]" if re.sub(r"\D", "", match[0])[-9:] in phones else match[0],
+        itinerary,
+    )
+
+
+def memoizable_itinerary(response: str, parameters: TripParameters, request: str) -> Optional[str]:
+    """The shareable form of a first-turn response, or None if it should not be memoized.
+
+    Only day-by-day itineraries are memoized, never clarifying questions or
+    errors, and personal details from the request are removed because a memo
+    entry is adapted for other travelers.
+    """
+    if not is_itinerary(response, parameters):
+        return None
+    return redact_personal_details(response, request)
+
+
+@dataclass
+class MemoEntry:
+    parameters: TripParameters
+    itinerary: str
+    created_at: float
+
+
+class ItineraryMemo:
+    """LRU store of generated itineraries keyed by their trip parameters."""
+
+    def __init__(
+        self,
+        max_entries: int = ITINERARY_MEMO_MAX_ENTRIES,
+        ttl: float = ITINERARY_MEMO_TTL,
+        min_similarity: float = ITINERARY_MEMO_MIN_SIMILARITY,
+        path: Optional[str] = ITINERARY_MEMO_FILE,
+        save_delay: float = ITINERARY_MEMO_SAVE_DELAY,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.min_similarity = min_similarity
+        self.path = path
+        self.save_delay = save_delay
+        # (bucket, days, interests) -> entry; the key makes exact repeats replace each other.
+        self._entries: OrderedDict[tuple, MemoEntry] = OrderedDict()
+        self._dirty = False
+        self._save_task: Optional[asyncio.Task] = None
+        self._save_lock = asyncio.Lock()
+        if path:
+            self._load()
+
+    @staticmethod
+    def _key(parameters: TripParameters) -> tuple:
+        return parameters.bucket, parameters.days, tuple(parameters.interests)
+
+    def find(self, parameters: TripParameters) -> Optional[tuple[MemoEntry, float]]:
+        """The most similar fresh itinerary above the similarity threshold."""
+        now = time.time()
+        best, best_score = None, 0.0
+        for key, entry in list(self._entries.items()):
+            if now - entry.created_at > self.ttl:
+                del self._entries[key]
+                continue
+            score = parameters.similarity(entry.parameters)
+            if score > best_score:
+                best, best_score = entry, score
+        if best is None or best_score < self.min_similarity:
+            ITINERARY_MEMO_LOOKUPS.inc(result="miss")
+            return None
+        self._entries.move_to_end(self._key(best.parameters))
+        ITINERARY_MEMO_LOOKUPS.inc(result="hit")
+        return best, best_score
+
+    def store(self, parameters: TripParameters, itinerary: str) -> None:
+        key = self._key(parameters)
+        self._entries[key] = MemoEntry(parameters, itinerary, time.time())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        if self.path:
+            self._schedule_save()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                records = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        for record in records:
+            entry = MemoEntry(
+                TripParameters(**record["parameters"]), record["itinerary"], record["created_at"]
+            )
+            self._entries[self._key(entry.parameters)] = entry
+
+    def _schedule_save(self) -> None:
+        """Persists the memo soon, batching the changes made until then."""
+        self._dirty = True
+        if self._save_task is not None and not self._save_task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Outside the server there is no loop to write from.
+            self._dirty = False
+            self._save(list(self._entries.values()))
+            return
+        self._save_task = loop.create_task(self._save_later())
+
+    async def _save_later(self) -> None:
+        while self._dirty:
+            await asyncio.sleep(self.save_delay)
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Writes pending changes to `path` now."""
+        async with self._save_lock:
+            if not self._dirty:
+                return
+            self._dirty = False
+            # Entries are replaced rather than modified, so a shallow copy is a snapshot.
+            await asyncio.to_thread(self._save, list(self._entries.values()))
+
+    def _save(self, entries: list[MemoEntry]) -> None:
+        """Replaces the file atomically, so a crash never leaves a partial one."""
+        try:
+            with open(f"{self.path}.tmp", "w", encoding="utf-8") as f:
+                json.dump([asdict(entry) for entry in entries], f)
+            os.replace(f"{self.path}.tmp", self.path)
+        except OSError as e:
+            logger.warning(f"Could not persist the itinerary memo to {self.path}: {e}")
+
+
+_ADAPT_INSTRUCTION = """You are an expert travel planner. Adapt the existing itinerary below to the new request.
+Keep everything that still fits, and change only what the new request requires: the number of days,
+interests, party, budget, dates and any other details it mentions. Return the complete adapted
+itinerary in the same format, without mentioning that it was adapted. Placeholders such as
+"the traveler" or [email] stand for details of another traveler: use the new request's details
+instead, or leave them out.
+
+Existing itinerary (planned for {days} days in {destination}, {party} party, {budget_band} budget,
+interests: {interests}):
+{itinerary}
+"""
+
+_client: Optional[genai.Client] = None
+
+
+async def adapt_itinerary(entry: MemoEntry, request: str) -> AsyncIterator[str]:
+    """Streams the cached itinerary adapted to `request` with the cheaper model."""
+    global _client
+    if _client is None:
+        _client = genai.Client()
+    parameters = entry.parameters
+    started_at = time.perf_counter()
+    usage_metadata = None
+    stream = await _client.aio.models.generate_content_stream(
+        model=ITINERARY_ADAPT_MODEL,
+        contents=request,
+        config=types.GenerateContentConfig(
+            system_instruction=_ADAPT_INSTRUCTION.format(
+                days=parameters.days,
+                destination=parameters.destination,
+                party=parameters.party,
+                budget_band=parameters.budget_band,
+                interests=", ".join(parameters.interests) or "none given",
+                itinerary=entry.itinerary,
+            ),
+        ),
+    )
+    async for chunk in stream:
+        usage_metadata = chunk.usage_metadata or usage_metadata
+        if chunk.text:
+            yield chunk.text
+    LLM_LATENCY.observe(time.perf_counter() - started_at)
+    observe_llm_usage(usage_metadata)
+    task_usage = current_task_usage.get()
+    if task_usage is not None:
+        task_usage.add_usage_metadata(usage_metadata)
+
+
+_default_memo: Optional[ItineraryMemo] = None
+
+
+def get_itinerary_memo() -> ItineraryMemo:
+    """Returns the process-wide itinerary memo."""
+    global _default_memo
+    if _default_memo is None:
+        _default_memo = ItineraryMemo()
+    return _default_memo
@@ -0,0 +1,102 @@
+import itertools
+import random
+
+import numpy as np
+import pytest
+
+from tools.budget_solver import optimize_budget, solve_budget
+
+
+def brute_force(costs, utilities, groups, budget):
+    """Best total utility over every selection, or None when none fits."""
+    choices = [
+        [[index] for index in members] + ([] if mandatory else [[]])
+        for members, mandatory in groups
+    ]
+    best = None
+    for combination in itertools.product(*choices):
+        selected = [index for picked in combination for index in picked]
+        if sum(costs[index] for index in selected) <= budget:
+            utility = sum(utilities[index] for index in selected)
+            best = utility if best is None else max(best, utility)
+    return best
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_matches_brute_force_on_random_instances(seed):
+    rng = random.Random(seed)
+    count = rng.randint(3, 9)
+    costs = np.array([float(rng.randint(10, 400)) for _ in range(count)])
+    utilities = np.array([float(rng.randint(1, 10)) for _ in range(count)])
+    indices = list(range(count))
+    rng.shuffle(indices)
+    hotels, transport, activities = indices[:2], indices[2:3], indices[3:]
+    groups = [(hotels, True), (transport, True)] + [([index], False) for index in activities]
+    budget = float(rng.randint(200, 1200))
+
+    selected = solve_budget(costs, utilities, groups, budget)
+    expected = brute_force(costs, utilities, groups, budget)
+    if expected is None:
+        assert selected is None
+    else:
+        assert float(costs[selected].sum()) <= budget
+        assert float(utilities[selected].sum()) == expected
+        assert len(set(selected) & set(hotels)) == 1
+        assert len(set(selected) & set(transport)) == 1
+
+
+def test_fractional_costs_never_exceed_the_budget():
+    costs = np.array([33.33, 33.34, 33.34])
+    utilities = np.array([1.0, 1.0, 1.0])
+    groups = [([index], False) for index in range(3)]
+    selected = solve_budget(costs, utilities, groups, 100.0, resolution=10)
+    assert float(costs[selected].sum()) <= 100.0
+
+
+def test_optimize_budget_picks_one_of_each_and_the_best_activities():
+    result = optimize_budget(
+        [
+            {"name": "Grand Hotel", "type": "hotel", "cost": 900, "utility": 9},
+            {"name": "Hostel", "type": "hotel", "cost": 200, "utility": 4},
+            {"name": "Train", "type": "transport", "cost": 150, "utility": 6},
+            {"name": "Flight", "type": "transport", "cost": 400, "utility": 8},
+            {"name": "Museum", "type": "activity", "cost": 30, "utility": 5},
+            {"name": "Cooking class", "type": "activity", "cost": 120, "utility": 7},
+            {"name": "Helicopter tour", "type": "activity", "cost": 600, "utility": 6},
+        ],
+        1300,
+    )
+    assert result["status"] == "success"
+    # The cheap hostel leaves room for every activity (utility 28), which beats
+    # the grand hotel with the two cheaper activities (utility 27).
+    assert {option["name"] for option in result["selected"]} == {
+        "Hostel", "Train", "Museum", "Cooking class", "Helicopter tour",
+    }
+    assert result["total_utility"] == 28
+    assert result["total_cost"] == 1100
+    assert result["remaining_budget"] == 200
+
+
+def test_optimize_budget_reports_infeasible_budgets():
+    result = optimize_budget(
+        [
+            {"name": "Hotel", "type": "hotel", "cost": 500, "utility": 5},
+            {"name": "Train", "type": "transport", "cost": 150, "utility": 5},
+        ],
+        600,
+    )
+    assert result["status"] == "error"
+    assert "650" in result["message"]
+
+
+@pytest.mark.parametrize(
+    "options, budget",
+    [
+        ([], 100),
+        ([{"name": "Museum", "cost": 10}], 0),
+        ([{"name": "Museum", "cost": -10}], 100),
+        ([{"name": "Museum"}], 100),
+    ],
+)
+def test_optimize_budget_rejects_invalid_input(options, budget):
+    assert optimize_budget(options, budget)["status"] == "error"
@@ -0,0 +1,22 @@
+import sys
+
+import build_poi_index
+from tools.poi_index import POIIndex
+
+
+def test_output_is_written_to_the_exact_path(tmp_path, monkeypatch, capsys):
+    source = tmp_path / "pois.csv"
+    source.write_text(
+        "name,lat,lon,category\nLouvre,48.8606,2.3376,museum\nCafé de Flore,48.8541,2.3326,cafe\n",
+        encoding="utf-8",
+    )
+    output = tmp_path / "pois.dat"
+    monkeypatch.setattr(
+        sys, "argv", ["build_poi_index.py", str(source), "--output", str(output)]
+    )
+    assert build_poi_index.main() == 0
+    assert not (tmp_path / "pois.dat.npz").exists()
+    assert "Wrote 2 POIs" in capsys.readouterr().out
+    index = POIIndex.load(str(output))
+    assert len(index) == 2
+    assert sorted(index.categories) == ["cafe", "museum"]
@@ -0,0 +1,152 @@
+import asyncio
+
+import pytest
+
+from itinerary_memo import (
+    ItineraryMemo,
+    TripParameters,
+    extract_trip_parameters,
+    memoizable_itinerary,
+)
+
+ITINERARY = """## Day 1: Arrival
+Check in and walk along the river.
+## Day 2
+Louvre in the morning, Marais in the afternoon.
+## Day 3
+Eiffel Tower and a Seine cruise.
+"""
+
+
+@pytest.mark.parametrize(
+    "request_text, days",
+    [
+        ("5 days in Tokyo", 5),
+        ("Plan a five-day trip to Tokyo", 5),
+        ("Two weeks in Japan", 14),
+        ("A week in Lisbon", 7),
+        ("A long weekend in Rome", 2),
+        ("4 nights in Bali", 4),
+    ],
+)
+def test_trip_length(request_text, days):
+    assert extract_trip_parameters(request_text).days == days
+
+
+@pytest.mark.parametrize(
+    "request_text, destination",
+    [
+        ("Plan 5 days in July in Paris for a couple", "paris"),
+        ("Plan 5 days in July in Rome for a couple", "rome"),
+        ("A week in Spring in Kyoto", "kyoto"),
+        ("I want to visit Lisbon May 3 for 4 days", "lisbon"),
+        ("5 days in Rio de Janeiro", "rio de janeiro"),
+    ],
+)
+def test_destination_skips_months_and_seasons(request_text, destination):
+    assert extract_trip_parameters(request_text).destination == destination
+
+
+def test_trips_in_the_same_month_to_different_cities_do_not_share_a_bucket():
+    paris = extract_trip_parameters("Plan 5 days in July in Paris for a couple")
+    rome = extract_trip_parameters("Plan 5 days in July in Rome for a couple")
+    assert paris.bucket != rome.bucket
+    assert paris.similarity(rome) == 0.0
+
+
+def test_requests_without_destination_or_length_are_not_memoized():
+    assert extract_trip_parameters("5 days in July") is None
+    assert extract_trip_parameters("5 days somewhere warm") is None
+    assert extract_trip_parameters("Plan a trip to Tokyo") is None
+
+
+@pytest.mark.parametrize(
+    "request_text, band",
+    [
+        # A trip total is spread over the days.
+        ("5 days in Tokyo for $400", "budget"),
+        ("5 days in Tokyo for $1500", "mid"),
+        ("5 days in Tokyo for $5,000", "luxury"),
+        # A per-day amount is not.
+        ("5 days in Tokyo, $300 per day", "mid"),
+        ("5 days in Tokyo with $300/day", "mid"),
+        ("5 days in Tokyo on 80 euros a day", "budget"),
+        ("A week in Lisbon, daily budget of $400", "luxury"),
+        # An amount wins over keywords.
+        ("5 days in Tokyo, cheap, $2000 per day", "luxury"),
+        ("5 days in Tokyo, mid budget", "mid"),
+        ("5 days in Tokyo, luxury", "luxury"),
+        ("5 days in Tokyo", "unspecified"),
+    ],
+)
+def test_budget_band(request_text, band):
+    assert extract_trip_parameters(request_text).budget_band == band
+
+
+def test_party_type():
+    assert extract_trip_parameters("5 days in Tokyo with the kids").party == "family"
+    assert extract_trip_parameters("Romantic 3 days in Paris").party == "couple"
+    assert extract_trip_parameters("5 days in Tokyo").party == "unspecified"
+
+
+def test_interests_match_whole_words():
+    trip = extract_trip_parameters(
+        "3 days in Paris: departure at the start of May, a party, a restaurant and no smart plans"
+    )
+    assert trip.interests == []
+    trip = extract_trip_parameters("3 days in Paris for art, a museum, the beach and temples")
+    assert trip.interests == ["art", "beaches", "museums", "temples"]
+
+
+def test_only_itineraries_are_memoized():
+    trip = extract_trip_parameters("3 days in Paris")
+    assert memoizable_itinerary(ITINERARY, trip, "3 days in Paris") == ITINERARY
+    question = "Happy to help! What are your travel dates, and what is your budget for Paris?"
+    assert memoizable_itinerary(question, trip, "3 days in Paris") is None
+    error = "Sorry, I could not plan this trip right now. Please try again later."
+    assert memoizable_itinerary(error, trip, "3 days in Paris") is None
+
+
+def test_memoized_itineraries_drop_personal_details():
+    request = (
+        "My name is Jane Doe. Plan 3 days in Paris for me and my husband Tom. "
+        "Booking ABC123X, reach me at jane.doe@example.com or +1 415 555 0100."
+    )
+    itinerary = ITINERARY + (
+        "Jane and Tom: hotel confirmation abc123x was sent to jane.doe@example.com. "
+        "We will call +1 (415) 555-0100. Louvre: +33 1 40 20 50 50, info@louvre.fr.\n"
+    )
+    memoized = memoizable_itinerary(itinerary, extract_trip_parameters(request), request)
+    for detail in ("Jane", "Doe", "Tom", "abc123x", "jane.doe@example.com", "555-0100"):
+        assert detail not in memoized
+    # Details of the places themselves are kept.
+    assert "+33 1 40 20 50 50" in memoized and "info@louvre.fr" in memoized
+
+
+def test_memo_finds_similar_trips_and_persists(tmp_path):
+    path = str(tmp_path / "memo.json")
+    memo = ItineraryMemo(path=path)
+    memo.store(TripParameters("paris", 3, "couple", "mid", ["art"]), ITINERARY)
+
+    hit = ItineraryMemo(path=path).find(TripParameters("paris", 4, "couple", "mid", ["art"]))
+    assert hit is not None and hit[0].itinerary == ITINERARY
+    assert memo.find(TripParameters("paris", 3, "family", "mid", ["art"])) is None
+    assert memo.find(TripParameters("paris", 8, "couple", "mid", ["art"])) is None
+
+
+def test_memo_saves_are_batched(tmp_path):
+    path = tmp_path / "memo.json"
+
+    async def main():
+        memo = ItineraryMemo(path=str(path), save_delay=0.05)
+        memo.store(TripParameters("paris", 3, "couple", "mid", ["art"]), ITINERARY)
+        memo.store(TripParameters("rome", 3, "couple", "mid", ["art"]), ITINERARY)
+        # Nothing is written on the event loop when storing.
+        assert not path.exists()
+        await asyncio.sleep(0.2)
+        assert len(ItineraryMemo(path=str(path))._entries) == 2
+        memo.store(TripParameters("oslo", 3, "couple", "mid", ["art"]), ITINERARY)
+        await memo.flush()
+
+    asyncio.run(main())
+    assert len(ItineraryMemo(path=str(path))._entries) == 3
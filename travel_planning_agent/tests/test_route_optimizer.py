@@ -0,0 +1,96 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from tools.route_optimizer import _schedule, optimize_route, plan_routes
+from tools.utils import parse_minutes
+
+HOTEL = (48.8566, 2.3522)
+PARIS = [
+    {"name": "Louvre", "lat": 48.8606, "lon": 2.3376, "duration_minutes": 150, "open": "09:00", "close": "18:00"},
+    {"name": "Eiffel Tower", "lat": 48.8584, "lon": 2.2945, "duration_minutes": 90},
+    {"name": "Notre-Dame", "lat": 48.8530, "lon": 2.3499, "duration_minutes": 45},
+    {"name": "Sacré-Cœur", "lat": 48.8867, "lon": 2.3431, "duration_minutes": 60},
+    {"name": "Musée d'Orsay", "lat": 48.8600, "lon": 2.3266, "duration_minutes": 120, "open": "09:30", "close": "18:00"},
+    {"name": "Moulin Rouge show", "lat": 48.8841, "lon": 2.3322, "duration_minutes": 120, "open": "19:00", "close": "23:00"},
+]
+
+
+def check_feasible(result, pois, day_start="09:00", day_end="20:00"):
+    by_name = {poi["name"]: poi for poi in pois}
+    for day in result["days"]:
+        clock = parse_minutes(day_start)
+        for stop in day["stops"]:
+            poi = by_name[stop["name"]]
+            start, end = parse_minutes(stop["start"]), parse_minutes(stop["end"])
+            assert start >= clock + stop["travel_minutes"] - 1
+            assert start >= parse_minutes(poi.get("open") or day_start)
+            assert end <= parse_minutes(poi.get("close") or day_end)
+            assert end - start == poi.get("duration_minutes", 60)
+            clock = end
+        assert parse_minutes(day["return_time"]) <= parse_minutes(day_end)
+
+
+def test_schedules_within_opening_hours_and_reports_what_did_not_fit():
+    result = optimize_route(PARIS, *HOTEL, days=1)
+    assert result["status"] == "success"
+    check_feasible(result, PARIS)
+    # The evening show opens after the day ends.
+    assert result["unscheduled"] == ["Moulin Rouge show"]
+    assert len(result["days"][0]["stops"]) == 5
+
+
+def test_spreads_places_over_days_when_one_is_not_enough():
+    pois = [dict(poi, duration_minutes=180) for poi in PARIS[:5]]
+    result = optimize_route(pois, *HOTEL, days=3)
+    check_feasible(result, pois)
+    assert result["unscheduled"] == []
+    assert 2 <= len(result["days"]) <= 3
+    assert sorted(stop["name"] for day in result["days"] for stop in day["stops"]) == sorted(
+        poi["name"] for poi in pois
+    )
+
+
+def test_late_evening_places_fit_a_longer_day():
+    result = optimize_route(PARIS, *HOTEL, days=1, day_end="23:30")
+    check_feasible(result, PARIS, day_end="23:30")
+    assert result["unscheduled"] == []
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_single_day_tours_are_close_to_optimal(seed):
+    rng = np.random.default_rng(seed)
+    coordinates = np.vstack([[HOTEL], HOTEL + rng.uniform(-0.04, 0.04, size=(6, 2))])
+    count = len(coordinates)
+    opens, closes = np.zeros(count), np.full(count, 24 * 60.0)
+    durations, priorities = np.full(count, 30.0), np.ones(count)
+    routes, unscheduled, travel = plan_routes(
+        coordinates, opens, closes, durations, priorities, 1, 0.0, 24 * 60.0
+    )
+    assert unscheduled == []
+
+    def tour(stops):
+        route = [0, *stops, 0]
+        return travel[route[:-1], route[1:]].sum()
+
+    best = min(tour(order) for order in itertools.permutations(range(1, count)))
+    assert tour(routes[0]) <= best * 1.1
+
+
+def test_latest_start_times_respect_closing_hours():
+    travel = np.array([[0, 10, 10], [10, 0, 5], [10, 5, 0]], dtype=float)
+    opens = np.array([0, 60, 0], dtype=float)
+    closes = np.array([600, 120, 200], dtype=float)
+    durations = np.array([0, 30, 30], dtype=float)
+    start, depart, latest = _schedule([0, 1, 2, 0], travel, opens, closes, durations, 0, 600)
+    assert list(start) == [0, 60, 95, 135]
+    assert latest[1] == 90 and latest[2] == 170
+
+
+@pytest.mark.parametrize(
+    "pois",
+    [[], [{"name": "No coordinates"}], [{"name": "Bad time", "lat": 1, "lon": 1, "open": "nine"}]],
+)
+def test_invalid_input_is_an_error(pois):
+    assert optimize_route(pois, *HOTEL)["status"] == "error"
@@ -0,0 +1,13 @@
+"""
+Deterministic planning tools for the Travel Planning Agent.
+"""
+
+from .budget_solver import optimize_budget
+from .poi_index import find_nearby_places
+from .route_optimizer import optimize_route
+
+__all__ = [
+    "find_nearby_places",
+    "optimize_budget",
+    "optimize_route",
+]
@@ -0,0 +1,148 @@
+"""
+Tool for choosing the best combination of travel options within a budget.
+
+The selection is a multiple-choice knapsack: exactly one option from each
+exclusive group (one hotel, one transport option, or any custom group) plus
+any subset of the independent options (activities), maximizing total utility
+without exceeding the budget. It is solved exactly by dynamic programming
+over the budget discretized into at most `BUDGET_RESOLUTION` steps; each
+option updates the whole budget axis with one vectorized NumPy operation.
+Costs are rounded up to the step, so the selection never exceeds the budget.
+"""
+
+import logging
+import math
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+BUDGET_RESOLUTION = 10_000
+# Option types that form an exclusive group when no "group" is given.
+EXCLUSIVE_TYPES = ("hotel", "transport")
+
+
+def _group_key(option: dict, index: int) -> tuple[str, bool]:
+    """Returns the group an option belongs to and whether a pick is mandatory."""
+    if option.get("group"):
+        return str(option["group"]), True
+    option_type = str(option.get("type", "activity")).lower()
+    if option_type in EXCLUSIVE_TYPES:
+        return option_type, True
+    return f"#{index}", False
+
+
+def solve_budget(
+    costs: np.ndarray,
+    utilities: np.ndarray,
+    groups: list[tuple[list[int], bool]],
+    budget: float,
+    resolution: int = BUDGET_RESOLUTION,
+) -> list[int] | None:
+    """Indices of the utility-maximizing selection, or None when infeasible.
+
+    Each group is (option indices, mandatory): a mandatory group contributes
+    exactly one option, an optional group at most one.
+    """
+    step = max(budget / resolution, 1e-9)
+    capacity = int(math.floor(budget / step + 1e-9))
+    units = np.ceil(costs / step - 1e-9).astype(np.int64)
+    # best[b]: highest utility of the groups so far with a cost of at most b steps.
+    best = np.zeros(capacity + 1)
+    choices = []
+    for members, mandatory in groups:
+        updated = np.full(capacity + 1, -np.inf) if mandatory else best.copy()
+        choice = np.full(capacity + 1, -1, dtype=np.int32)
+        for index in members:
+            cost = units[index]
+            if cost > capacity:
+                continue
+            candidate = np.full(capacity + 1, -np.inf)
+            candidate[cost:] = best[: capacity + 1 - cost] + utilities[index]
+            improved = candidate > updated
+            updated = np.where(improved, candidate, updated)
+            choice[improved] = index
+        best = updated
+        choices.append(choice)
+    if not np.isfinite(best[capacity]):
+        return None
+    selected, remaining = [], capacity
+    for choice in reversed(choices):
+        index = int(choice[remaining])
+        if index >= 0:
+            selected.append(index)
+            remaining -= int(units[index])
+    return sorted(selected)
+
+
+def optimize_budget(options: list[dict], total_budget: float) -> dict:
+    """
+    Choose the combination of hotel, transport and activity options with the highest
+    total utility that fits within the budget.
+
+    Use this instead of doing budget arithmetic yourself. Exactly one hotel and one
+    transport option are chosen when such options are given, and any number of
+    activities. Options that share a "group" are alternatives of which exactly one
+    is chosen.
+
+    Args:
+        options (list[dict]): The candidate options. Each has "name", "type"
+            ("hotel", "transport" or "activity"), "cost" (total cost for the whole
+            trip and party) and "utility" (how well it fits the traveler, e.g. 1-10),
+            and optionally "group".
+        total_budget (float): The total budget for all selected options
+
+    Returns:
+        dict: The selected options, their total cost and the remaining budget
+    """
+    try:
+        if not options:
+            return {"status": "error", "message": "No options were provided"}
+        if total_budget <= 0:
+            return {"status": "error", "message": "The total budget must be positive"}
+        costs = np.array([float(option["cost"]) for option in options])
+        utilities = np.array([float(option.get("utility", 1)) for option in options])
+        if (costs < 0).any():
+            return {"status": "error", "message": "Option costs must not be negative"}
+
+        grouped: dict[str, tuple[list[int], bool]] = {}
+        for index, option in enumerate(options):
+            key, mandatory = _group_key(option, index)
+            grouped.setdefault(key, ([], mandatory))[0].append(index)
+
+        selected = solve_budget(costs, utilities, list(grouped.values()), float(total_budget))
+        if selected is None:
+            cheapest = sum(
+                min(costs[index] for index in members)
+                for members, mandatory in grouped.values()
+                if mandatory
+            )
+            return {
+                "status": "error",
+                "message": (
+                    f"No combination fits the budget of {total_budget:g}: "
+                    f"the cheapest required options alone cost {cheapest:g}"
+                ),
+            }
+
+        total_cost = float(costs[selected].sum())
+        return {
+            "status": "success",
+            "message": f"Selected {len(selected)} of {len(options)} options",
+            "selected": [
+                {
+                    "name": options[index].get("name", f"option {index + 1}"),
+                    "type": options[index].get("type", "activity"),
+                    "cost": float(costs[index]),
+                    "utility": float(utilities[index]),
+                }
+                for index in selected
+            ],
+            "total_cost": round(total_cost, 2),
+            "total_utility": round(float(utilities[selected].sum()), 2),
+            "remaining_budget": round(float(total_budget) - total_cost, 2),
+        }
+    except (KeyError, TypeError, ValueError) as e:
+        error_msg = f"Invalid budget optimization input: {str(e)}"
+        logger.error(error_msg)
+        return {"status": "error", "message": error_msg}
@@ -0,0 +1,251 @@
+"""
+Tool for looking up points of interest near a location.
+
+POIs are loaded once from a compact array file (built offline with
+`build_poi_index.py`) into a grid index: points are sorted by the key of the
+lat/lon cell they fall in, so the points of a row of cells form one contiguous
+slice found with a binary search. A radius query only computes exact
+distances for the points in the few cells overlapping the search circle, and
+a k-nearest query grows the radius until it holds k matches.
+"""
+
+import logging
+import math
+import os
+from typing import Optional
+
+import numpy as np
+
+from .utils import EARTH_RADIUS_KM
+
+logger = logging.getLogger(__name__)
+
+POI_DATA_FILE = os.getenv(
+    "POI_DATA_FILE",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "pois.npz"),
+)
+# Grid cell size in degrees (about 1 km of latitude).
+CELL_DEGREES = 0.01
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+MAX_RESULTS = 50
+
+
+def save_pois(path: str, pois: list[dict]) -> int:
+    """Writes POIs (dicts with name, lat, lon and category) to an array file."""
+    categories = sorted({str(poi.get("category") or "other").lower() for poi in pois})
+    codes = {category: code for code, category in enumerate(categories)}
+    names = [str(poi["name"]).encode("utf-8") for poi in pois]
+    # Given a path, np.savez would append ".npz" to names without it.
+    with open(path, "wb") as f:
+        np.savez(
+            f,
+            coordinates=np.array(
+                [[float(poi["lat"]), float(poi["lon"])] for poi in pois], dtype=np.float32
+            ),
+            category_codes=np.array(
+                [codes[str(poi.get("category") or "other").lower()] for poi in pois], dtype=np.uint16
+            ),
+            categories=np.array(categories),
+            name_offsets=np.cumsum([0] + [len(name) for name in names], dtype=np.int64),
+            names=np.frombuffer(b"".join(names), dtype=np.uint8),
+        )
+    return len(pois)
+
+
+class POIIndex:
+    """Grid index over POI coordinates for radius and k-nearest queries."""
+
+    def __init__(
+        self,
+        coordinates: np.ndarray,
+        category_codes: np.ndarray,
+        categories: list[str],
+        names: bytes,
+        name_offsets: np.ndarray,
+    ):
+        self.rows = int(round(180 / CELL_DEGREES))
+        self.columns = int(round(360 / CELL_DEGREES))
+        keys = self._cell_keys(coordinates[:, 0].astype(np.float64), coordinates[:, 1].astype(np.float64))
+        order = np.argsort(keys, kind="stable")
+        self._keys = keys[order]
+        self._order = order
+        self._lat = np.radians(coordinates[order, 0].astype(np.float64))
+        self._lon = np.radians(coordinates[order, 1].astype(np.float64))
+        self._category_codes = category_codes[order]
+        self.categories = list(categories)
+        self._names = names
+        self._name_offsets = name_offsets
+
+    @classmethod
+    def load(cls, path: str = POI_DATA_FILE) -> "POIIndex":
+        with np.load(path) as data:
+            return cls(
+                data["coordinates"],
+                data["category_codes"],
+                [str(category) for category in data["categories"]],
+                data["names"].tobytes(),
+                data["name_offsets"],
+            )
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _row(self, lat):
+        return np.clip(np.floor((lat + 90) / CELL_DEGREES), 0, self.rows - 1).astype(np.int64)
+
+    def _column(self, lon):
+        return np.floor((np.asarray(lon) + 180) / CELL_DEGREES).astype(np.int64) % self.columns
+
+    def _cell_keys(self, lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+        return self._row(lat) * self.columns + self._column(lon)
+
+    def name(self, position: int) -> str:
+        original = self._order[position]
+        start, end = self._name_offsets[original], self._name_offsets[original + 1]
+        return self._names[start:end].decode("utf-8")
+
+    def _candidates(self, lat: float, lon: float, radius_km: float) -> np.ndarray:
+        """Positions of the points in the cells overlapping the search circle."""
+        lat_span = radius_km / KM_PER_DEGREE
+        first_row, last_row = int(self._row(lat - lat_span)), int(self._row(lat + lat_span))
+        max_abs_lat = min(abs(lat) + lat_span, 89.9)
+        lon_span = lat_span / max(math.cos(math.radians(max_abs_lat)), 1e-6)
+        if lon_span >= 180:
+            column_ranges = [(0, self.columns - 1)]
+        else:
+            first_column = int(self._column(lon - lon_span))
+            last_column = int(self._column(lon + lon_span))
+            if first_column <= last_column:
+                column_ranges = [(first_column, last_column)]
+            else:
+                column_ranges = [(first_column, self.columns - 1), (0, last_column)]
+        slices = []
+        for row in range(first_row, last_row + 1):
+            for first_column, last_column in column_ranges:
+                low, high = np.searchsorted(
+                    self._keys,
+                    [row * self.columns + first_column, row * self.columns + last_column + 1],
+                )
+                if high > low:
+                    slices.append(np.arange(low, high))
+        return np.concatenate(slices) if slices else np.empty(0, dtype=np.int64)
+
+    def _distances(self, lat: float, lon: float, positions: np.ndarray) -> np.ndarray:
+        lat0, lon0 = math.radians(lat), math.radians(lon)
+        a = (
+            np.sin((self._lat[positions] - lat0) / 2) ** 2
+            + math.cos(lat0) * np.cos(self._lat[positions]) * np.sin((self._lon[positions] - lon0) / 2) ** 2
+        )
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+    def _category_mask(self, positions: np.ndarray, categories: Optional[list[str]]) -> np.ndarray:
+        if not categories:
+            return np.ones(len(positions), dtype=bool)
+        wanted = [
+            code for code, category in enumerate(self.categories)
+            if category in {c.lower() for c in categories}
+        ]
+        return np.isin(self._category_codes[positions], wanted)
+
+    def within(
+        self, lat: float, lon: float, radius_km: float, categories: Optional[list[str]] = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Positions and distances of the matching points within `radius_km`, nearest first."""
+        positions = self._candidates(lat, lon, radius_km)
+        positions = positions[self._category_mask(positions, categories)]
+        distances = self._distances(lat, lon, positions)
+        inside = distances <= radius_km
+        positions, distances = positions[inside], distances[inside]
+        order = np.argsort(distances, kind="stable")
+        return positions[order], distances[order]
+
+    def nearest(
+        self, lat: float, lon: float, k: int, categories: Optional[list[str]] = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Positions and distances of the `k` nearest matching points."""
+        radius_km = CELL_DEGREES * KM_PER_DEGREE
+        while True:
+            positions, distances = self.within(lat, lon, radius_km, categories)
+            # Points outside the circle are farther than every point inside it.
+            if len(positions) >= k or radius_km >= math.pi * EARTH_RADIUS_KM:
+                return positions[:k], distances[:k]
+            radius_km *= 4
+
+    def describe(self, position: int, distance_km: float) -> dict:
+        return {
+            "name": self.name(position),
+            "category": self.categories[self._category_codes[position]],
+            "lat": round(math.degrees(self._lat[position]), 6),
+            "lon": round(math.degrees(self._lon[position]), 6),
+            "distance_km": round(float(distance_km), 3),
+        }
+
+
+_default_index: Optional[POIIndex] = None
+
+
+def get_poi_index() -> Optional[POIIndex]:
+    """Returns the POI index loaded from `POI_DATA_FILE`, or None if there is none."""
+    global _default_index
+    if _default_index is None and os.path.exists(POI_DATA_FILE):
+        _default_index = POIIndex.load(POI_DATA_FILE)
+        logger.info("Loaded %d POIs from %s", len(_default_index), POI_DATA_FILE)
+    return _default_index
+
+
+def find_nearby_places(
+    lat: float,
+    lon: float,
+    radius_km: Optional[float] = None,
+    limit: int = 10,
+    categories: Optional[list[str]] = None,
+) -> dict:
+    """
+    Find points of interest near a location, such as attractions near the hotel.
+
+    Use this instead of searching the web when you need places close to a location.
+
+    Args:
+        lat (float): Latitude of the location
+        lon (float): Longitude of the location
+        radius_km (float): Only return places within this distance. If omitted, the
+            `limit` nearest places are returned regardless of distance.
+        limit (int): Maximum number of places to return (default 10, at most 50)
+        categories (list[str]): Only return places in these categories (for example
+            "museum", "restaurant", "park"). If omitted, all categories are returned.
+
+    Returns:
+        dict: The matching places with their category, coordinates and distance, nearest first
+    """
+    try:
+        index = get_poi_index()
+        if index is None:
+            return {
+                "status": "error",
+                "message": "No POI dataset is available. Set POI_DATA_FILE to a file built with build_poi_index.py.",
+            }
+        limit = min(max(int(limit or 10), 1), MAX_RESULTS)
+        if radius_km:
+            positions, distances = index.within(lat, lon, float(radius_km), categories)
+        else:
+            positions, distances = index.nearest(lat, lon, limit, categories)
+        places = [
+            index.describe(position, distance)
+            for position, distance in zip(positions[:limit], distances[:limit])
+        ]
+        if not places:
+            return {
+                "status": "warning",
+                "message": "No matching places found",
+                "places": [],
+                "available_categories": index.categories,
+            }
+        return {
+            "status": "success",
+            "message": f"Found {len(places)} place(s)",
+            "places": places,
+        }
+    except (OSError, TypeError, ValueError) as e:
+        error_msg = f"Error looking up nearby places: {str(e)}"
+        logger.error(error_msg)
+        return {"status": "error", "message": error_msg}
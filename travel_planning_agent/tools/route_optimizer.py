@@ -0,0 +1,221 @@
+"""
+Tool for ordering points of interest into feasible day-by-day routes.
+
+Solves a vehicle routing problem with time windows heuristically: each day is
+seeded with the farthest remaining POI from the start point (usually the
+hotel) and then grown by cheapest feasible insertion. Travel times come from
+a vectorized haversine distance matrix and every insertion position for every
+candidate is evaluated at once with NumPy, using the latest feasible start
+time of each stop to check opening hours without re-simulating the day.
+"""
+
+import logging
+from typing import Optional
+
+import numpy as np
+
+from .utils import format_minutes, haversine_matrix, parse_minutes
+
+logger = logging.getLogger(__name__)
+
+# Street distance per straight-line kilometre.
+DETOUR_FACTOR = 1.3
+DEFAULT_SPEED_KMH = 15.0
+
+
+def _schedule(
+    route: list[int],
+    travel: np.ndarray,
+    opens: np.ndarray,
+    closes: np.ndarray,
+    durations: np.ndarray,
+    day_start: float,
+    day_end: float,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Start, departure and latest feasible start times of each stop on a route.
+
+    `route` begins and ends at node 0 (the start point).
+    """
+    count = len(route)
+    start = np.empty(count)
+    depart = np.empty(count)
+    latest = np.empty(count)
+    start[0] = depart[0] = day_start
+    for position in range(1, count):
+        node, previous = route[position], route[position - 1]
+        arrival = depart[position - 1] + travel[previous, node]
+        start[position] = max(arrival, opens[node])
+        depart[position] = start[position] + durations[node]
+    latest[-1] = day_end
+    for position in range(count - 2, 0, -1):
+        node, following = route[position], route[position + 1]
+        latest[position] = min(
+            closes[node] - durations[node],
+            latest[position + 1] - travel[node, following] - durations[node],
+        )
+    latest[0] = day_start
+    return start, depart, latest
+
+
+def _insertion_candidates(
+    route: list[int],
+    candidates: np.ndarray,
+    travel: np.ndarray,
+    opens: np.ndarray,
+    closes: np.ndarray,
+    durations: np.ndarray,
+    day_start: float,
+    day_end: float,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Insertion cost of each candidate at each position; infeasible pairs are inf."""
+    _, depart, latest = _schedule(route, travel, opens, closes, durations, day_start, day_end)
+    previous = np.asarray(route[:-1])
+    following = np.asarray(route[1:])
+    # Shape (positions, candidates) throughout.
+    arrival = depart[:-1, None] + travel[np.ix_(previous, candidates)]
+    start = np.maximum(arrival, opens[candidates])
+    finish = start + durations[candidates]
+    fits = finish <= closes[candidates]
+    next_arrival = finish + travel[np.ix_(candidates, following)].T
+    next_opens = np.where(following == 0, day_start, opens[following])
+    fits &= np.maximum(next_arrival, next_opens[:, None]) <= latest[1:, None]
+    cost = (
+        travel[np.ix_(previous, candidates)]
+        + travel[np.ix_(candidates, following)].T
+        - travel[previous, following][:, None]
+    )
+    return np.where(fits, cost, np.inf), start
+
+
+def plan_routes(
+    coordinates: np.ndarray,
+    opens: np.ndarray,
+    closes: np.ndarray,
+    durations: np.ndarray,
+    priorities: np.ndarray,
+    days: int,
+    day_start: float,
+    day_end: float,
+    speed_kmh: float = DEFAULT_SPEED_KMH,
+) -> tuple[list[list[int]], list[int], np.ndarray]:
+    """Builds up to `days` routes over the POIs; node 0 is the start point.
+
+    Returns the routes (node indices without the start point), the POIs that
+    could not be scheduled and the travel time matrix in minutes.
+    """
+    travel = haversine_matrix(coordinates) * DETOUR_FACTOR / speed_kmh * 60.0
+    remaining = np.arange(1, len(coordinates))
+    routes: list[list[int]] = []
+    for _ in range(days):
+        if remaining.size == 0:
+            break
+        route = [0, 0]
+        while remaining.size:
+            cost, _ = _insertion_candidates(
+                route, remaining, travel, opens, closes, durations, day_start, day_end
+            )
+            feasible = np.isfinite(cost)
+            if not feasible.any():
+                break
+            if len(route) == 2:
+                # Seed the day with the farthest feasible POI, favouring high priority.
+                seed_score = np.where(
+                    feasible.any(axis=0), travel[0, remaining] * priorities[remaining], -np.inf
+                )
+                candidate = int(np.argmax(seed_score))
+                position = int(np.argmin(cost[:, candidate]))
+            else:
+                weighted = cost / priorities[remaining]
+                position, candidate = np.unravel_index(np.argmin(weighted), weighted.shape)
+            route.insert(int(position) + 1, int(remaining[candidate]))
+            remaining = np.delete(remaining, candidate)
+        if len(route) == 2:
+            break
+        routes.append(route[1:-1])
+    return routes, remaining.tolist(), travel
+
+
+def optimize_route(
+    pois: list[dict],
+    start_lat: float,
+    start_lon: float,
+    days: int = 1,
+    day_start: str = "09:00",
+    day_end: str = "20:00",
+    speed_kmh: Optional[float] = None,
+) -> dict:
+    """
+    Order points of interest into an efficient, feasible schedule for each day.
+
+    Use this instead of ordering activities yourself: it minimizes travel time while
+    respecting opening hours and visit durations, and starts and ends every day at
+    the given start point (usually the hotel).
+
+    Args:
+        pois (list[dict]): The places to visit. Each has "name", "lat", "lon" and
+            optionally "duration_minutes" (default 60), "open" and "close" ("HH:MM",
+            default all day) and "priority" (1-5, default 1; higher is scheduled first).
+        start_lat (float): Latitude of the daily start and end point
+        start_lon (float): Longitude of the daily start and end point
+        days (int): Number of days to spread the POIs over
+        day_start (str): Earliest departure each day ("HH:MM")
+        day_end (str): Latest return to the start point each day ("HH:MM")
+        speed_kmh (float): Average door-to-door travel speed in km/h (default 15)
+
+    Returns:
+        dict: The ordered stops with times for each day and any POIs that did not fit
+    """
+    try:
+        if not pois:
+            return {"status": "error", "message": "No points of interest were provided"}
+        start_minutes, end_minutes = parse_minutes(day_start), parse_minutes(day_end)
+        coordinates = np.array(
+            [[start_lat, start_lon]] + [[float(poi["lat"]), float(poi["lon"])] for poi in pois]
+        )
+        opens = np.array(
+            [start_minutes] + [parse_minutes(poi.get("open") or day_start) for poi in pois]
+        )
+        closes = np.array(
+            [end_minutes] + [parse_minutes(poi.get("close") or day_end) for poi in pois]
+        )
+        durations = np.array([0.0] + [float(poi.get("duration_minutes") or 60) for poi in pois])
+        priorities = np.array([1.0] + [max(float(poi.get("priority") or 1), 0.1) for poi in pois])
+
+        routes, unscheduled, travel = plan_routes(
+            coordinates, opens, closes, durations, priorities,
+            max(int(days), 1), start_minutes, end_minutes, speed_kmh or DEFAULT_SPEED_KMH,
+        )
+
+        schedule = []
+        for day, stops in enumerate(routes, start=1):
+            route = [0, *stops, 0]
+            start, depart, _ = _schedule(
+                route, travel, opens, closes, durations, start_minutes, end_minutes
+            )
+            legs = travel[route[:-1], route[1:]]
+            schedule.append(
+                {
+                    "day": day,
+                    "stops": [
+                        {
+                            "name": pois[node - 1]["name"],
+                            "travel_minutes": round(float(legs[position - 1])),
+                            "start": format_minutes(start[position]),
+                            "end": format_minutes(depart[position]),
+                        }
+                        for position, node in enumerate(route[1:-1], start=1)
+                    ],
+                    "return_time": format_minutes(start[-1]),
+                    "total_travel_minutes": round(float(legs.sum())),
+                }
+            )
+        return {
+            "status": "success",
+            "message": f"Scheduled {len(pois) - len(unscheduled)} of {len(pois)} places over {len(schedule)} day(s)",
+            "days": schedule,
+            "unscheduled": [pois[node - 1]["name"] for node in unscheduled],
+        }
+    except (KeyError, TypeError, ValueError) as e:
+        error_msg = f"Invalid route optimization input: {str(e)}"
+        logger.error(error_msg)
+        return {"status": "error", "message": error_msg}
@@ -0,0 +1,29 @@
+"""
+Utility functions shared by the travel planning tools.
+"""
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine_matrix(coordinates: np.ndarray) -> np.ndarray:
+    """Pairwise great-circle distances in km for an (n, 2) array of lat/lon degrees."""
+    radians = np.radians(coordinates)
+    lat, lon = radians[:, 0], radians[:, 1]
+    dlat = lat[:, None] - lat[None, :]
+    dlon = lon[:, None] - lon[None, :]
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat)[:, None] * np.cos(lat)[None, :] * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def parse_minutes(value: str) -> float:
+    """Minutes after midnight for an "HH:MM" time."""
+    hours, _, minutes = str(value).strip().partition(":")
+    return int(hours) * 60 + int(minutes or 0)
+
+
+def format_minutes(value: float) -> str:
+    """"HH:MM" for a number of minutes after midnight."""
+    total = int(round(value))
+    return f"{total // 60:02d}:{total % 60:02d}"